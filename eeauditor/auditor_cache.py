@@ -0,0 +1,141 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import threading
+from collections.abc import MutableMapping
+
+class AuditorCache(object):
+    """Run-scoped cache shared by every check
+
+        A single instance lives for the whole ElectricEye run. Checks never see it
+        directly, they receive a dict-like CacheScope from scope() so the existing
+        cache.get("describe_xyz") / cache["describe_xyz"] = ... pattern keeps working.
+    """
+
+    def __init__(self):
+        self._store = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(service, operation, params=None):
+        """Builds a cache key from a service, an API operation and its parameters"""
+        if not params:
+            return f"{service}:{operation}"
+        return f"{service}:{operation}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def scope(self, namespace, awsAccountId=None, awsRegion=None):
+        """Returns a dict-like view of the cache for one Account, Region and namespace"""
+        return CacheScope(self, (awsAccountId, awsRegion, namespace))
+
+    def fetch(self, service, operation, call, awsAccountId=None, awsRegion=None, **params):
+        """Returns the cached result of call(**params), calling it only on a miss"""
+        return self.scope(
+            "shared", awsAccountId=awsAccountId, awsRegion=awsRegion
+        ).fetch(service, operation, call, **params)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._store)}
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self.hits = 0
+            self.misses = 0
+
+class CacheScope(MutableMapping):
+    """Dict-like view of an AuditorCache bound to one (Account, Region, namespace)"""
+
+    def __init__(self, parent, prefix):
+        self._parent = parent
+        self._prefix = prefix
+
+    def _key(self, key):
+        return self._prefix + (key,)
+
+    def __getitem__(self, key):
+        return self._parent._store[self._key(key)]
+
+    def __setitem__(self, key, value):
+        with self._parent._lock:
+            self._parent._store[self._key(key)] = value
+
+    def __delitem__(self, key):
+        with self._parent._lock:
+            del self._parent._store[self._key(key)]
+
+    def __iter__(self):
+        size = len(self._prefix)
+        with self._parent._lock:
+            keys = [k[size] for k in self._parent._store if k[:size] == self._prefix]
+        return iter(keys)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def get(self, key, default=None):
+        # only explicit lookups are counted, checks use get() to test for a cached value
+        with self._parent._lock:
+            try:
+                value = self._parent._store[self._key(key)]
+            except KeyError:
+                self._parent.misses += 1
+                return default
+            self._parent.hits += 1
+            return value
+
+    def shared(self):
+        """Returns the scope shared by every Auditor for the same Account and Region"""
+        return CacheScope(self._parent, self._prefix[:-1] + ("shared",))
+
+    def account_shared(self):
+        """Returns the scope shared by every Auditor and Region of the same Account, for global resources"""
+        return CacheScope(self._parent, (self._prefix[0], None, "shared"))
+
+    def fetch(self, service, operation, call, **params):
+        """Returns the cached result of call(**params), calling it only on a miss"""
+        key = self._parent.make_key(service, operation, params)
+        sentinel = object()
+        response = self.get(key, sentinel)
+        if response is not sentinel:
+            return response
+        response = call(**params)
+        self[key] = response
+        return response
+
+def get_shared_cache(cache):
+    """Returns the Account and Region wide cache for the cache a check received
+
+        Checks called directly, e.g. from unit tests, receive a plain dict which is used as is
+    """
+    if isinstance(cache, CacheScope):
+        return cache.shared()
+    return cache
+
+def get_account_cache(cache):
+    """Returns the Account wide cache, shared by every Region, for the cache a check received
+
+        Checks called directly, e.g. from unit tests, receive a plain dict which is used as is
+    """
+    if isinstance(cache, CacheScope):
+        return cache.account_shared()
+    return cache
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-acm = boto3.client("acm")
+acm = get_client("acm")
 
 acmCerts = []
 for c in acm.list_certificates()["CertificateSummaryList"]:
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-amplify = boto3.client("amplify")
+amplify = get_client("amplify")
 
 
 def list_apps(cache):
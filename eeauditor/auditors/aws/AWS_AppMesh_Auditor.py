@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-appmesh = boto3.client("appmesh")
+appmesh = get_client("appmesh")
 # loop through AWS App Mesh meshes
 
 
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import botocore.exceptions
 from dateutil.parser import parse
@@ -27,13 +27,13 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-backup = boto3.client("backup")
-ec2 = boto3.client("ec2")
-dynamodb = boto3.client("dynamodb")
-rds = boto3.client("rds")
-efs = boto3.client("efs")
-neptune = boto3.client("neptune")
-documentdb = boto3.client("docdb")
+backup = get_client("backup")
+ec2 = get_client("ec2")
+dynamodb = get_client("dynamodb")
+rds = get_client("rds")
+efs = get_client("efs")
+neptune = get_client("neptune")
+documentdb = get_client("docdb")
 
 # loop through *in-use* EBS volumes
 def describe_volumes(cache):
@@ -126,23 +126,23 @@ def describe_file_systems(cache):
 
 # loop through Neptune clusters
 def describe_neptune_db_clusters(cache):
-    response = cache.get("describe_db_clusters")
+    response = cache.get("describe_neptune_db_clusters")
     if response:
         return response
-    cache["describe_db_clusters"] = neptune.describe_db_clusters(
+    cache["describe_neptune_db_clusters"] = neptune.describe_db_clusters(
         Filters=[{"Name": "engine", "Values": ["neptune"]}]
     )
-    return cache["describe_db_clusters"]
+    return cache["describe_neptune_db_clusters"]
 
 # loop through DocDb clusters
 def describe_doc_db_clusters(cache):
-    response = cache.get("describe_db_clusters")
+    response = cache.get("describe_docdb_db_clusters")
     if response:
         return response
-    cache["describe_db_clusters"] = documentdb.describe_db_clusters(
+    cache["describe_docdb_db_clusters"] = documentdb.describe_db_clusters(
         Filters=[{"Name": "engine", "Values": ["docdb"]}]
     )
-    return cache["describe_db_clusters"]
+    return cache["describe_docdb_db_clusters"]
 
 @registry.register_check("backup")
 def volume_backup_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
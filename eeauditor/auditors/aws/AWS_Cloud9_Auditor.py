@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-cloud9 = boto3.client("cloud9")
+cloud9 = get_client("cloud9")
 paginator = cloud9.get_paginator("list_environments")
 
 @registry.register_check("cloud9")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-cloudformation = boto3.client("cloudformation")
+cloudformation = get_client("cloudformation")
 
 def describe_stacks(cache):
     response = cache.get("describe_stacks")
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import json
 import os
 from check_register import CheckRegister
 
 registry = CheckRegister()
-cloudhsm = boto3.client("cloudhsmv2")
+cloudhsm = get_client("cloudhsmv2")
 
 def describe_clusters(cache):
     response = cache.get("describe_clusters")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-cloudtrail = boto3.client("cloudtrail")
+cloudtrail = get_client("cloudtrail")
 # loop through trails
 def list_trails(cache):
     response = cache.get("list_trails")
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-codebuild = boto3.client("codebuild")
+codebuild = get_client("codebuild")
 
 def get_code_build_projects(cache):
     response = cache.get("codebuild_projects")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-dms = boto3.client("dms")
+dms = get_client("dms")
 
 def describe_replication_instances(cache):
     response = cache.get("describe_replication_instances")
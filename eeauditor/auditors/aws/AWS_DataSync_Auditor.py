@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 from dateutil.parser import parse
 
 registry = CheckRegister()
 
-datasync = boto3.client("datasync")
+datasync = get_client("datasync")
 
 @registry.register_check("datasync")
 def datasync_public_agent_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-ds = boto3.client("ds")
+ds = get_client("ds")
 # loop through Directory Service directories
 # not to be confused with weird ass cloud directory
 def describe_directories(cache):
@@ -21,11 +21,11 @@
 import datetime
 from dateutil import parser
 import uuid
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister, accumulate_paged_results
 
 registry = CheckRegister()
-globalaccelerator = boto3.client("globalaccelerator")
+globalaccelerator = get_client("globalaccelerator")
 
 @registry.register_check("globalaccelerator")
 def unhealthy_endpoint_group_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
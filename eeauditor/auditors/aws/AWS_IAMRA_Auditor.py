@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import json
 from check_register import CheckRegister
@@ -26,8 +26,8 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-iamra = boto3.client("rolesanywhere")
-iam = boto3.client("iam")
+iamra = get_client("rolesanywhere")
+iam = get_client("iam")
 
 # Cache Trust Anchors
 def list_trust_anchors(cache):
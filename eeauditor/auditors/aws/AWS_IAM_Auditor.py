@@ -18,33 +18,35 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import botocore.exceptions
 import datetime
-import json
 from check_register import CheckRegister
+from iam_inventory import get_iam_inventory
+from policy_analyzer import analyze_policy
 
 registry = CheckRegister()
 
 # import boto3 clients
-iam = boto3.client("iam")
+iam = get_client("iam")
 
-# loop through IAM users
-def list_users(cache):
-    response = cache.get("list_users")
-    if response:
-        return response
-    cache["list_users"] = iam.list_users(MaxItems=1000)
-    return cache["list_users"]
+# Users, Groups, Roles and customer managed Policies with their inline & attached policies
+# are collected once with GetAccountAuthorizationDetails, see iam_inventory.py
+def get_inventory(cache):
+    return get_iam_inventory(cache, iam)
 
 @registry.register_check("iam")
 def iam_access_key_age_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.1] IAM Access Keys should be rotated every 90 days"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for users in list_users(cache)["Users"]:
+    inventory = get_inventory(cache)
+    for users in inventory.users:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
+        # only users with an active key in the credential report need their keys listed
+        if not inventory.has_active_access_keys(userName):
+            continue
         # Get keys per User
         response = iam.list_access_keys(UserName=userName)
         for keys in response["AccessKeyMetadata"]:
@@ -213,7 +215,7 @@ def user_permission_boundary_check(cache: dict, awsAccountId: str, awsRegion: st
     """[IAM.2] IAM users should have permissions boundaries attached"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for users in list_users(cache)["Users"]:
+    for users in get_inventory(cache).users:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         try:
@@ -350,19 +352,16 @@ def user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
     """[IAM.3] IAM users with passwords should have Multi-Factor Authentication (MFA) enabled"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for users in list_users(cache)["Users"]:
+    inventory = get_inventory(cache)
+    for users in inventory.users:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
         # check if the user has a password
-        try:
-            users["PasswordLastUsed"]
-            pwCheck = True
-        except KeyError:
-            pwCheck = False
+        pwCheck = inventory.has_password(userName)
         # If there is a password, evaluate if there any MFA devices
         if pwCheck == True:
-            # this is a failing check due to the list comprehension returning empty (false)
-            if not iam.list_mfa_devices(UserName=userName)["MFADevices"]:
+            # this is a failing check as there are no MFA devices
+            if not inventory.has_mfa(userName):
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": f"{userArn}/iam-user-mfa-check",
@@ -574,12 +573,12 @@ def user_inline_policy_check(cache: dict, awsAccountId: str, awsRegion: str, aws
     """[IAM.4] IAM users should not have attached in-line policies"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for users in list_users(cache)["Users"]:
+    for users in get_inventory(cache).users:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
-        # use a list comprehension to check if there are any inline policies
+        # check if there are any inline policies
         # this is a failing check
-        if iam.list_user_policies(UserName=userName)["PolicyNames"]:
+        if users.get("UserPolicyList"):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": f"{userArn}/iam-user-attach-inline-check",
@@ -722,12 +721,12 @@ def user_direct_attached_policy_check(cache: dict, awsAccountId: str, awsRegion:
     """[IAM.5] IAM users should not have attached managed policies"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for users in list_users(cache)["Users"]:
+    for users in get_inventory(cache).users:
         userName = str(users["UserName"])
         userArn = str(users["Arn"])
-        # use a list comprehension to check if there are any attached managed policies
+        # check if there are any attached managed policies
         # this is a failing check
-        if iam.list_attached_user_policies(UserName=userName)["AttachedPolicies"]:
+        if users.get("AttachedManagedPolicies"):
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": f"{userArn}/iam-user-attach-managed-policy-check",
@@ -1233,40 +1232,15 @@ def iam_created_managed_policy_least_priv_check(cache: dict, awsAccountId: str,
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     try:
-        for mpolicy in iam.list_policies(Scope='Local')['Policies']:
+        inventory = get_inventory(cache)
+        for mpolicy in inventory.policies:
             policyArn = mpolicy['Arn']
             versionId = mpolicy['DefaultVersionId']
-            policyDocument = iam.get_policy_version(
-                PolicyArn=policyArn,
-                VersionId=versionId
-            )['PolicyVersion']['Document']
-            #handle policies docs returned as strings
-            if type(policyDocument) == str:
-                policyDocument = json.loads(policyDocument)
-
-            leastPrivilegeRating = 'passing'
-            for statement in policyDocument['Statement']:
-                if statement["Effect"] == 'Allow':
-                    if statement.get('Condition') == None: 
-                        # action structure could be a string or a list
-                        if type(statement['Action']) == list: 
-                            if len(['True' for x in statement['Action'] if ":*" in x or '*' == x]) > 0:
-                                if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                    leastPrivilegeRating = 'failedHigh'
-                                    # Means that an initial failure will not be overwritten by a lower finding later
-                                    next
-                                elif type(statement['Resource']) == list: 
-                                    leastPrivilegeRating = 'failedLow'
+            # the default version is part of the PolicyVersionList returned with the inventory
+            policyDocument = inventory.default_policy_document(mpolicy)
 
-                        # Single action in a statement
-                        elif type(statement['Action']) == str:
-                            if ":*" in statement['Action'] or statement['Action'] == '*':
-                                if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                    leastPrivilegeRating = 'failedHigh'
-                                    # Means that an initial failure will not be overwritten by a lower finding later
-                                    next
-                                elif type(statement['Resource']) == list: 
-                                    leastPrivilegeRating = 'failedLow'
+            # statements are normalized and rated once per distinct document, see policy_analyzer.py
+            leastPrivilegeRating = analyze_policy(policyDocument).least_privilege_rating
             if leastPrivilegeRating == 'passing':
                 finding = {
                     "SchemaVersion": "2018-10-08",
@@ -1443,46 +1417,15 @@ def iam_created_managed_policy_least_priv_check(cache: dict, awsAccountId: str,
 def iam_user_policy_least_priv_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.9] User inline policies should follow least privilege principles"""
     try:
-        for users in list_users(cache)["Users"]:
+        for users in get_inventory(cache).users:
             userArn = users['Arn']
             userName = users['UserName']
 
-            policyNames = iam.list_user_policies(
-                UserName=userName
-            )['PolicyNames']
-            for policyName in policyNames:
-                policyDocument = iam.get_user_policy(
-                    UserName=userName,
-                    PolicyName=policyName
-                )['PolicyDocument']
-
-                #handle policies docs returned as strings
-                if type(policyDocument) == str:
-                    policyDocument = json.loads(policyDocument)
-
-                leastPrivilegeRating = 'passing'
-                for statement in policyDocument['Statement']:
-                    if statement["Effect"] == 'Allow':
-                        if statement.get('Condition') == None: 
-                            # action structure could be a string or a list
-                            if type(statement['Action']) == list: 
-                                if len(['True' for x in statement['Action'] if ":*" in x or '*' == x]) > 0:
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
+            for userPolicy in users.get('UserPolicyList', []):
+                policyName = userPolicy['PolicyName']
+                policyDocument = userPolicy['PolicyDocument']
 
-                            # Single action in a statement
-                            elif type(statement['Action']) == str:
-                                if ":*" in statement['Action'] or statement['Action'] == '*':
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
+                leastPrivilegeRating = analyze_policy(policyDocument).least_privilege_rating
 
                 iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
                 if leastPrivilegeRating == 'passing':
@@ -1676,47 +1619,15 @@ def iam_user_policy_least_priv_check(cache: dict, awsAccountId: str, awsRegion:
 def iam_group_policy_least_priv_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.10] Group inline policies should follow least privilege principles"""
     try:
-        Groups = iam.list_groups()
-        for group in Groups['Groups']:
+        for group in get_inventory(cache).groups:
             groupArn = group['Arn']
             groupName = group['GroupName']
 
-            policyNames = iam.list_group_policies(
-                GroupName=groupName
-            )['PolicyNames']
-            for policyName in policyNames:
-                policyDocument = iam.get_group_policy(
-                    GroupName=groupName,
-                    PolicyName=policyName
-                )['PolicyDocument']
+            for groupPolicy in group.get('GroupPolicyList', []):
+                policyName = groupPolicy['PolicyName']
+                policyDocument = groupPolicy['PolicyDocument']
 
-                #handle policies docs returned as strings
-                if type(policyDocument) == str:
-                    policyDocument = json.loads(policyDocument)
-
-                leastPrivilegeRating = 'passing'
-                for statement in policyDocument['Statement']:
-                    if statement["Effect"] == 'Allow':
-                        if statement.get('Condition') == None: 
-                            # action structure could be a string or a list
-                            if type(statement['Action']) == list: 
-                                if len(['True' for x in statement['Action'] if ":*" in x or '*' == x]) > 0:
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
-
-                            # Single action in a statement
-                            elif type(statement['Action']) == str:
-                                if ":*" in statement['Action'] or statement['Action'] == '*':
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
+                leastPrivilegeRating = analyze_policy(policyDocument).least_privilege_rating
 
                 iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
                 if leastPrivilegeRating == 'passing':
@@ -1911,47 +1822,15 @@ def iam_role_policy_least_priv_check(cache: dict, awsAccountId: str, awsRegion:
     """[IAM.11] Role inline policies should follow least privilege principles"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     try:
-        Roles = iam.list_roles()
-        for role in Roles['Roles']:
+        for role in get_inventory(cache).roles:
             roleArn = role['Arn']
             roleName = role['RoleName']
 
-            policyNames = iam.list_role_policies(
-                RoleName=roleName
-            )['PolicyNames']
-            for policyName in policyNames:
-                policyDocument = iam.get_role_policy(
-                    RoleName=roleName,
-                    PolicyName=policyName
-                )['PolicyDocument']
-
-                #handle policies docs returned as strings
-                if type(policyDocument) == str:
-                    policyDocument = json.loads(policyDocument)
-
-                leastPrivilegeRating = 'passing'
-                for statement in policyDocument['Statement']:
-                    if statement["Effect"] == 'Allow':
-                        if statement.get('Condition') == None: 
-                            # action structure could be a string or a list
-                            if type(statement['Action']) == list: 
-                                if len(['True' for x in statement['Action'] if ":*" in x or '*' == x]) > 0:
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
+            for rolePolicy in role.get('RolePolicyList', []):
+                policyName = rolePolicy['PolicyName']
+                policyDocument = rolePolicy['PolicyDocument']
 
-                            # Single action in a statement
-                            elif type(statement['Action']) == str:
-                                if ":*" in statement['Action'] or statement['Action'] == '*':
-                                    if type(statement['Resource']) == str and statement['Resource'] == '*':
-                                        leastPrivilegeRating = 'failedHigh'
-                                        # Means that an initial failure will not be overwritten by a lower finding later
-                                        next
-                                    elif type(statement['Resource']) == list: 
-                                        leastPrivilegeRating = 'failedLow'
+                leastPrivilegeRating = analyze_policy(policyDocument).least_privilege_rating
                 
                 if leastPrivilegeRating == 'passing':
                     finding = {
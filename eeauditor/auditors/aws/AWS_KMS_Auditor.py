@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import botocore.exceptions
-import json
 from check_register import CheckRegister
+from policy_analyzer import analyze_policy
 
 registry = CheckRegister()
-kms = boto3.client("kms")
+kms = get_client("kms")
 
 def list_keys(cache):
     response = cache.get("list_keys")
@@ -275,19 +275,8 @@ def kms_key_exposed_check(cache: dict, awsAccountId: str, awsRegion: str, awsPar
             keyid = alias["TargetKeyId"]
             try:
                 policyString = kms.get_key_policy(KeyId=keyid, PolicyName="default")
-                fail = False
-                policy_json = policyString["Policy"]
-                policy = json.loads(policy_json)
-                for sid in policy["Statement"]:
-                    if sid["Principal"] == "*":
-                        access = "*"
-                    else:
-                        access = sid["Principal"].get("AWS", None)
-                    if access != "*" or (access == "*" and "Condition" in sid):
-                        continue
-                    else:
-                        fail = True
-                        break
+                # fails when an unconditional Allow statement has an anonymous principal
+                fail = analyze_policy(policyString["Policy"]).is_public
                 if not fail:
                     finding = {
                         "SchemaVersion": "2018-10-08",
@@ -1,10 +1,10 @@
 from check_register import CheckRegister
-import boto3
+from aws_clients import get_client
 import datetime
 
 registry = CheckRegister()
 
-keyspaces = boto3.client("keyspaces")
+keyspaces = get_client("keyspaces")
 
 awsKeyspaceInfo = []
 # AWS-managed Keyspaces - we need to ignore these
@@ -20,17 +20,18 @@
 
 import datetime
 from dateutil import parser
-import boto3
+from aws_clients import get_client
 import json
 import botocore
 from check_register import CheckRegister
+from metrics_collector import get_metrics_collector, metric_stat
 
 registry = CheckRegister()
 
 # boto3 clients
-lambdas = boto3.client("lambda")
-cloudwatch = boto3.client("cloudwatch")
-ec2 = boto3.client("ec2")
+lambdas = get_client("lambda")
+cloudwatch = get_client("cloudwatch")
+ec2 = get_client("ec2")
 
 def get_lambda_functions(cache):
     lambdaFunctions = []
@@ -58,141 +59,138 @@ def get_lambda_layers(cache):
         cache["get_lambda_layers"] = lambdaLayers
         return cache["get_lambda_layers"]
 
+def get_function_invocations(cache, functions):
+    # Invocations of every function over the last 30 days, collected in batched GetMetricData requests
+    metrics = get_metrics_collector(cache, cloudwatch)
+    endTime = datetime.datetime.now(datetime.timezone.utc)
+    startTime = endTime - datetime.timedelta(days=30)
+    for function in functions:
+        metrics.add(
+            ("AWS/Lambda", "Invocations", function["FunctionName"]),
+            metric_stat("AWS/Lambda", "Invocations", {"FunctionName": function["FunctionName"]}, 86400, "Sum"),
+            startTime,
+            endTime
+        )
+    results = metrics.collect()
+    return {function["FunctionName"]: results[("AWS/Lambda", "Invocations", function["FunctionName"])] for function in functions}
+
 @registry.register_check("lambda")
 def unused_function_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.1] Lambda functions should be deleted after 30 days of no use"""
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    for function in get_lambda_functions(cache):
+    functions = get_lambda_functions(cache)
+    invocations = get_function_invocations(cache, functions)
+    for function in functions:
         functionName = str(function["FunctionName"])
         lambdaArn = str(function["FunctionArn"])
-        metricResponse = cloudwatch.get_metric_data(
-            MetricDataQueries=[
-                {
-                    "Id": "m1",
-                    "MetricStat": {
-                        "Metric": {
-                            "Namespace": "AWS/Lambda",
-                            "MetricName": "Invocations",
-                            "Dimensions": [{"Name": "FunctionName", "Value": functionName},],
-                        },
-                        "Period": 300,
-                        "Stat": "Sum",
-                    },
-                }
-            ],
-            StartTime=datetime.datetime.now() - datetime.timedelta(days=30),
-            EndTime=datetime.datetime.now(),
-        )
-        metrics = metricResponse["MetricDataResults"]
-        for metric in metrics:
-            modify_date = parser.parse(function["LastModified"])
-            date_delta = datetime.datetime.now(datetime.timezone.utc) - modify_date
-            if len(metric["Values"]) > 0 or date_delta.days < 30:
-                # this is a passing check
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{lambdaArn}/lambda-function-unused-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": lambdaArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "INFORMATIONAL"},
-                    "Confidence": 99,
-                    "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
-                    "Description": f"Lambda function {functionName} has seen activity within the last 30 days.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsLambdaFunction",
-                            "Id": lambdaArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsLambdaFunction": {
-                                    "FunctionName": functionName
-                                }
+        modify_date = parser.parse(function["LastModified"])
+        date_delta = datetime.datetime.now(datetime.timezone.utc) - modify_date
+        if len(invocations[functionName]["Values"]) > 0 or date_delta.days < 30:
+            # this is a passing check
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": f"{lambdaArn}/lambda-function-unused-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": lambdaArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
+                "Description": f"Lambda function {functionName} has seen activity within the last 30 days.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsLambdaFunction",
+                        "Id": lambdaArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsLambdaFunction": {
+                                "FunctionName": functionName
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "PASSED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.AM-2",
-                            "NIST SP 800-53 CM-8",
-                            "NIST SP 800-53 PM-5",
-                            "AICPA TSC CC3.2",
-                            "AICPA TSC CC6.1",
-                            "ISO 27001:2013 A.8.1.1",
-                            "ISO 27001:2013 A.8.1.2",
-                            "ISO 27001:2013 A.12.5.1"
-                        ]
-                    },
-                    "Workflow": {"Status": "RESOLVED"},
-                    "RecordState": "ARCHIVED"
-                }
-                yield finding
-            else:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{lambdaArn}/lambda-function-unused-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": lambdaArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "LOW"},
-                    "Confidence": 99,
-                    "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
-                    "Description": f"Lambda function {functionName} has not been used within the last 30 days. Functions should be deleted if they are not used to avoid any potential malicious modifications and to lessen the consumption of default Lambda quotas such as stored code and number of functions.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsLambdaFunction",
-                            "Id": lambdaArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsLambdaFunction": {
-                                    "FunctionName": functionName
-                                }
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.AM-2",
+                        "NIST SP 800-53 CM-8",
+                        "NIST SP 800-53 PM-5",
+                        "AICPA TSC CC3.2",
+                        "AICPA TSC CC6.1",
+                        "ISO 27001:2013 A.8.1.1",
+                        "ISO 27001:2013 A.8.1.2",
+                        "ISO 27001:2013 A.12.5.1"
+                    ]
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED"
+            }
+            yield finding
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": f"{lambdaArn}/lambda-function-unused-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": lambdaArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "LOW"},
+                "Confidence": 99,
+                "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
+                "Description": f"Lambda function {functionName} has not been used within the last 30 days. Functions should be deleted if they are not used to avoid any potential malicious modifications and to lessen the consumption of default Lambda quotas such as stored code and number of functions.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsLambdaFunction",
+                        "Id": lambdaArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsLambdaFunction": {
+                                "FunctionName": functionName
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.AM-2",
-                            "NIST SP 800-53 CM-8",
-                            "NIST SP 800-53 PM-5",
-                            "AICPA TSC CC3.2",
-                            "AICPA TSC CC6.1",
-                            "ISO 27001:2013 A.8.1.1",
-                            "ISO 27001:2013 A.8.1.2",
-                            "ISO 27001:2013 A.12.5.1"
-                        ]
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE"
-                }
-                yield finding
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.AM-2",
+                        "NIST SP 800-53 CM-8",
+                        "NIST SP 800-53 PM-5",
+                        "AICPA TSC CC3.2",
+                        "AICPA TSC CC6.1",
+                        "ISO 27001:2013 A.8.1.1",
+                        "ISO 27001:2013 A.8.1.2",
+                        "ISO 27001:2013 A.12.5.1"
+                    ]
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE"
+            }
+            yield finding
 
 @registry.register_check("lambda")
 def function_tracing_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-memorydb = boto3.client("memorydb")
+memorydb = get_client("memorydb")
 
 def describe_clusters(cache):
     response = cache.get("describe_clusters")
@@ -21,11 +21,11 @@
 import datetime
 from dateutil import parser
 import uuid
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister, accumulate_paged_results
 
 registry = CheckRegister()
-ram = boto3.client("ram")
+ram = get_client("ram")
 
 def get_resource_shares(cache):
     response = cache.get("get_resource_shares")
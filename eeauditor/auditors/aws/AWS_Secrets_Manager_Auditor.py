@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-secretsmanager = boto3.client("secretsmanager")
+secretsmanager = get_client("secretsmanager")
 
 def list_secrets(cache):
     response = cache.get("list_secrets")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-securityhub = boto3.client("securityhub")
+securityhub = get_client("securityhub")
 
 def get_findings(cache, awsAccountId):
     response = cache.get("get_findings")
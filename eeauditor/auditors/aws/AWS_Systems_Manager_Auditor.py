@@ -19,14 +19,14 @@
 #under the License.
 
 import datetime
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # Boto3 Clients
-ssm = boto3.client("ssm")
-ec2 = boto3.client("ec2")
+ssm = get_client("ssm")
+ec2 = get_client("ec2")
 
 def get_owned_ssm_docs(cache):
     ssmDocs = []
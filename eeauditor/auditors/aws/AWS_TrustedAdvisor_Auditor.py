@@ -18,22 +18,26 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import botocore
 from check_register import CheckRegister
+from trusted_advisor import get_check_summaries
 
 registry = CheckRegister()
 # import boto3 clients
-support = boto3.client("support")
+support = get_client("support")
+# Trusted Advisor checks reported on by this Auditor, their summaries are collected together
+TRUSTED_ADVISOR_CHECK_NAMES = [
+    "MFA on Root Account",
+    "ELB Listener Security",
+    "CloudFront Custom SSL Certificates in the IAM Certificate Store",
+    "CloudFront SSL Certificate on the Origin Server",
+    "Exposed Access Keys"
+]
 
-# loop through WAFs
-def describe_trusted_advisor_checks(cache):
-    response = cache.get("describe_trusted_advisor_checks")
-    if response:
-        return response
-    cache["describe_trusted_advisor_checks"] = support.describe_trusted_advisor_checks(language='en')
-    return cache["describe_trusted_advisor_checks"]
+def describe_trusted_advisor_check_summaries(cache, awsAccountId):
+    return get_check_summaries(cache, support, awsAccountId, TRUSTED_ADVISOR_CHECK_NAMES)
 
 @registry.register_check("support")
 def trusted_advisor_failing_root_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -41,11 +45,11 @@ def trusted_advisor_failing_root_mfa_check(cache: dict, awsAccountId: str, awsRe
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     if awsRegion == 'us-east-1':
         try:
-            for t in describe_trusted_advisor_checks(cache=cache)["checks"]:
-                if str(t["name"]) == "MFA on Root Account":
-                    checkId = str(t["id"])
+            for summary in describe_trusted_advisor_check_summaries(cache, awsAccountId):
+                if summary["name"] == "MFA on Root Account":
+                    checkId = str(summary["checkId"])
                     # this is a failing check
-                    if int(support.describe_trusted_advisor_check_result(checkId=checkId)["result"]["resourcesSummary"]["resourcesFlagged"]) >= 1:
+                    if int(summary["resourcesFlagged"]) >= 1:
                         finding = {
                             "SchemaVersion": "2018-10-08",
                             "Id": awsAccountId + checkId + "/trusted-advisor-failing-root-mfa-check",
@@ -195,11 +199,11 @@ def trusted_advisor_failing_elb_listener_security_check(cache: dict, awsAccountI
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     if awsRegion == 'us-east-1':
         try:
-            for t in describe_trusted_advisor_checks(cache=cache)["checks"]:
-                if str(t["name"]) == "ELB Listener Security":
-                    checkId = str(t["id"])
+            for summary in describe_trusted_advisor_check_summaries(cache, awsAccountId):
+                if summary["name"] == "ELB Listener Security":
+                    checkId = str(summary["checkId"])
                     # this is a failing check
-                    if int(support.describe_trusted_advisor_check_result(checkId=checkId)["result"]["resourcesSummary"]["resourcesFlagged"]) >= 1:
+                    if int(summary["resourcesFlagged"]) >= 1:
                         finding = {
                             "SchemaVersion": "2018-10-08",
                             "Id": awsAccountId + checkId + "/trusted-advisor-failing-elb-listener-security-check",
@@ -323,11 +327,11 @@ def trusted_advisor_failing_cloudfront_ssl_cert_iam_certificate_store_check(cach
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     if awsRegion == 'us-east-1':
         try:
-            for t in describe_trusted_advisor_checks(cache=cache)["checks"]:
-                if str(t["name"]) == "CloudFront Custom SSL Certificates in the IAM Certificate Store":
-                    checkId = str(t["id"])
+            for summary in describe_trusted_advisor_check_summaries(cache, awsAccountId):
+                if summary["name"] == "CloudFront Custom SSL Certificates in the IAM Certificate Store":
+                    checkId = str(summary["checkId"])
                     # this is a failing check
-                    if int(support.describe_trusted_advisor_check_result(checkId=checkId)["result"]["resourcesSummary"]["resourcesFlagged"]) >= 1:
+                    if int(summary["resourcesFlagged"]) >= 1:
                         finding = {
                             "SchemaVersion": "2018-10-08",
                             "Id": awsAccountId + checkId + "/trusted-advisor-failing-cloudfront-ssl-cert-iam-cert-store-check",
@@ -451,11 +455,11 @@ def trusted_advisor_failing_cloudfront_ssl_cert_on_origin_check(cache: dict, aws
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     if awsRegion == 'us-east-1':
         try:
-            for t in describe_trusted_advisor_checks(cache=cache)["checks"]:
-                if str(t["name"]) == "CloudFront SSL Certificate on the Origin Server":
-                    checkId = str(t["id"])
+            for summary in describe_trusted_advisor_check_summaries(cache, awsAccountId):
+                if summary["name"] == "CloudFront SSL Certificate on the Origin Server":
+                    checkId = str(summary["checkId"])
                     # this is a failing check
-                    if int(support.describe_trusted_advisor_check_result(checkId=checkId)["result"]["resourcesSummary"]["resourcesFlagged"]) >= 1:
+                    if int(summary["resourcesFlagged"]) >= 1:
                         finding = {
                             "SchemaVersion": "2018-10-08",
                             "Id": awsAccountId + checkId + "/trusted-advisor-failing-cloudfront-ssl-origin-check",
@@ -579,11 +583,11 @@ def trusted_advisor_failing_exposed_access_keys_check(cache: dict, awsAccountId:
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     if awsRegion == 'us-east-1':
         try:
-            for t in describe_trusted_advisor_checks(cache=cache)["checks"]:
-                if str(t["name"]) == "Exposed Access Keys":
-                    checkId = str(t["id"])
+            for summary in describe_trusted_advisor_check_summaries(cache, awsAccountId):
+                if summary["name"] == "Exposed Access Keys":
+                    checkId = str(summary["checkId"])
                     # this is a failing check
-                    if int(support.describe_trusted_advisor_check_result(checkId=checkId)["result"]["resourcesSummary"]["resourcesFlagged"]) >= 1:
+                    if int(summary["resourcesFlagged"]) >= 1:
                         finding = {
                             "SchemaVersion": "2018-10-08",
                             "Id": awsAccountId + checkId + "/trusted-advisor-expose-iam-keys-check",
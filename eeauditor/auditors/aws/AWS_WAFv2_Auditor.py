@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import botocore
 from check_register import CheckRegister
@@ -26,8 +26,8 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-wafv2 = boto3.client("wafv2")
-globalWafv2 = boto3.client("wafv2", region_name="us-east-1")
+wafv2 = get_client("wafv2")
+globalWafv2 = get_client("wafv2", region_name="us-east-1")
 
 # loop through WAFs
 def list_wafs(cache):
@@ -38,11 +38,11 @@ def list_wafs(cache):
     return cache["list_web_acls"]
 
 def list_wafs_global(cache):
-    response = cache.get("list_web_acls")
+    response = cache.get("list_web_acls_global")
     if response:
         return response
-    cache["list_web_acls"] = globalWafv2.list_web_acls(Scope='CLOUDFRONT')
-    return cache["list_web_acls"]
+    cache["list_web_acls_global"] = globalWafv2.list_web_acls(Scope='CLOUDFRONT')
+    return cache["list_web_acls_global"]
 
 @registry.register_check("wafv2")
 def wafv2_web_acl_metrics_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -17,14 +17,14 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-apigateway = boto3.client("apigateway")
+apigateway = get_client("apigateway")
 
 def get_rest_apis(cache):
     response = cache.get("get_rest_apis")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import botocore.exceptions
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
-appstream = boto3.client("appstream")
+appstream = get_client("appstream")
 
 @registry.register_check("appstream")
 def default_internet_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-athena = boto3.client("athena")
+athena = get_client("athena")
 
 # Get all Athena work groups
 def list_work_groups(cache):
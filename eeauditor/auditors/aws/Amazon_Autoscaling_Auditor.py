@@ -18,15 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # Boto3 clients
-ec2 = boto3.client("ec2")
-autoscaling = boto3.client("autoscaling")
+ec2 = get_client("ec2")
+autoscaling = get_client("autoscaling")
 
 def describe_auto_scaling_groups(cache):
     response = cache.get("describe_auto_scaling_groups")
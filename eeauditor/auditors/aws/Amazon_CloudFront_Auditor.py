@@ -19,12 +19,12 @@
 #under the License.
 
 import datetime
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-cloudfront = boto3.client("cloudfront")
+cloudfront = get_client("cloudfront")
 
 def paginate(cache):
     itemList = []
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-cloudsearch = boto3.client("cloudsearch")
+cloudsearch = get_client("cloudsearch")
 
 @registry.register_check("cloudsearch")
 def cloudsearch_https_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -17,7 +17,7 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+from aws_clients import get_client
 import botocore
 import datetime
 from check_register import CheckRegister, accumulate_paged_results
@@ -25,8 +25,8 @@ from check_register import CheckRegister, accumulate_paged_results
 registry = CheckRegister()
 
 # boto3 clients
-cognitoidp = boto3.client("cognito-idp")
-wafv2 = boto3.client("wafv2")
+cognitoidp = get_client("cognito-idp")
+wafv2 = get_client("wafv2")
 
 # loop through Cognito User Pools
 def list_user_pools(cache):
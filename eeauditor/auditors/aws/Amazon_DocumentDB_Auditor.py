@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-documentdb = boto3.client("docdb")
+documentdb = get_client("docdb")
 
 # Get all DB Instances
 def describe_db_instances(cache):
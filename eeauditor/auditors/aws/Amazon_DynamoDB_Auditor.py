@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-dynamodb = boto3.client("dynamodb")
+dynamodb = get_client("dynamodb")
 
 # loop through DynamoDB tables
 def list_tables(cache):
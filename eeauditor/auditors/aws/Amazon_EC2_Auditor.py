@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from dateutil.parser import parse
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-ec2 = boto3.client("ec2")
+ec2 = get_client("ec2")
 
 def describe_instances(cache):
     instanceList = []
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import json
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-imagebuilder = boto3.client("imagebuilder")
+imagebuilder = get_client("imagebuilder")
 
 
 @registry.register_check("imagebuilder")
@@ -18,23 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 from dateutil.parser import parse
-from botocore.config import Config
-# Adding backoff and retries for SSM - this API gets throttled a lot
-config = Config(
-   retries = {
-      'max_attempts': 10,
-      'mode': 'adaptive'
-   }
-)
 
 registry = CheckRegister()
 # create boto3 clients
-ec2 = boto3.client("ec2",config=config)
-ssm = boto3.client("ssm",config=config)
+ec2 = get_client("ec2")
+ssm = get_client("ssm")
 
 def paginate(cache):
     instanceList = []
@@ -50,6 +42,43 @@ def paginate(cache):
         cache["instances"] = instanceList
         return cache["instances"]
 
+# DescribeInstancePatchStates accepts up to 50 instance IDs per call
+PATCH_STATES_BATCH_SIZE = 50
+
+def describe_instance_information(cache):
+    # every SSM managed instance keyed by InstanceId, pulled once for every check
+    response = cache.get("describe_instance_information")
+    if response is not None:
+        return response
+    managedInstances = {}
+    paginator = ssm.get_paginator("describe_instance_information")
+    for page in paginator.paginate():
+        for instanceInformation in page["InstanceInformationList"]:
+            managedInstances[instanceInformation["InstanceId"]] = instanceInformation
+    cache["describe_instance_information"] = managedInstances
+    return cache["describe_instance_information"]
+
+def get_instance_information(cache, instance_id):
+    # same shape as the InstanceInformationList of a DescribeInstanceInformation call filtered on one instance
+    instanceInformation = describe_instance_information(cache).get(instance_id)
+    return [instanceInformation] if instanceInformation else []
+
+def describe_instance_patch_states(cache):
+    # patch state of the running managed instances keyed by InstanceId, described 50 instances per call
+    response = cache.get("describe_instance_patch_states")
+    if response is not None:
+        return response
+    managedInstances = describe_instance_information(cache)
+    instanceIds = [i["InstanceId"] for i in paginate(cache=cache) if i["InstanceId"] in managedInstances]
+    patchStates = {}
+    paginator = ssm.get_paginator("describe_instance_patch_states")
+    for index in range(0, len(instanceIds), PATCH_STATES_BATCH_SIZE):
+        for page in paginator.paginate(InstanceIds=instanceIds[index:index + PATCH_STATES_BATCH_SIZE]):
+            for patchState in page["InstancePatchStates"]:
+                patchStates[patchState["InstanceId"]] = patchState
+    cache["describe_instance_patch_states"] = patchStates
+    return cache["describe_instance_patch_states"]
+
 @registry.register_check("ec2")
 def ec2_instance_ssm_managed_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[EC2-SSM.1] EC2 Instances should be managed by Systems Manager"""
@@ -67,14 +96,7 @@ def ec2_instance_ssm_managed_check(cache: dict, awsAccountId: str, awsRegion: st
         except KeyError:
             instanceLaunchedAt = str(i["LaunchTime"])
         # Check specific metadata
-        response = ssm.describe_instance_information(
-            Filters=[
-                {
-                    'Key': 'InstanceIds',
-                    'Values': [instanceId]
-                }
-            ]
-        )["InstanceInformationList"]
+        response = get_instance_information(cache, instanceId)
         # this is a failing check
         if not response:
             finding = {
@@ -206,14 +228,7 @@ def ssm_instace_agent_update_check(cache: dict, awsAccountId: str, awsRegion: st
         except KeyError:
             instanceLaunchedAt = str(i["LaunchTime"])
         # Check specific metadata
-        r = ssm.describe_instance_information(
-            Filters=[
-                {
-                    'Key': 'InstanceIds',
-                    'Values': [instanceId]
-                }
-            ]
-        )["InstanceInformationList"]
+        r = get_instance_information(cache, instanceId)
         if not r:
             continue
         else:
@@ -352,14 +367,7 @@ def ssm_instance_association_check(cache: dict, awsAccountId: str, awsRegion: st
         except KeyError:
             instanceLaunchedAt = str(i["LaunchTime"])
         # Check specific metadata
-        r = ssm.describe_instance_information(
-            Filters=[
-                {
-                    'Key': 'InstanceIds',
-                    'Values': [instanceId]
-                }
-            ]
-        )["InstanceInformationList"]
+        r = get_instance_information(cache, instanceId)
         if not r:
             continue
         else:
@@ -496,8 +504,7 @@ def ssm_instance_patch_state_state(cache: dict, awsAccountId: str, awsRegion: st
         except KeyError:
             instanceLaunchedAt = str(i["LaunchTime"])
         # Check specific metadata
-        r = ssm.describe_instance_patches(InstanceId=instanceId)              
-        if not r["Patches"]:
+        if instanceId not in describe_instance_patch_states(cache):
             # This is a failing check
             finding = {
                 "SchemaVersion": "2018-10-08",
@@ -18,10 +18,11 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import json
 import os
 import datetime
+import functools
 from check_register import CheckRegister
 
 registry = CheckRegister()
@@ -30,7 +31,16 @@ registry = CheckRegister()
 dirPath = os.path.dirname(os.path.realpath(__file__))
 configFile = f"{dirPath}/electriceye_secgroup_auditor_config.json"
 
-ec2 = boto3.client("ec2")
+ec2 = get_client("ec2")
+
+@functools.lru_cache(maxsize=1)
+def get_port_check_index():
+    """Returns the configuration file entries indexed by (Protocol, FromPort, ToPort), the file is only read once"""
+    portChecks = {}
+    with open(configFile, 'r') as jsonfile:
+        for x in json.load(jsonfile):
+            portChecks.setdefault((x["Protocol"], x["FromPort"], x["ToPort"]), []).append(x)
+    return portChecks
 
 # loop through security groups
 def describe_security_groups(cache):
@@ -185,175 +195,156 @@ def security_group_all_open_check(cache: dict, awsAccountId: str, awsRegion: str
 def security_group_master_auditor_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """The Security Group Master Auditor check generates findings for every configuration file entry"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    portChecks = get_port_check_index()
 
-    # Open the Configuration file and parse the information within the dynamically populate this auditor
-    with open(configFile, 'r') as jsonfile:
-        for x in json.load(jsonfile):
-            toPortTarget = x["ToPort"]
-            fromPortTarget = x["FromPort"]
-            targetProtocol = x["Protocol"]
-            checkTitle = x["CheckTitle"]
-            checkId = x["CheckId"]
-            checkDescription = x["CheckDescriptor"]
+    print(f"Auditing all Security Groups for unrestricted access to {sum(len(x) for x in portChecks.values())} configured services")
 
-            print(f"Auditing all Security Groups for unrestricted {checkDescription} access")
+    # Parse security groups from Cache, every rule is evaluated against all configured checks in one pass
+    response = describe_security_groups(cache)
+    mySgs = response["SecurityGroups"]
+    for secgroup in mySgs:
+        sgName = str(secgroup["GroupName"])
+        sgId = str(secgroup["GroupId"])
+        sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
+        for permissions in secgroup["IpPermissions"]:
+            # If there any exceptions this SG is likely associated with a SG Target or a Peering Connection
+            try:
+                fromPort = permissions["FromPort"]
+                toPort = permissions["ToPort"]
+                ipProtocol = str(permissions["IpProtocol"])
+            except KeyError:
+                continue
+            # configuration file entries for exactly this protocol and port range, most rules have none
+            matchingChecks = portChecks.get((ipProtocol, fromPort, toPort))
+            if not matchingChecks:
+                continue
 
-            # Parse security groups from Cache
-            response = describe_security_groups(cache)
-            mySgs = response["SecurityGroups"]
-            for secgroup in mySgs:
-                sgName = str(secgroup["GroupName"])
-                sgId = str(secgroup["GroupId"])
-                sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
-                for permissions in secgroup["IpPermissions"]:
-                    # If there any exceptions this SG is likely associated with a SG Target or a Peering Connection
-                    try:
-                        fromPort = permissions["FromPort"]
-                    except KeyError:
-                        continue
-                    try:
-                        toPort = permissions["ToPort"]
-                    except KeyError:
-                        continue
-                    try:
-                        ipProtocol = str(permissions["IpProtocol"])
-                    except KeyError:
-                        continue
+            # Now Process the Ranges
+            ipRanges = permissions["IpRanges"]
+            for cidrs in ipRanges:
+                cidrIpRange = str(cidrs["CidrIp"])
+                for x in matchingChecks:
+                    checkTitle = x["CheckTitle"]
+                    checkId = x["CheckId"]
+                    checkDescription = x["CheckDescriptor"]
 
-                    # Now Process the Ranges
-                    ipRanges = permissions["IpRanges"]
-                    for cidrs in ipRanges:
-                        cidrIpRange = str(cidrs["CidrIp"])
-                
-                        if (
-                            toPort == toPortTarget
-                            and fromPort == fromPortTarget
-                            and ipProtocol == targetProtocol
-                            and cidrIpRange == "0.0.0.0/0"
-                        ):
-                            finding = {
-                                "SchemaVersion": "2018-10-08",
-                                "Id": f"{sgArn}/{ipProtocol}/{checkId}",
-                                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                                "GeneratorId": sgArn,
-                                "AwsAccountId": awsAccountId,
-                                "Types": [
-                                    "Software and Configuration Checks/AWS Security Best Practices",
-                                    "Effects/Data Exposure",
-                                ],
-                                "FirstObservedAt": iso8601Time,
-                                "CreatedAt": iso8601Time,
-                                "UpdatedAt": iso8601Time,
-                                "Severity": {"Label": "HIGH"},
-                                "Confidence": 99,
-                                "Title": checkTitle,
-                                "Description": f"{sgName} allows unrestricted {checkDescription} access. Refer to the remediation instructions to remediate this behavior. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements.",
-                                "Remediation": {
-                                    "Recommendation": {
-                                        "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                                        "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
-                                    }
-                                },
-                                "ProductFields": {"Product Name": "ElectricEye"},
-                                "Resources": [
-                                    {
-                                        "Type": "AwsEc2SecurityGroup",
-                                        "Id": sgArn,
-                                        "Partition": awsPartition,
-                                        "Region": awsRegion,
-                                        "Details": {
-                                            "AwsEc2SecurityGroup": {
-                                                "GroupName": sgName,
-                                                "GroupId": sgId
-                                            }
+                    if cidrIpRange == "0.0.0.0/0":
+                        finding = {
+                            "SchemaVersion": "2018-10-08",
+                            "Id": f"{sgArn}/{ipProtocol}/{checkId}",
+                            "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                            "GeneratorId": sgArn,
+                            "AwsAccountId": awsAccountId,
+                            "Types": [
+                                "Software and Configuration Checks/AWS Security Best Practices",
+                                "Effects/Data Exposure",
+                            ],
+                            "FirstObservedAt": iso8601Time,
+                            "CreatedAt": iso8601Time,
+                            "UpdatedAt": iso8601Time,
+                            "Severity": {"Label": "HIGH"},
+                            "Confidence": 99,
+                            "Title": checkTitle,
+                            "Description": f"{sgName} allows unrestricted {checkDescription} access. Refer to the remediation instructions to remediate this behavior. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements.",
+                            "Remediation": {
+                                "Recommendation": {
+                                    "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
+                                    "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
+                                }
+                            },
+                            "ProductFields": {"Product Name": "ElectricEye"},
+                            "Resources": [
+                                {
+                                    "Type": "AwsEc2SecurityGroup",
+                                    "Id": sgArn,
+                                    "Partition": awsPartition,
+                                    "Region": awsRegion,
+                                    "Details": {
+                                        "AwsEc2SecurityGroup": {
+                                            "GroupName": sgName,
+                                            "GroupId": sgId
                                         }
                                     }
-                                ],
-                                "Compliance": {
-                                    "Status": "FAILED",
-                                    "RelatedRequirements": [
-                                        "NIST CSF PR.AC-3",
-                                        "NIST SP 800-53 AC-1",
-                                        "NIST SP 800-53 AC-17",
-                                        "NIST SP 800-53 AC-19",
-                                        "NIST SP 800-53 AC-20",
-                                        "NIST SP 800-53 SC-15",
-                                        "AICPA TSC CC6.6",
-                                        "ISO 27001:2013 A.6.2.1",
-                                        "ISO 27001:2013 A.6.2.2",
-                                        "ISO 27001:2013 A.11.2.6",
-                                        "ISO 27001:2013 A.13.1.1",
-                                        "ISO 27001:2013 A.13.2.1"
-                                    ]
-                                },
-                                "Workflow": {"Status": "NEW"},
-                                "RecordState": "ACTIVE"
-                            }
-                            yield finding
-                        elif (
-                            toPort == toPortTarget
-                            and fromPort == fromPortTarget
-                            and ipProtocol == targetProtocol
-                            and cidrIpRange != "0.0.0.0/0"
-                        ):
-                            finding = {
-                                "SchemaVersion": "2018-10-08",
-                                "Id": f"{sgArn}/{ipProtocol}/{checkId}",
-                                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                                "GeneratorId": sgArn,
-                                "AwsAccountId": awsAccountId,
-                                "Types": [
-                                    "Software and Configuration Checks/AWS Security Best Practices",
-                                    "Effects/Data Exposure",
-                                ],
-                                "FirstObservedAt": iso8601Time,
-                                "CreatedAt": iso8601Time,
-                                "UpdatedAt": iso8601Time,
-                                "Severity": {"Label": "INFORMATIONAL"},
-                                "Confidence": 99,
-                                "Title": checkTitle,
-                                "Description": f"{sgName} does not allow unrestricted {checkDescription} access.",
-                                "Remediation": {
-                                    "Recommendation": {
-                                        "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                                        "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
-                                    }
-                                },
-                                "ProductFields": {"Product Name": "ElectricEye"},
-                                "Resources": [
-                                    {
-                                        "Type": "AwsEc2SecurityGroup",
-                                        "Id": sgArn,
-                                        "Partition": awsPartition,
-                                        "Region": awsRegion,
-                                        "Details": {
-                                            "AwsEc2SecurityGroup": {
-                                                "GroupName": sgName,
-                                                "GroupId": sgId
-                                            }
+                                }
+                            ],
+                            "Compliance": {
+                                "Status": "FAILED",
+                                "RelatedRequirements": [
+                                    "NIST CSF PR.AC-3",
+                                    "NIST SP 800-53 AC-1",
+                                    "NIST SP 800-53 AC-17",
+                                    "NIST SP 800-53 AC-19",
+                                    "NIST SP 800-53 AC-20",
+                                    "NIST SP 800-53 SC-15",
+                                    "AICPA TSC CC6.6",
+                                    "ISO 27001:2013 A.6.2.1",
+                                    "ISO 27001:2013 A.6.2.2",
+                                    "ISO 27001:2013 A.11.2.6",
+                                    "ISO 27001:2013 A.13.1.1",
+                                    "ISO 27001:2013 A.13.2.1"
+                                ]
+                            },
+                            "Workflow": {"Status": "NEW"},
+                            "RecordState": "ACTIVE"
+                        }
+                        yield finding
+                    else:
+                        finding = {
+                            "SchemaVersion": "2018-10-08",
+                            "Id": f"{sgArn}/{ipProtocol}/{checkId}",
+                            "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                            "GeneratorId": sgArn,
+                            "AwsAccountId": awsAccountId,
+                            "Types": [
+                                "Software and Configuration Checks/AWS Security Best Practices",
+                                "Effects/Data Exposure",
+                            ],
+                            "FirstObservedAt": iso8601Time,
+                            "CreatedAt": iso8601Time,
+                            "UpdatedAt": iso8601Time,
+                            "Severity": {"Label": "INFORMATIONAL"},
+                            "Confidence": 99,
+                            "Title": checkTitle,
+                            "Description": f"{sgName} does not allow unrestricted {checkDescription} access.",
+                            "Remediation": {
+                                "Recommendation": {
+                                    "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
+                                    "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
+                                }
+                            },
+                            "ProductFields": {"Product Name": "ElectricEye"},
+                            "Resources": [
+                                {
+                                    "Type": "AwsEc2SecurityGroup",
+                                    "Id": sgArn,
+                                    "Partition": awsPartition,
+                                    "Region": awsRegion,
+                                    "Details": {
+                                        "AwsEc2SecurityGroup": {
+                                            "GroupName": sgName,
+                                            "GroupId": sgId
                                         }
                                     }
-                                ],
-                                "Compliance": {
-                                    "Status": "PASSED",
-                                    "RelatedRequirements": [
-                                        "NIST CSF PR.AC-3",
-                                        "NIST SP 800-53 AC-1",
-                                        "NIST SP 800-53 AC-17",
-                                        "NIST SP 800-53 AC-19",
-                                        "NIST SP 800-53 AC-20",
-                                        "NIST SP 800-53 SC-15",
-                                        "AICPA TSC CC6.6",
-                                        "ISO 27001:2013 A.6.2.1",
-                                        "ISO 27001:2013 A.6.2.2",
-                                        "ISO 27001:2013 A.11.2.6",
-                                        "ISO 27001:2013 A.13.1.1",
-                                        "ISO 27001:2013 A.13.2.1"
-                                    ]
-                                },
-                                "Workflow": {"Status": "RESOLVED"},
-                                "RecordState": "ARCHIVED"
-                            }
-                            yield finding
-                        else:
-                            continue
\ No newline at end of file
+                                }
+                            ],
+                            "Compliance": {
+                                "Status": "PASSED",
+                                "RelatedRequirements": [
+                                    "NIST CSF PR.AC-3",
+                                    "NIST SP 800-53 AC-1",
+                                    "NIST SP 800-53 AC-17",
+                                    "NIST SP 800-53 AC-19",
+                                    "NIST SP 800-53 AC-20",
+                                    "NIST SP 800-53 SC-15",
+                                    "AICPA TSC CC6.6",
+                                    "ISO 27001:2013 A.6.2.1",
+                                    "ISO 27001:2013 A.6.2.2",
+                                    "ISO 27001:2013 A.11.2.6",
+                                    "ISO 27001:2013 A.13.1.1",
+                                    "ISO 27001:2013 A.13.2.1"
+                                ]
+                            },
+                            "Workflow": {"Status": "RESOLVED"},
+                            "RecordState": "ARCHIVED"
+                        }
+                        yield finding
@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 import botocore
 from check_register import CheckRegister
@@ -26,7 +26,7 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-ecr = boto3.client("ecr")
+ecr = get_client("ecr")
 # loop through ECR repos
 def describe_repositories(cache):
     response = cache.get("describe_repositories")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-ecs = boto3.client("ecs")
+ecs = get_client("ecs")
 
 def list_clusters(cache):
     response = cache.get("list_clusters")
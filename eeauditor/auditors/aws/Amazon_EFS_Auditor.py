@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-efs = boto3.client("efs")
+efs = get_client("efs")
 
 # loop through EFS file systems
 def describe_file_systems(cache):
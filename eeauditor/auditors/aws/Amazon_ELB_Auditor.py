@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-elb = boto3.client("elb")
+elb = get_client("elb")
 
 def describe_clbs(cache):
     # loop through ELB load balancers
@@ -18,16 +18,17 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
+from security_group_index import get_security_group_index
 
 registry = CheckRegister()
 
 # boto3 clients
-elbv2 = boto3.client("elbv2")
-ec2 = boto3.client("ec2")
-wafv2 = boto3.client("wafv2")
+elbv2 = get_client("elbv2")
+ec2 = get_client("ec2")
+wafv2 = get_client("wafv2")
 
 def describe_load_balancers(cache):
     # loop through ELBv2 load balancers
@@ -1167,8 +1168,8 @@ def elbv2_alb_sg_risk_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
                         continue
             # Now we can start to perform evaluations per SG
             for sgid in lbSgs:
-                # pass SG ID to Describe SG Rules API via filter and loop each rule
-                for sgrs in ec2.describe_security_group_rules(Filters=[{'Name': 'group-id','Values': [sgid]}])["SecurityGroupRules"]:
+                # look up the rules of the SG in the shared index and loop each rule
+                for sgrs in get_security_group_index(cache, ec2).rules(sgid):
                     # if the from port or to port range is not within the Listener or Redirect Ports then it's a failing check
                     # we will skip egress rules though
                     if str(sgrs["IsEgress"]) == "True":
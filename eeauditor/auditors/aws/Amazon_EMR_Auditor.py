@@ -17,7 +17,7 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import boto3
+from aws_clients import get_client
 import json
 import datetime
 from check_register import CheckRegister
@@ -25,7 +25,7 @@ from check_register import CheckRegister
 registry = CheckRegister()
 
 # import boto3 clients
-emr = boto3.client("emr")
+emr = get_client("emr")
 # loop through non-terminated EMR clusters
 
 def list_clusters(cache):
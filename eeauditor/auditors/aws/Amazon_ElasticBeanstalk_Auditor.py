@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticbeanstalk = boto3.client("elasticbeanstalk")
+elasticbeanstalk = get_client("elasticbeanstalk")
 
 # loop through EBS volumes
 def describe_environments(cache):
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticache = boto3.client("elasticache")
+elasticache = get_client("elasticache")
 
 
 @registry.register_check("elasticache")
@@ -19,14 +19,15 @@
 #under the License.
 
 import json
-import boto3
+from aws_clients import get_client, run_in_context
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-elasticsearch = boto3.client("es")
+elasticsearch = get_client("es")
 # loop through elasticsearch domains
 def list_domain_names(cache):
     response = cache.get("list_domain_names")
@@ -35,6 +36,33 @@ def list_domain_names(cache):
     cache["list_domain_names"] = elasticsearch.list_domain_names()
     return cache["list_domain_names"]
 
+# DescribeElasticsearchDomains accepts up to 5 domain names per call
+DESCRIBE_DOMAINS_BATCH_SIZE = 5
+DESCRIBE_DOMAINS_WORKERS = 4
+
+def describe_elasticsearch_domains(cache):
+    # DomainStatus of every domain keyed by name, described in parallel batches once for every check
+    response = cache.get("describe_elasticsearch_domains")
+    if response is not None:
+        return response
+    domainNames = [str(domain["DomainName"]) for domain in list_domain_names(cache)["DomainNames"]]
+    batches = [
+        domainNames[i:i + DESCRIBE_DOMAINS_BATCH_SIZE] for i in range(0, len(domainNames), DESCRIBE_DOMAINS_BATCH_SIZE)
+    ]
+    # pool threads keep the Account & Region of the calling thread and report their calls to its check
+    describeDomains = run_in_context(lambda batch: elasticsearch.describe_elasticsearch_domains(DomainNames=batch))
+    domains = {}
+    with ThreadPoolExecutor(max_workers=DESCRIBE_DOMAINS_WORKERS) as pool:
+        for page in pool.map(describeDomains, batches):
+            for domainStatus in page["DomainStatusList"]:
+                domains[domainStatus["DomainName"]] = domainStatus
+    cache["describe_elasticsearch_domains"] = domains
+    return cache["describe_elasticsearch_domains"]
+
+def describe_elasticsearch_domain(cache, domain_name):
+    # same shape as a DescribeElasticsearchDomain response, read from the batched descriptions
+    return {"DomainStatus": describe_elasticsearch_domains(cache)[domain_name]}
+
 
 @registry.register_check("es")
 def dedicated_master_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -43,7 +71,7 @@ def dedicated_master_check(cache: dict, awsAccountId: str, awsRegion: str, awsPa
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -180,7 +208,7 @@ def cognito_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition:
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -328,7 +356,7 @@ def encryption_at_rest_check(cache: dict, awsAccountId: str, awsRegion: str, aws
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -459,7 +487,7 @@ def node2node_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, a
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -602,7 +630,7 @@ def https_enforcement_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -745,7 +773,7 @@ def tls_policy_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartitio
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -902,7 +930,7 @@ def elastic_update_check(cache: dict, awsAccountId: str, awsRegion: str, awsPart
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -1037,7 +1065,7 @@ def elasticsearch_in_vpc_check(cache: dict, awsAccountId: str, awsRegion: str, a
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -1182,7 +1210,7 @@ def elasticsearch_public_access_check(cache: dict, awsAccountId: str, awsRegion:
     myDomainNames = response["DomainNames"]
     for domains in myDomainNames:
         esDomainName = str(domains["DomainName"])
-        response = elasticsearch.describe_elasticsearch_domain(DomainName=esDomainName)
+        response = describe_elasticsearch_domain(cache, esDomainName)
         esVersion = str(response["DomainStatus"]["ElasticsearchVersion"])
         domainId = str(response["DomainStatus"]["DomainId"])
         domainArn = str(response["DomainStatus"]["ARN"])
@@ -21,11 +21,11 @@
 import datetime
 from dateutil import parser
 import uuid
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister, accumulate_paged_results
 
 registry = CheckRegister()
-kinesisanalyticsv2 = boto3.client("kinesisanalyticsv2")
+kinesisanalyticsv2 = get_client("kinesisanalyticsv2")
 
 @registry.register_check("kinesisanalyticsv2")
 def kda_log_to_cloudwatch_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-kinesis = boto3.client("kinesis")
+kinesis = get_client("kinesis")
 
 # loop through kinesis streams
 def list_streams(cache):
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-firehose = boto3.client("firehose")
+firehose = get_client("firehose")
 
 # loop through Firehose delivery streams
 def list_delivery_streams(cache):
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-amzmq = boto3.client("mq")
+amzmq = get_client("mq")
 
 # loop through Amazon MQ Brokers
 def list_brokers(cache):
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-kafka = boto3.client("kafka")
+kafka = get_client("kafka")
 
 # loop through managed kafka clusters
 def list_clusters(cache):
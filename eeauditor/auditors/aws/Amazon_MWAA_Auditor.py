@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-mwaa = boto3.client("mwaa")
+mwaa = get_client("mwaa")
 
 def list_environments(cache):
     response = cache.get("list_environments")
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-amb = boto3.client("managedblockchain")
+amb = get_client("managedblockchain")
 
 # loop through AMB Fabric networks
 def list_networks(cache):
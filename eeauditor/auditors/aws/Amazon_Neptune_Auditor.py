@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # import boto3 clients
-neptune = boto3.client("neptune")
+neptune = get_client("neptune")
 
 # loop through neptune instances
 def describe_db_instances(cache):
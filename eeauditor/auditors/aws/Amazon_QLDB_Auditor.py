@@ -21,11 +21,11 @@
 import datetime
 from dateutil import parser
 import uuid
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister, accumulate_paged_results
 
 registry = CheckRegister()
-qldb = boto3.client("qldb")
+qldb = get_client("qldb")
 
 @registry.register_check("qldb")
 def qldb_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-redshift = boto3.client("redshift")
+redshift = get_client("redshift")
 
 def describe_redshift_clusters(cache):
     redshiftClusters = []
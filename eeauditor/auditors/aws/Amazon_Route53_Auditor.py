@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
-route53 = boto3.client("route53")
+route53 = get_client("route53")
 
 def get_hosted_zones(cache):
     zones = []
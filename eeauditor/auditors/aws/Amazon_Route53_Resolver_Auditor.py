@@ -18,15 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 
 # create boto3 clients
-ec2 = boto3.client("ec2")
-route53resolver = boto3.client("route53resolver")
+ec2 = get_client("ec2")
+route53resolver = get_client("route53resolver")
 
 # loop through vpcs
 def describe_vpcs(cache):
@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-s3 = boto3.client("s3")
-s3control = boto3.client("s3control")
+s3 = get_client("s3")
+s3control = get_client("s3control")
 # loop through s3 buckets
 def list_buckets(cache):
     response = cache.get("list_buckets")
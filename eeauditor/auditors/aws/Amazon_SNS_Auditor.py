@@ -20,13 +20,14 @@
 
 import datetime
 import json
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister
+from policy_analyzer import analyze_policy
 
 registry = CheckRegister()
 
 # import boto3 clients
-sns = boto3.client("sns")
+sns = get_client("sns")
 
 def list_topics(cache):
     response = cache.get("list_topics")
@@ -292,20 +293,8 @@ def sns_public_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             f"arn:{awsPartition}:sns:{awsRegion}:{awsAccountId}:", ""
         )
         response = sns.get_topic_attributes(TopicArn=topicarn)
-        statement_json = response["Attributes"]["Policy"]
-        statement = json.loads(statement_json)
-        fail = False
         # this results in one finding per topic instead of one finding per statement
-        for sid in statement["Statement"]:
-            if sid["Principal"] == "*":
-                access = "*"
-            else:
-                access = sid["Principal"].get("AWS", None)
-            if access != "*" or (access == "*" and "Condition" in sid):
-                continue
-            else:
-                fail = True
-                break
+        fail = analyze_policy(response["Attributes"]["Policy"]).is_public
         if not fail:
             finding = {
                 "SchemaVersion": "2018-10-08",
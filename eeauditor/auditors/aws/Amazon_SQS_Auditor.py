@@ -20,13 +20,14 @@
 
 import datetime
 from dateutil import parser
-import boto3
-import json
+from aws_clients import get_client
 from check_register import CheckRegister
+from policy_analyzer import analyze_policy
+from metrics_collector import get_metrics_collector, metric_stat
 
 registry = CheckRegister()
-sqs = boto3.client("sqs")
-cloudwatch = boto3.client("cloudwatch")
+sqs = get_client("sqs")
+cloudwatch = get_client("cloudwatch")
 
 def list_queues(cache):
     response = cache.get("list_queues")
@@ -35,12 +36,29 @@ def list_queues(cache):
     cache["list_queues"] = sqs.list_queues()
     return cache["list_queues"]
 
+def get_oldest_message_ages(cache, queue_urls):
+    # hourly age of the oldest message of every queue over the last day, collected in batched GetMetricData requests
+    metrics = get_metrics_collector(cache, cloudwatch)
+    endTime = datetime.datetime.now(datetime.timezone.utc)
+    startTime = endTime - datetime.timedelta(days=1)
+    queueNames = [queueUrl.rsplit("/", 1)[-1] for queueUrl in queue_urls]
+    for queueName in queueNames:
+        metrics.add(
+            ("AWS/SQS", "ApproximateAgeOfOldestMessage", queueName),
+            metric_stat("AWS/SQS", "ApproximateAgeOfOldestMessage", {"QueueName": queueName}, 3600, "Maximum", "Seconds"),
+            startTime,
+            endTime
+        )
+    results = metrics.collect()
+    return {queueName: results[("AWS/SQS", "ApproximateAgeOfOldestMessage", queueName)] for queueName in queueNames}
+
 @registry.register_check("sqs")
 def sqs_old_message_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SQS.1] SQS messages should not be older than 80 percent of message retention"""
     response = list_queues(cache)
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     if 'QueueUrls' in response:
+        oldestMessageAges = get_oldest_message_ages(cache, response["QueueUrls"])
         for queueUrl in response["QueueUrls"]:
             queueName = queueUrl.rsplit("/", 1)[-1]
             attributes = sqs.get_queue_attributes(
@@ -48,35 +66,14 @@ def sqs_old_message_check(cache: dict, awsAccountId: str, awsRegion: str, awsPar
             )
             messageRetention = attributes["Attributes"]["MessageRetentionPeriod"]
             queueArn = attributes["Attributes"]["QueueArn"]
-            metricResponse = cloudwatch.get_metric_data(
-                MetricDataQueries=[
-                    {
-                        "Id": "m1",
-                        "MetricStat": {
-                            "Metric": {
-                                "Namespace": "AWS/SQS",
-                                "MetricName": "ApproximateAgeOfOldestMessage",
-                                "Dimensions": [{"Name": "QueueName", "Value": queueName}],
-                            },
-                            "Period": 3600,
-                            "Stat": "Maximum",
-                            "Unit": "Seconds",
-                        },
-                    },
-                ],
-                StartTime=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1),
-                EndTime=datetime.datetime.now(datetime.timezone.utc),
-            )
-            metrics = metricResponse["MetricDataResults"]
             counter = 0
             fail = False
-            for metric in metrics:
-                for value in metric["Values"]:
-                    if value > int(messageRetention) * 0.8:
-                        counter += 1
-                    if counter > 2:
-                        fail = True
-                        break
+            for value in oldestMessageAges[queueName]["Values"]:
+                if value > int(messageRetention) * 0.8:
+                    counter += 1
+                if counter > 2:
+                    fail = True
+                    break
             if not fail:
                 finding = {
                     "SchemaVersion": "2018-10-08",
@@ -307,15 +304,10 @@ def sqs_queue_public_accessibility_check(cache: dict, awsAccountId: str, awsRegi
                 QueueUrl=queueUrl, AttributeNames=["QueueArn", "Policy"]
             )
             queueArn=attributes["Attributes"]["QueueArn"]
-            queuePolicy=json.loads(attributes["Attributes"]["Policy"])
-
-            accessibility = "not_public"
-
-            for statement in queuePolicy["Statement"]:
-                if statement["Effect"] == 'Allow':
-                    if statement.get("Principal") == '*':
-                        if statement.get('Condition') == None: 
-                            accessibility = "public"
+            if analyze_policy(attributes["Attributes"]["Policy"]).is_public:
+                accessibility = "public"
+            else:
+                accessibility = "not_public"
 
             if accessibility == "not_public":
                 finding = {
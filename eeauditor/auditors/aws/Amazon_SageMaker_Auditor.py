@@ -19,12 +19,12 @@
 #under the License.
 
 import datetime
-import boto3
+from aws_clients import get_client
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-sagemaker = boto3.client("sagemaker")
+sagemaker = get_client("sagemaker")
 
 @registry.register_check("sagemaker")
 def sagemaker_notebook_encryption_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,40 +18,101 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
+from auditor_cache import get_account_cache
 
 registry = CheckRegister()
 # import boto3 clients
-sesh = boto3.session.Session()
-currentRegion = sesh.region_name
-if currentRegion != "us-east-1":
-    session = boto3.Session(region_name="us-east-1")
-    shield = session.client("shield")
-else:
-    shield = boto3.client("shield")
-route53 = boto3.client("route53")
-elbclassic = boto3.client("elb")
-elbv2 = boto3.client("elbv2")
-ec2 = boto3.client("ec2")
-cloudfront = boto3.client("cloudfront")
+# Shield APIs only available in us-east-1
+shield = get_client("shield", region_name="us-east-1")
+route53 = get_client("route53")
+elbclassic = get_client("elb")
+elbv2 = get_client("elbv2")
+ec2 = get_client("ec2")
+cloudfront = get_client("cloudfront")
+# Global Accelerator API is only available in us-west-2
+globalaccelerator = get_client("globalaccelerator", region_name="us-west-2")
 # put region conditional check in each individual function - Shield APIs only available in us-east-1
-# add a boto3.Session() to manually set Region to us-west-2 for Global Accelerators
+
+def get_protected_resource_arns(cache):
+    # ARNs of every resource protected by Shield Advanced, checks test membership instead of
+    # calling DescribeProtection for each of their resources. Protections are listed from
+    # us-east-1 for every Region so the index is kept once per Account
+    accountCache = get_account_cache(cache)
+    response = accountCache.get("shield_protected_resource_arns")
+    if response is not None:
+        return response
+    protectedArns = set()
+    paginator = shield.get_paginator("list_protections")
+    try:
+        for page in paginator.paginate():
+            for protection in page["Protections"]:
+                protectedArns.add(protection["ResourceArn"])
+    except shield.exceptions.ResourceNotFoundException:
+        # returned when the Account has no protections at all
+        protectedArns = set()
+    accountCache["shield_protected_resource_arns"] = frozenset(protectedArns)
+    return accountCache["shield_protected_resource_arns"]
+
+def list_hosted_zones(cache):
+    response = cache.get("list_hosted_zones")
+    if response:
+        return response
+    hostedZones = []
+    paginator = route53.get_paginator("list_hosted_zones")
+    for page in paginator.paginate():
+        hostedZones.extend(page["HostedZones"])
+    cache["list_hosted_zones"] = hostedZones
+    return cache["list_hosted_zones"]
+
+def describe_clbs(cache):
+    response = cache.get("describe_clbs")
+    if response:
+        return response
+    loadBalancers = []
+    paginator = elbclassic.get_paginator("describe_load_balancers")
+    for page in paginator.paginate():
+        loadBalancers.extend(page["LoadBalancerDescriptions"])
+    cache["describe_clbs"] = loadBalancers
+    return cache["describe_clbs"]
+
+def describe_load_balancers(cache):
+    response = cache.get("describe_load_balancers")
+    if response:
+        return response
+    loadBalancers = []
+    paginator = elbv2.get_paginator("describe_load_balancers")
+    for page in paginator.paginate():
+        loadBalancers.extend(page["LoadBalancers"])
+    cache["describe_load_balancers"] = loadBalancers
+    return cache["describe_load_balancers"]
+
+def list_distributions(cache):
+    response = cache.get("list_distributions")
+    if response:
+        return response
+    distributions = []
+    paginator = cloudfront.get_paginator("list_distributions")
+    for page in paginator.paginate():
+        # Items is left out when there are no distributions
+        distributions.extend(page["DistributionList"].get("Items", []))
+    cache["list_distributions"] = distributions
+    return cache["list_distributions"]
 
 @registry.register_check("shield")
 def shield_advanced_route_53_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ShieldAdvanced.1] Route 53 Hosted Zones should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    response = route53.list_hosted_zones()
-    for hostedzone in response["HostedZones"]:
+    protectedArns = get_protected_resource_arns(cache)
+    for hostedzone in list_hosted_zones(cache):
         rawHzId = str(hostedzone["Id"])
         hostedZoneId = rawHzId.replace("/hostedzone/", "")
         hostedZoneArn = f"arn:{awsPartition}:route53:::hostedzone/{hostedZoneId}"
-        try:
-            # this is a passing check
-            response = shield.describe_protection(ResourceArn=hostedZoneArn)
+        # this is a passing check
+        if hostedZoneArn in protectedArns:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
@@ -108,80 +169,76 @@ def shield_advanced_route_53_protection_check(cache: dict, awsAccountId: str, aw
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except Exception as e:
-            if (
-                str(e)
-                == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-            ):
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": hostedZoneArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "MEDIUM"},
-                    "Confidence": 99,
-                    "Title": "[ShieldAdvanced.1] Route 53 Hosted Zones should be protected by Shield Advanced",
-                    "Description": "Route53 Hosted Zone "
-                    + hostedZoneId
-                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsRoute53HostedZone",
-                            "Id": hostedZoneArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {"Other": {"hostedZoneId": hostedZoneId}},
-                        }
+        # this is a failing check
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": hostedZoneArn + "/route53-shield-adv-protection-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": hostedZoneArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "MEDIUM"},
+                "Confidence": 99,
+                "Title": "[ShieldAdvanced.1] Route 53 Hosted Zones should be protected by Shield Advanced",
+                "Description": "Route53 Hosted Zone "
+                + hostedZoneId
+                + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsRoute53HostedZone",
+                        "Id": hostedZoneArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {"hostedZoneId": hostedZoneId}},
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.BE-5",
+                        "NIST CSF PR.PT-5",
+                        "NIST SP 800-53 CP-2",
+                        "NIST SP 800-53 CP-11",
+                        "NIST SP 800-53 SA-13",
+                        "NIST SP 800-53 SA14",
+                        "AICPA TSC CC3.1",
+                        "AICPA TSC A1.2",
+                        "ISO 27001:2013 A.11.1.4",
+                        "ISO 27001:2013 A.17.1.1",
+                        "ISO 27001:2013 A.17.1.2",
+                        "ISO 27001:2013 A.17.2.1",
+                        "MITRE ATT&CK T1595",
+                        "MITRE ATT&CK T1590",
+                        "MITRE ATT&CK T1498"
                     ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.BE-5",
-                            "NIST CSF PR.PT-5",
-                            "NIST SP 800-53 CP-2",
-                            "NIST SP 800-53 CP-11",
-                            "NIST SP 800-53 SA-13",
-                            "NIST SP 800-53 SA14",
-                            "AICPA TSC CC3.1",
-                            "AICPA TSC A1.2",
-                            "ISO 27001:2013 A.11.1.4",
-                            "ISO 27001:2013 A.17.1.1",
-                            "ISO 27001:2013 A.17.1.2",
-                            "ISO 27001:2013 A.17.2.1",
-                            "MITRE ATT&CK T1595",
-                            "MITRE ATT&CK T1590",
-                            "MITRE ATT&CK T1498"
-                        ],
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE",
+            }
+            yield finding
 
 @registry.register_check("shield")
 def shield_advanced_elb_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ShieldAdvanced.2] Classic Load Balancers should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    response = elbclassic.describe_load_balancers()
-    for classicbalancer in response["LoadBalancerDescriptions"]:
+    protectedArns = get_protected_resource_arns(cache)
+    for classicbalancer in describe_clbs(cache):
         clbName = str(classicbalancer["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
-        try:
-            # this is a passing check
-            response = shield.describe_protection(ResourceArn=clbArn)
+        # this is a passing check
+        if clbArn in protectedArns:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": clbArn + "/classiclb-shield-adv-protection-check",
@@ -238,75 +295,72 @@ def shield_advanced_elb_protection_check(cache: dict, awsAccountId: str, awsRegi
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except Exception as e:
-            if (
-                str(e)
-                == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-            ):
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": clbArn + "/classiclb-shield-adv-protection-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": clbArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "MEDIUM"},
-                    "Confidence": 99,
-                    "Title": "[ShieldAdvanced.2] Classic Load Balancers should be protected by Shield Advanced",
-                    "Description": "Classic Load Balancer "
-                    + clbName
-                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsElbLoadBalancer",
-                            "Id": clbArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {"Other": {"LoadBalancerName": clbName}},
-                        }
+        # this is a failing check
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": clbArn + "/classiclb-shield-adv-protection-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": clbArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "MEDIUM"},
+                "Confidence": 99,
+                "Title": "[ShieldAdvanced.2] Classic Load Balancers should be protected by Shield Advanced",
+                "Description": "Classic Load Balancer "
+                + clbName
+                + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsElbLoadBalancer",
+                        "Id": clbArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {"LoadBalancerName": clbName}},
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.BE-5",
+                        "NIST CSF PR.PT-5",
+                        "NIST SP 800-53 CP-2",
+                        "NIST SP 800-53 CP-11",
+                        "NIST SP 800-53 SA-13",
+                        "NIST SP 800-53 SA14",
+                        "AICPA TSC CC3.1",
+                        "AICPA TSC A1.2",
+                        "ISO 27001:2013 A.11.1.4",
+                        "ISO 27001:2013 A.17.1.1",
+                        "ISO 27001:2013 A.17.1.2",
+                        "ISO 27001:2013 A.17.2.1",
+                        "MITRE ATT&CK T1595",
+                        "MITRE ATT&CK T1590",
+                        "MITRE ATT&CK T1498"
                     ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.BE-5",
-                            "NIST CSF PR.PT-5",
-                            "NIST SP 800-53 CP-2",
-                            "NIST SP 800-53 CP-11",
-                            "NIST SP 800-53 SA-13",
-                            "NIST SP 800-53 SA14",
-                            "AICPA TSC CC3.1",
-                            "AICPA TSC A1.2",
-                            "ISO 27001:2013 A.11.1.4",
-                            "ISO 27001:2013 A.17.1.1",
-                            "ISO 27001:2013 A.17.1.2",
-                            "ISO 27001:2013 A.17.2.1",
-                            "MITRE ATT&CK T1595",
-                            "MITRE ATT&CK T1590",
-                            "MITRE ATT&CK T1498"
-                        ],
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE",
+            }
+            yield finding
 
 @registry.register_check("shield")
 def shield_advanced_elb_v2_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[ShieldAdvanced.3] ELBv2 Load Balancers should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    response = elbv2.describe_load_balancers()
-    for loadbalancer in response["LoadBalancers"]:
+    protectedArns = get_protected_resource_arns(cache)
+    for loadbalancer in describe_load_balancers(cache):
         elbv2Name = str(loadbalancer["LoadBalancerName"])
         elbv2Arn = str(loadbalancer["LoadBalancerArn"])
         elbv2DnsName = str(loadbalancer["DNSName"])
@@ -314,9 +368,8 @@ def shield_advanced_elb_v2_protection_check(cache: dict, awsAccountId: str, awsR
         elbv2Scheme = str(loadbalancer["Scheme"])
         elbv2VpcId = str(loadbalancer["VpcId"])
         elbv2IpAddressType = str(loadbalancer["IpAddressType"])
-        try:
-            # this is a passing check
-            response = shield.describe_protection(ResourceArn=elbv2Arn)
+        # this is a passing check
+        if elbv2Arn in protectedArns:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
@@ -360,7 +413,202 @@ def shield_advanced_elb_v2_protection_check(cache: dict, awsAccountId: str, awsR
                     }
                 ],
                 "Compliance": {
-                    "Status": "PASSED",
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.BE-5",
+                        "NIST CSF PR.PT-5",
+                        "NIST SP 800-53 CP-2",
+                        "NIST SP 800-53 CP-11",
+                        "NIST SP 800-53 SA-13",
+                        "NIST SP 800-53 SA14",
+                        "AICPA TSC CC3.1",
+                        "AICPA TSC A1.2",
+                        "ISO 27001:2013 A.11.1.4",
+                        "ISO 27001:2013 A.17.1.1",
+                        "ISO 27001:2013 A.17.1.2",
+                        "ISO 27001:2013 A.17.2.1",
+                        "MITRE ATT&CK T1595",
+                        "MITRE ATT&CK T1590",
+                        "MITRE ATT&CK T1498"
+                    ],
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED",
+            }
+            yield finding
+        # this is a failing check
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": elbv2Arn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "MEDIUM"},
+                "Confidence": 99,
+                "Title": "[ShieldAdvanced.3] ELBv2 Load Balancers should be protected by Shield Advanced",
+                "Description": "ELBv2 "
+                + elbv2LbType
+                + " load balancer "
+                + elbv2Name
+                + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsElbv2LoadBalancer",
+                        "Id": elbv2Arn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsElbv2LoadBalancer": {
+                                "DNSName": elbv2DnsName,
+                                "IpAddressType": elbv2IpAddressType,
+                                "Scheme": elbv2Scheme,
+                                "Type": elbv2LbType,
+                                "VpcId": elbv2VpcId,
+                            }
+                        },
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.BE-5",
+                        "NIST CSF PR.PT-5",
+                        "NIST SP 800-53 CP-2",
+                        "NIST SP 800-53 CP-11",
+                        "NIST SP 800-53 SA-13",
+                        "NIST SP 800-53 SA14",
+                        "AICPA TSC CC3.1",
+                        "AICPA TSC A1.2",
+                        "ISO 27001:2013 A.11.1.4",
+                        "ISO 27001:2013 A.17.1.1",
+                        "ISO 27001:2013 A.17.1.2",
+                        "ISO 27001:2013 A.17.2.1",
+                        "MITRE ATT&CK T1595",
+                        "MITRE ATT&CK T1590",
+                        "MITRE ATT&CK T1498"
+                    ],
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE",
+            }
+            yield finding
+
+@registry.register_check("shield")
+def shield_advanced_eip_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
+    """[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced"""
+    # ISO time
+    iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    protectedArns = get_protected_resource_arns(cache)
+    response = ec2.describe_addresses()
+    for elasticip in response["Addresses"]:
+        allocationId = str(elasticip["AllocationId"])
+        eipAllocationArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:eip-allocation/{allocationId}"
+        # this is a passing check
+        if eipAllocationArn in protectedArns:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": eipAllocationArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
+                "Description": "Elastic IP allocation "
+                + allocationId
+                + " is protected by Shield Advanced.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsEc2Eip",
+                        "Id": eipAllocationArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {"AllocationId": allocationId}},
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF ID.BE-5",
+                        "NIST CSF PR.PT-5",
+                        "NIST SP 800-53 CP-2",
+                        "NIST SP 800-53 CP-11",
+                        "NIST SP 800-53 SA-13",
+                        "NIST SP 800-53 SA14",
+                        "AICPA TSC CC3.1",
+                        "AICPA TSC A1.2",
+                        "ISO 27001:2013 A.11.1.4",
+                        "ISO 27001:2013 A.17.1.1",
+                        "ISO 27001:2013 A.17.1.2",
+                        "ISO 27001:2013 A.17.2.1",
+                        "MITRE ATT&CK T1595",
+                        "MITRE ATT&CK T1590",
+                        "MITRE ATT&CK T1498"
+                    ],
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED",
+            }
+            yield finding
+        # this is a failing check
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": eipAllocationArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "MEDIUM"},
+                "Confidence": 99,
+                "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
+                "Description": "Elastic IP allocation "
+                + allocationId
+                + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsEc2Eip",
+                        "Id": eipAllocationArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {"AllocationId": allocationId}},
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
                     "RelatedRequirements": [
                         "NIST CSF ID.BE-5",
                         "NIST CSF PR.PT-5",
@@ -379,99 +627,28 @@ def shield_advanced_elb_v2_protection_check(cache: dict, awsAccountId: str, awsR
                         "MITRE ATT&CK T1498"
                     ],
                 },
-                "Workflow": {"Status": "RESOLVED"},
-                "RecordState": "ARCHIVED",
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE",
             }
             yield finding
-        except Exception as e:
-            if (
-                str(e)
-                == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-            ):
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": elbv2Arn + "/elbv2-shield-adv-protection-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": elbv2Arn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "MEDIUM"},
-                    "Confidence": 99,
-                    "Title": "[ShieldAdvanced.3] ELBv2 Load Balancers should be protected by Shield Advanced",
-                    "Description": "ELBv2 "
-                    + elbv2LbType
-                    + " load balancer "
-                    + elbv2Name
-                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsElbv2LoadBalancer",
-                            "Id": elbv2Arn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsElbv2LoadBalancer": {
-                                    "DNSName": elbv2DnsName,
-                                    "IpAddressType": elbv2IpAddressType,
-                                    "Scheme": elbv2Scheme,
-                                    "Type": elbv2LbType,
-                                    "VpcId": elbv2VpcId,
-                                }
-                            },
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.BE-5",
-                            "NIST CSF PR.PT-5",
-                            "NIST SP 800-53 CP-2",
-                            "NIST SP 800-53 CP-11",
-                            "NIST SP 800-53 SA-13",
-                            "NIST SP 800-53 SA14",
-                            "AICPA TSC CC3.1",
-                            "AICPA TSC A1.2",
-                            "ISO 27001:2013 A.11.1.4",
-                            "ISO 27001:2013 A.17.1.1",
-                            "ISO 27001:2013 A.17.1.2",
-                            "ISO 27001:2013 A.17.2.1",
-                            "MITRE ATT&CK T1595",
-                            "MITRE ATT&CK T1590",
-                            "MITRE ATT&CK T1498"
-                        ],
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
 
 @registry.register_check("shield")
-def shield_advanced_eip_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
-    """[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced"""
+def shield_advanced_cloudfront_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
+    """[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    response = ec2.describe_addresses()
-    for elasticip in response["Addresses"]:
-        allocationId = str(elasticip["AllocationId"])
-        eipAllocationArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:eip-allocation/{allocationId}"
-        try:
-            # this is a passing check
-            response = shield.describe_protection(ResourceArn=eipAllocationArn)
+    protectedArns = get_protected_resource_arns(cache)
+    for distro in list_distributions(cache):
+        distroId = str(distro["Id"])
+        distroArn = str(distro["ARN"])
+        distroDomainName = str(distro["DomainName"])
+        # this is a passing check
+        if distroArn in protectedArns:
             finding = {
                 "SchemaVersion": "2018-10-08",
-                "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
+                "Id": distroArn + "/cloudfront-shield-adv-protection-check",
                 "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                "GeneratorId": eipAllocationArn,
+                "GeneratorId": distroArn,
                 "AwsAccountId": awsAccountId,
                 "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
                 "FirstObservedAt": iso8601Time,
@@ -479,9 +656,9 @@ def shield_advanced_eip_protection_check(cache: dict, awsAccountId: str, awsRegi
                 "UpdatedAt": iso8601Time,
                 "Severity": {"Label": "INFORMATIONAL"},
                 "Confidence": 99,
-                "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
-                "Description": "Elastic IP allocation "
-                + allocationId
+                "Title": "[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced",
+                "Description": "CloudFront distribution "
+                + distroId
                 + " is protected by Shield Advanced.",
                 "Remediation": {
                     "Recommendation": {
@@ -492,11 +669,13 @@ def shield_advanced_eip_protection_check(cache: dict, awsAccountId: str, awsRegi
                 "ProductFields": {"Product Name": "ElectricEye"},
                 "Resources": [
                     {
-                        "Type": "AwsEc2Eip",
-                        "Id": eipAllocationArn,
+                        "Type": "AwsCloudFrontDistribution",
+                        "Id": distroArn,
                         "Partition": awsPartition,
                         "Region": awsRegion,
-                        "Details": {"Other": {"AllocationId": allocationId}},
+                        "Details": {
+                            "AwsCloudFrontDistribution": {"DomainName": distroDomainName}
+                        },
                     }
                 ],
                 "Compliance": {
@@ -523,83 +702,8 @@ def shield_advanced_eip_protection_check(cache: dict, awsAccountId: str, awsRegi
                 "RecordState": "ARCHIVED",
             }
             yield finding
-        except Exception as e:
-            if (
-                str(e)
-                == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-            ):
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": eipAllocationArn + "/elasticip-shield-adv-protection-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": eipAllocationArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "MEDIUM"},
-                    "Confidence": 99,
-                    "Title": "[ShieldAdvanced.4] Elastic IPs should be protected by Shield Advanced",
-                    "Description": "Elastic IP allocation "
-                    + allocationId
-                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsEc2Eip",
-                            "Id": eipAllocationArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {"Other": {"AllocationId": allocationId}},
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.BE-5",
-                            "NIST CSF PR.PT-5",
-                            "NIST SP 800-53 CP-2",
-                            "NIST SP 800-53 CP-11",
-                            "NIST SP 800-53 SA-13",
-                            "NIST SP 800-53 SA14",
-                            "AICPA TSC CC3.1",
-                            "AICPA TSC A1.2",
-                            "ISO 27001:2013 A.11.1.4",
-                            "ISO 27001:2013 A.17.1.1",
-                            "ISO 27001:2013 A.17.1.2",
-                            "ISO 27001:2013 A.17.2.1",
-                            "MITRE ATT&CK T1595",
-                            "MITRE ATT&CK T1590",
-                            "MITRE ATT&CK T1498"
-                        ],
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
-
-@registry.register_check("shield")
-def shield_advanced_cloudfront_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
-    """[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced"""
-    # ISO time
-    iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    response = cloudfront.list_distributions()
-    # TODO: Should handle case no results returned
-    cfDistros = response["DistributionList"].get("Items", [])
-    for distro in cfDistros:
-        distroId = str(distro["Id"])
-        distroArn = str(distro["ARN"])
-        distroDomainName = str(distro["DomainName"])
-        try:
-            # this is a passing check
-            response = shield.describe_protection(ResourceArn=distroArn)
+        # this is a failing check
+        else:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": distroArn + "/cloudfront-shield-adv-protection-check",
@@ -610,12 +714,12 @@ def shield_advanced_cloudfront_protection_check(cache: dict, awsAccountId: str,
                 "FirstObservedAt": iso8601Time,
                 "CreatedAt": iso8601Time,
                 "UpdatedAt": iso8601Time,
-                "Severity": {"Label": "INFORMATIONAL"},
+                "Severity": {"Label": "MEDIUM"},
                 "Confidence": 99,
                 "Title": "[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced",
                 "Description": "CloudFront distribution "
                 + distroId
-                + " is protected by Shield Advanced.",
+                + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
                 "Remediation": {
                     "Recommendation": {
                         "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
@@ -635,7 +739,7 @@ def shield_advanced_cloudfront_protection_check(cache: dict, awsAccountId: str,
                     }
                 ],
                 "Compliance": {
-                    "Status": "PASSED",
+                    "Status": "FAILED",
                     "RelatedRequirements": [
                         "NIST CSF ID.BE-5",
                         "NIST CSF PR.PT-5",
@@ -654,73 +758,10 @@ def shield_advanced_cloudfront_protection_check(cache: dict, awsAccountId: str,
                         "MITRE ATT&CK T1498"
                     ],
                 },
-                "Workflow": {"Status": "RESOLVED"},
-                "RecordState": "ARCHIVED",
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE",
             }
             yield finding
-        except Exception as e:
-            if (
-                str(e)
-                == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist."
-            ):
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": distroArn + "/cloudfront-shield-adv-protection-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": distroArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "MEDIUM"},
-                    "Confidence": 99,
-                    "Title": "[ShieldAdvanced.5] CloudFront distributions should be protected by Shield Advanced",
-                    "Description": "CloudFront distribution "
-                    + distroId
-                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
-                    "Resources": [
-                        {
-                            "Type": "AwsCloudFrontDistribution",
-                            "Id": distroArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsCloudFrontDistribution": {"DomainName": distroDomainName}
-                            },
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF ID.BE-5",
-                            "NIST CSF PR.PT-5",
-                            "NIST SP 800-53 CP-2",
-                            "NIST SP 800-53 CP-11",
-                            "NIST SP 800-53 SA-13",
-                            "NIST SP 800-53 SA14",
-                            "AICPA TSC CC3.1",
-                            "AICPA TSC A1.2",
-                            "ISO 27001:2013 A.11.1.4",
-                            "ISO 27001:2013 A.17.1.1",
-                            "ISO 27001:2013 A.17.1.2",
-                            "ISO 27001:2013 A.17.2.1",
-                            "MITRE ATT&CK T1595",
-                            "MITRE ATT&CK T1590",
-                            "MITRE ATT&CK T1498"
-                        ],
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
 
 @registry.register_check("shield")
 def shield_advanced_drt_access_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -1084,10 +1125,8 @@ def shield_advanced_global_accelerator_protection_check(cache: dict, awsAccountI
     """[ShieldAdvanced.9] Global Accelerator Accelerators should be protected by Shield Advanced"""
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # Create a Session is us-west-2 - which is where the Global Accelerator API is in
-    session = boto3.Session(region_name="us-west-2")
-    gax = session.client("globalaccelerator")
-    paginator = gax.get_paginator("list_accelerators")
+    protectedArns = get_protected_resource_arns(cache)
+    paginator = globalaccelerator.get_paginator("list_accelerators")
     iterator = paginator.paginate()
     for page in iterator:
         for ga in page["Accelerators"]:
@@ -1095,9 +1134,8 @@ def shield_advanced_global_accelerator_protection_check(cache: dict, awsAccountI
             gaxName = str(ga["Name"])
             gaxDns = str(ga["DnsName"])
             iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
-            try:
-                # this is a passing check
-                shield.describe_protection(ResourceArn=gaxArn)
+            # this is a passing check
+            if gaxArn in protectedArns:
                 finding = {
                     "SchemaVersion": "2018-10-08",
                     "Id": gaxArn + "/global-accelerator-shield-adv-protection-check",
@@ -1159,69 +1197,69 @@ def shield_advanced_global_accelerator_protection_check(cache: dict, awsAccountI
                     "RecordState": "ARCHIVED"
                 }
                 yield finding
-            except Exception as e:
-                if str(e) == "An error occurred (ResourceNotFoundException) when calling the DescribeProtection operation: The referenced protection does not exist.":
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": gaxArn + "/global-accelerator-shield-adv-protection-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": gaxArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "MEDIUM"},
-                        "Confidence": 99,
-                        "Title": "[ShieldAdvanced.9] Global Accelerator Accelerators should be protected by Shield Advanced",
-                        "Description": "Global Accelerator "
-                        + gaxName
-                        + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended.",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
-                                "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsGlobalAcceleratorAccelerator",
-                                "Id": gaxArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {
-                                    "Other": {
-                                        "Name": gaxName,
-                                        "DnsName": gaxDns
-                                    }
+            # this is a failing check
+            else:
+                finding = {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": gaxArn + "/global-accelerator-shield-adv-protection-check",
+                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                    "GeneratorId": gaxArn,
+                    "AwsAccountId": awsAccountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "MEDIUM"},
+                    "Confidence": 99,
+                    "Title": "[ShieldAdvanced.9] Global Accelerator Accelerators should be protected by Shield Advanced",
+                    "Description": "Global Accelerator "
+                    + gaxName
+                    + " is not protected by Shield Advanced. Refer to the remediation instructions if this configuration is not intended.",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "For information on adding Shield Advanced protection to resources refer to the Adding AWS Shield Advanced Protection to AWS Resources section of the AWS WAF, AWS Firewall Manager, and AWS Shield Advanced Developer Guide",
+                            "Url": "https://docs.aws.amazon.com/waf/latest/developerguide/configure-new-protection.html",
+                        }
+                    },
+                    "ProductFields": {"Product Name": "ElectricEye"},
+                    "Resources": [
+                        {
+                            "Type": "AwsGlobalAcceleratorAccelerator",
+                            "Id": gaxArn,
+                            "Partition": awsPartition,
+                            "Region": awsRegion,
+                            "Details": {
+                                "Other": {
+                                    "Name": gaxName,
+                                    "DnsName": gaxDns
                                 }
                             }
-                        ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF ID.BE-5",
-                                "NIST CSF PR.PT-5",
-                                "NIST SP 800-53 CP-2",
-                                "NIST SP 800-53 CP-11",
-                                "NIST SP 800-53 SA-13",
-                                "NIST SP 800-53 SA14",
-                                "AICPA TSC CC3.1",
-                                "AICPA TSC A1.2",
-                                "ISO 27001:2013 A.11.1.4",
-                                "ISO 27001:2013 A.17.1.1",
-                                "ISO 27001:2013 A.17.1.2",
-                                "ISO 27001:2013 A.17.2.1",
-                                "MITRE ATT&CK T1595",
-                                "MITRE ATT&CK T1590",
-                                "MITRE ATT&CK T1498"
-                            ]
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE"
-                    }
-                    yield finding
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "FAILED",
+                        "RelatedRequirements": [
+                            "NIST CSF ID.BE-5",
+                            "NIST CSF PR.PT-5",
+                            "NIST SP 800-53 CP-2",
+                            "NIST SP 800-53 CP-11",
+                            "NIST SP 800-53 SA-13",
+                            "NIST SP 800-53 SA14",
+                            "AICPA TSC CC3.1",
+                            "AICPA TSC A1.2",
+                            "ISO 27001:2013 A.11.1.4",
+                            "ISO 27001:2013 A.17.1.1",
+                            "ISO 27001:2013 A.17.1.2",
+                            "ISO 27001:2013 A.17.2.1",
+                            "MITRE ATT&CK T1595",
+                            "MITRE ATT&CK T1590",
+                            "MITRE ATT&CK T1498"
+                        ]
+                    },
+                    "Workflow": {"Status": "NEW"},
+                    "RecordState": "ACTIVE"
+                }
+                yield finding
 
 @registry.register_check("shield")
 def shield_advanced_subscription_latest_attacks(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # create boto3 clients
-ec2 = boto3.client("ec2")
+ec2 = get_client("ec2")
 # loop through vpcs
 def describe_vpcs(cache):
     response = cache.get("describe_vpcs")
@@ -18,13 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
 from check_register import CheckRegister
 
 registry = CheckRegister()
 # import boto3 clients
-workspaces = boto3.client("workspaces")
+workspaces = get_client("workspaces")
 # loop through workspaces
 def describe_workspaces(cache):
     response = cache.get("describe_workspaces", [])
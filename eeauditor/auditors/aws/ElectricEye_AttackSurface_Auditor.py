@@ -18,22 +18,33 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
-import nmap3
+from aws_clients import get_client
 import datetime
+import threading
 from check_register import CheckRegister
+from auditor_cache import get_account_cache
 from dateutil.parser import parse
+from reachability import get_reachability_graph
+from port_scanner import ScanResults, get_port_scanner, port_result
 
 registry = CheckRegister()
 # Boto3 clients
-ec2 = boto3.client("ec2")
-elbv2 = boto3.client("elbv2")
-elb = boto3.client("elb")
-cloudfront = boto3.client("cloudfront")
-route53 = boto3.client("route53")
+ec2 = get_client("ec2")
+elbv2 = get_client("elbv2")
+elb = get_client("elb")
+cloudfront = get_client("cloudfront")
+route53 = get_client("route53")
 
-# Instantiate a NMAP scanner for TCP scans to define ports
-nmap = nmap3.NmapScanTechniques()
+# FTP, SSH, TelNet, SMTP, HTTP, POP3, NetBIOS, SMB, RDP, MSSQL, MySQL/MariaDB, NFS, Docker, Oracle, PostgreSQL,
+# Kibana, VMWare, Proxy, Splunk, K8s, Redis, Kafka, Mongo, Rabbit/AmazonMQ, SparkUI
+SCANNED_PORTS = [21,22,23,25,80,110,139,445,3389,1433,3306,2049,2375,1521,5432,5601,8182,8080,8089,10250,6379,9092,27017,5672,4040]
+# key of the scan results of every check's targets in the cache of each Account and Region, or of
+# the Account for global targets
+SCAN_CACHE_KEY = "attack_surface_scan"
+SCAN_LOCK_KEY = "attack_surface_scan_lock"
+# state reason of the ports of instances no internet traffic can reach, which are not scanned
+UNREACHABLE_REASON = "no-internet-path"
+_scanLocksLock = threading.Lock()
 
 def ec2_paginate(cache):
     instanceList = []
@@ -59,11 +70,11 @@ def describe_load_balancers(cache):
 
 def describe_clbs(cache):
     # loop through ELB load balancers
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_clb_load_balancers")
     if response:
         return response
-    cache["describe_load_balancers"] = elb.describe_load_balancers()
-    return cache["describe_load_balancers"]
+    cache["describe_clb_load_balancers"] = elb.describe_load_balancers()
+    return cache["describe_clb_load_balancers"]
 
 def cloudfront_paginate(cache):
     itemList = []
@@ -97,26 +108,116 @@ def get_public_hosted_zones(cache):
         cache["get_hosted_zones"] = zones
         return cache["get_hosted_zones"]
 
-# This function performs the actual NMAP Scan
-def scan_host(host_ip, host_name, asset_type):
+def describe_addresses(cache):
+    response = cache.get("describe_addresses")
+    if response:
+        return response
+    cache["describe_addresses"] = ec2.describe_addresses()
+    return cache["describe_addresses"]
+
+def list_a_records(cache, hosted_zone_id):
+    # "A" will also pick up on Alias records to LBs, etc.
+    response = cache.get(f"a_records:{hosted_zone_id}")
+    if response:
+        return response
+    records = [
+        record for record in route53.list_resource_record_sets(HostedZoneId=hosted_zone_id)["ResourceRecordSets"]
+        if str(record["Type"]) == "A"
+    ]
+    cache[f"a_records:{hosted_zone_id}"] = records
+    return records
+
+def get_reachability(cache):
+    # Network path of every ENI resolved offline from SGs, NACLs, route tables & IGWs
     try:
-        results = nmap.nmap_tcp_scan(
-            host_ip,
-            # FTP, SSH, TelNet, SMTP, HTTP, POP3, NetBIOS, SMB, RDP, MSSQL, MySQL/MariaDB, NFS, Docker, Oracle, PostgreSQL, 
-            # Kibana, VMWare, Proxy, Splunk, K8s, Redis, Kafka, Mongo, Rabbit/AmazonMQ, SparkUI
-            args="-Pn -p 21,22,23,25,80,110,139,445,3389,1433,3306,2049,2375,1521,5432,5601,8182,8080,8089,10250,6379,9092,27017,5672,4040"
-        )
+        return get_reachability_graph(cache, ec2)
+    except Exception as e:
+        print(f"Failed to build the network reachability graph, every public instance will be scanned: {e}")
+        return None
+
+def ec2_scan_targets(cache):
+    reachability = get_reachability(cache)
+    for i in ec2_paginate(cache=cache):
+        hostIp = i.get("PublicIpAddress")
+        if not hostIp:
+            continue
+        # no need to scan instances no internet traffic can reach on any of the scanned ports
+        if reachability and reachability.is_instance_unreachable(str(i["InstanceId"]), SCANNED_PORTS):
+            continue
+        yield hostIp
+
+def elbv2_scan_targets(cache):
+    for lb in describe_load_balancers(cache)["LoadBalancers"]:
+        if lb["Scheme"] == "internet-facing" and lb["Type"] == "application":
+            yield str(lb["DNSName"])
 
-        print(f"Scanning {asset_type} {host_name} on {host_ip}")
+def elb_scan_targets(cache):
+    for lb in describe_clbs(cache)["LoadBalancerDescriptions"]:
+        if lb["Scheme"] == "internet-facing":
+            yield str(lb["DNSName"])
+
+def eip_scan_targets(cache):
+    for x in describe_addresses(cache)["Addresses"]:
+        yield x["PublicIp"]
+
+def cloudfront_scan_targets(cache):
+    for dist in cloudfront_paginate(cache):
+        yield dist["DomainName"]
+
+def route53_scan_targets(cache):
+    for zone in get_public_hosted_zones(cache=cache):
+        for record in list_a_records(cache, zone["Id"]):
+            yield str(record["Name"])
+
+# targets of global resources, scanned once per Account
+GLOBAL_SCAN_TARGETS = (cloudfront_scan_targets, route53_scan_targets)
+
+def get_scan_results(cache, collect):
+    """Returns the ScanResults holding the targets collect() yields for a check, scanned once
+
+        Each check only has its own targets scanned, the first time it asks for them, and targets
+        resolving to an IP another check already had scanned are not scanned again. Results of
+        regional targets are kept per Account and Region, those of global targets (CloudFront,
+        Route53) once per Account so they are not scanned again in every Region
+    """
+    scanCache = get_account_cache(cache) if collect in GLOBAL_SCAN_TARGETS else cache
+    with _scanLocksLock:
+        scanLock = scanCache.get(SCAN_LOCK_KEY)
+        if scanLock is None:
+            scanLock = threading.Lock()
+            scanCache[SCAN_LOCK_KEY] = scanLock
+    with scanLock:
+        results = scanCache.get(SCAN_CACHE_KEY)
+        if results is None:
+            results = ScanResults()
+            scanCache[SCAN_CACHE_KEY] = results
+        collectedKey = f"{SCAN_CACHE_KEY}:{collect.__name__}"
+        if scanCache.get(collectedKey) is None:
+            try:
+                targets = [target for target in collect(cache) if target not in results]
+            except Exception as e:
+                # the check scans its hosts one by one if it can list them
+                print(f"Failed to collect Attack Surface targets with {collect.__name__}: {e}")
+                targets = []
+            results.update(get_port_scanner(SCANNED_PORTS).scan(targets, scanned=results.scanned))
+            scanCache[collectedKey] = True
         return results
-    except KeyError:
-        results = None
+
+# Returns the scan results of a host from the shared scan as {ip: results}, in the shape of NMAP's
+def scan_host(cache, host, host_name, asset_type, collect):
+    results = get_scan_results(cache, collect)
+    if host not in results:
+        results.update(get_port_scanner(SCANNED_PORTS).scan([host], scanned=results.scanned))
+    print(f"Reading scan results of {asset_type} {host_name} on {host}")
+    # NoneType returned when the host did not resolve or failed to be scanned
+    return results.lookup(host)
 
 @registry.register_check("ec2")
 def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[AttackSurface.EC2.{checkIdNumber}] EC2 Instances should not be publicly reachable on {serviceName}"""
     # ISO Time
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
+    reachability = get_reachability(cache)
     # Paginate the iterator object from Cache
     for i in ec2_paginate(cache=cache):
         instanceId = str(i["InstanceId"])
@@ -137,7 +238,12 @@ def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
         except KeyError:
             continue
         else:
-            scanner = scan_host(hostIp, instanceId, "EC2 Instance")
+            # no need to scan instances no internet traffic can reach on any of the scanned ports, their ports
+            # are still reported so findings of open ports from earlier scans are resolved
+            if reachability and reachability.is_instance_unreachable(instanceId, SCANNED_PORTS):
+                scanner = {hostIp: {"ports": [port_result(port, "filtered", UNREACHABLE_REASON) for port in sorted(SCANNED_PORTS)]}}
+            else:
+                scanner = scan_host(cache, hostIp, instanceId, "EC2 Instance", ec2_scan_targets)
             # NoneType returned on KeyError due to Nmap errors
             if scanner == None:
                 continue
@@ -161,6 +267,10 @@ def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
                         serviceName = str(p["service"]["name"]).upper()
                     serviceStateReason = str(p["reason"])
                     serviceState = str(p["state"])
+                    if serviceStateReason == UNREACHABLE_REASON:
+                        passedDescription = f"EC2 instance {instanceId} is not reachable from the internet on port {portNumber} which corresponds to the {serviceName} service, as its Security Groups, Network ACLs and route tables allow no internet traffic to it on any of the scanned ports it was not scanned. Instances and their respective Security Groups should still be reviewed for minimum necessary access."
+                    else:
+                        passedDescription = f"EC2 instance {instanceId} is not publicly reachable on port {portNumber} which corresponds to the {serviceName} service due to {serviceStateReason}. Instances and their respective Security Groups should still be reviewed for minimum necessary access."
                     # This is a failing check
                     if serviceState == "open":
                         finding = {
@@ -248,7 +358,7 @@ def ec2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
                             "Severity": {"Label": "INFORMATIONAL"},
                             "Confidence": 99,
                             "Title": f"[AttackSurface.EC2.{checkIdNumber}] EC2 Instances should not be publicly reachable on {serviceName}",
-                            "Description": f"EC2 instance {instanceId} is not publicly reachable on port {portNumber} which corresponds to the {serviceName} service due to {serviceStateReason}. Instances and their respective Security Groups should still be reviewed for minimum necessary access.",
+                            "Description": passedDescription,
                             "Remediation": {
                                 "Recommendation": {
                                     "Text": "EC2 Instances should only have the minimum necessary ports open to achieve their purposes, allow traffic from authorized sources, and use other defense-in-depth and hardening strategies. For a basic view on traffic authorization into your instances refer to the Authorize inbound traffic for your Linux instances section of the Amazon Elastic Compute Cloud User Guide",
@@ -316,7 +426,7 @@ def elbv2_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, aws
         elbv2VpcId = str(lb["VpcId"])
         elbv2IpAddressType = str(lb["IpAddressType"])
         if (elbv2Scheme == 'internet-facing' and elbv2LbType == 'application'):
-            scanner = scan_host(elbv2DnsName, elbv2Name, "Application load balancer")
+            scanner = scan_host(cache, elbv2DnsName, elbv2Name, "Application load balancer", elbv2_scan_targets)
             # NoneType returned on KeyError due to Nmap errors
             if scanner == None:
                 continue
@@ -500,7 +610,7 @@ def elb_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
         lbVpc = lb["VPCId"]
         clbScheme = str(lb["Scheme"])
         if clbScheme == 'internet-facing':
-            scanner = scan_host(dnsName, clbName)
+            scanner = scan_host(cache, dnsName, clbName, "Classic load balancer", elb_scan_targets)
             # NoneType returned on KeyError due to Nmap errors
             if scanner == None:
                 continue
@@ -679,13 +789,13 @@ def eip_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str, awsRe
     # ISO Time
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     # Gather all EIPs
-    for x in ec2.describe_addresses()["Addresses"]:
+    for x in describe_addresses(cache)["Addresses"]:
         publicIp = x["PublicIp"]
         allocationId = x["AllocationId"]
         eipArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:eip-allocation/{allocationId}"
         privateIpAddress = x["PrivateIpAddress"]
         # Logic time
-        scanner = scan_host(publicIp, allocationId, "Elastic IP")
+        scanner = scan_host(cache, publicIp, allocationId, "Elastic IP", eip_scan_targets)
         # NoneType returned on KeyError due to Nmap errors
         if scanner == None:
             continue
@@ -856,7 +966,7 @@ def cloudfront_attack_surface_open_tcp_port_check(cache: dict, awsAccountId: str
         domainName = dist["DomainName"]
         distStatus = dist["Status"]
         # Logic time
-        scanner = scan_host(domainName, distributionId, "CloudFront Distribution")
+        scanner = scan_host(cache, domainName, distributionId, "CloudFront Distribution", cloudfront_scan_targets)
         # NoneType returned on KeyError due to Nmap errors
         if scanner == None:
             continue
@@ -1028,14 +1138,14 @@ def route53_public_hz_attack_surface_open_tcp_port_check(cache: dict, awsAccount
         hzName = zone["Name"]
         hzArn = f"arn:aws:route53:::hostedzone/{hzName}"
         # Get the A Records
-        for record in route53.list_resource_record_sets(HostedZoneId=hzId)["ResourceRecordSets"]:
+        for record in list_a_records(cache, hzId):
             # skip non "A" Records - "A" will also pick up on Alias records to LBs, etc.
             if str(record["Type"]) != "A":
                 continue
             else:
                 resourceRecord = str(record["Name"])
                 # Logic time
-                scanner = scan_host(resourceRecord, hzName, "Route53 Public Hosted Zone A Record")
+                scanner = scan_host(cache, resourceRecord, hzName, "Route53 Public Hosted Zone A Record", route53_scan_targets)
                 # NoneType returned on KeyError due to Nmap errors
                 if scanner == None:
                     continue
@@ -18,40 +18,33 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import datetime
-import time
-import os
-import json
 import botocore
 import base64
 from dateutil.parser import parse
 from check_register import CheckRegister
+from secret_scanner import scan_payloads
 
 registry = CheckRegister()
 # import boto3 clients
 
-dirPath = os.path.dirname(os.path.realpath(__file__))
-
-codebuild = boto3.client("codebuild")
-lambdas = boto3.client("lambda")
-ec2 = boto3.client("ec2")
-cloudformation = boto3.client("cloudformation")
-ecs = boto3.client("ecs")
+codebuild = get_client("codebuild")
+lambdas = get_client("lambda")
+ec2 = get_client("ec2")
+cloudformation = get_client("cloudformation")
+ecs = get_client("ecs")
 
 @registry.register_check("codebuild")
 def secret_scan_codebuild_envvar_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Secrets.CodeBuild.1] CodeBuild Project environment variables should not have secrets stored in Plaintext"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # setup some reusable variables
-    scanFile = f"{dirPath}/codebuild-data-sample.json"
-    resultsFile = f"{dirPath}/codebuild-scan-result.json"
-    scanCommand = f"detect-secrets scan {scanFile} > {resultsFile}"
     # Collect all CodeBuild Projects and send to the Batch API
     cbList = []
     for p in codebuild.list_projects()["projects"]:
         cbList.append(str(p))
     # Submit batch request
+    projects = []
     for proj in codebuild.batch_get_projects(names=cbList)["projects"]:
         # Create an empty list per loop to put "Plaintext" env vars as the SSM and Secrets Manager types will just be a name
         envvarList = []
@@ -64,17 +57,12 @@ def secret_scan_codebuild_envvar_check(cache: dict, awsAccountId: str, awsRegion
                 envvarList.append({"name": str(e["name"]),"value": str(e["value"])})
             else:
                 continue
-        # Write the results out to a file
-        with open(scanFile, 'w') as writejson:
-            json.dump(envvarList, writejson, indent=2, default=str)
-        # execute command
-        os.system(scanCommand)
-        time.sleep(1)
-        # read the results file
-        with open(resultsFile, 'r') as readjson:
-            data = json.load(readjson)
-        # if results is an empty dict then there are no secrets found!
-        if str(data["results"]) == "{}":
+        projects.append((cbName, cbArn, sourceType, envvarList))
+    # scan the env vars of every project in one batch
+    scanResults = scan_payloads((cbArn, envvarList) for cbName, cbArn, sourceType, envvarList in projects)
+    for cbName, cbArn, sourceType, envvarList in projects:
+        # if there are no results then there are no secrets found!
+        if not scanResults[cbArn]:
             # this is a passing check
             finding = {
                 "SchemaVersion": "2018-10-08",
@@ -144,7 +132,7 @@ def secret_scan_codebuild_envvar_check(cache: dict, awsAccountId: str, awsRegion
             # this is a failing check - we won't actually parse the full payload of potential secrets
             # otherwise we would break the mutability of a finding...so we will sample the first one
             # and note that in the finding itself
-            secretType = str(data["results"]["codebuild-data-sample.json"][0]["type"])
+            secretType = scanResults[cbArn][0]
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": cbArn + "/codebuild-env-var-secrets-check",
@@ -211,22 +199,11 @@ def secret_scan_codebuild_envvar_check(cache: dict, awsAccountId: str, awsRegion
                 "RecordState": "ACTIVE"
             }
             yield finding
-        # clear out memory and prevent duplicates from being cached
-        os.system("rm " + scanFile)
-        os.system("rm " + resultsFile)
-        del envvarList
-        del writejson
-        del readjson
-        del data
 
 @registry.register_check("cloudformation")
 def secret_scan_cloudformation_parameters_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Secrets.CloudFormation.1] CloudFormation Stack parameters should not have secrets stored in Plaintext"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # setup some reusable variables
-    scanFile = f"{dirPath}/cloudformation-data-sample.json"
-    resultsFile = f"{dirPath}/cloudformation-scan-result.json"
-    scanCommand = f"detect-secrets scan {scanFile} > {resultsFile}"
     # Paginate through all CFN Stacks
     stackList = []
     paginator = cloudformation.get_paginator("list_stacks")
@@ -234,6 +211,7 @@ def secret_scan_cloudformation_parameters_check(cache: dict, awsAccountId: str,
         for s in page["StackSummaries"]:
             stackList.append(str(s["StackName"]))
 
+    stacks = []
     for sn in stackList:
         try:
             for stack in cloudformation.describe_stacks(StackName=sn)["Stacks"]:
@@ -252,167 +230,151 @@ def secret_scan_cloudformation_parameters_check(cache: dict, awsAccountId: str,
                         pass
                     else:
                         print(e)
-                # Write the results out to a file
-                with open(scanFile, 'w') as writejson:
-                    json.dump(paramList, writejson, indent=2, default=str)
-                # execute command
-                os.system(scanCommand)
-                time.sleep(1)
-                # read the results file
-                with open(resultsFile, 'r') as readjson:
-                    data = json.load(readjson)
-                # if results is an empty dict then there are no secrets found!
-                if str(data["results"]) == "{}":
-                    # this is a passing check
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": stackArn + "/cloudformation-params-secrets-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": stackArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": [
-                            "Software and Configuration Checks/AWS Security Best Practices",
-                            "Effects/Data Exposure"
-                        ],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "INFORMATIONAL"},
-                        "Confidence": 99,
-                        "Title": "[Secrets.CloudFormation.1] CloudFormation Stack parameters should not have secrets stored in Plaintext",
-                        "Description": "CloudFormation Stack "
-                        + sn
-                        + " does not have any secrets in Parameters.",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "To learn more about parameters refer to the Parameters section of the AWS CloudFormation User Guide.",
-                                "Url": "https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/parameters-section-structure.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        
-                        "Resources": [
-                            {
-                                "Type": "AwsCloudFormationStack",
-                                "Id": stackArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {"Other": {
-                                    "StackName": sn
-                                    }
-                                }
-                            }
-                        ],
-                        "Compliance": {
-                            "Status": "PASSED",
-                            "RelatedRequirements": [
-                                "NIST CSF PR.AC-3",
-                                "NIST SP 800-53 AC-1",
-                                "NIST SP 800-53 AC-17",
-                                "NIST SP 800-53 AC-19",
-                                "NIST SP 800-53 AC-20",
-                                "NIST SP 800-53 SC-15",
-                                "AICPA TSC CC6.6",
-                                "ISO 27001:2013 A.6.2.1",
-                                "ISO 27001:2013 A.6.2.2",
-                                "ISO 27001:2013 A.11.2.6",
-                                "ISO 27001:2013 A.13.1.1",
-                                "ISO 27001:2013 A.13.2.1"
-                            ]
-                        },
-                        "Workflow": {"Status": "RESOLVED"},
-                        "RecordState": "ARCHIVED"
-                    }
-                    yield finding
-                else:
-                    # this is a failing check - we won't actually parse the full payload of potential secrets
-                    # otherwise we would break the mutability of a finding...so we will sample the first one
-                    # and note that in the finding itself
-                    secretType = str(data["results"]["cloudformation-data-sample.json"][0]["type"])
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": stackArn + "/cloudformation-params-secrets-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": stackArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": [
-                            "Software and Configuration Checks/AWS Security Best Practices",
-                            "Effects/Data Exposure"
-                        ],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "CRITICAL"},
-                        "Confidence": 99,
-                        "Title": "[Secrets.CloudFormation.1] CloudFormation Stack parameters should not have secrets stored in Plaintext",
-                        "Description": "CloudFormation Stack "
-                        + sn
-                        + " has at least one secret in Plaintext parameters. Detect-secrets is reporting it as "
-                        + secretType
-                        + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "To learn more about parameters refer to the Parameters section of the AWS CloudFormation User Guide.",
-                                "Url": "https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/parameters-section-structure.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        
-                        "Resources": [
-                            {
-                                "Type": "AwsCloudFormationStack",
-                                "Id": stackArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {"Other": {
-                                    "StackName": sn
-                                    }
-                                }
-                            }
-                        ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF PR.AC-3",
-                                "NIST SP 800-53 AC-1",
-                                "NIST SP 800-53 AC-17",
-                                "NIST SP 800-53 AC-19",
-                                "NIST SP 800-53 AC-20",
-                                "NIST SP 800-53 SC-15",
-                                "AICPA TSC CC6.6",
-                                "ISO 27001:2013 A.6.2.1",
-                                "ISO 27001:2013 A.6.2.2",
-                                "ISO 27001:2013 A.11.2.6",
-                                "ISO 27001:2013 A.13.1.1",
-                                "ISO 27001:2013 A.13.2.1"
-                            ]
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE"
-                    }
-                    yield finding
-                # clear out memory and prevent duplicates from being cached
-                os.system("rm " + scanFile)
-                os.system("rm " + resultsFile)
-                del paramList
-                del writejson
-                del readjson
-                del data
+                stacks.append((sn, stackArn, paramList))
         except botocore.exceptions.ClientError as error:
             if error.response['Error']['Code'] == 'ValidationError':
                 continue
             else:
                 print(error)
                 continue
+    # scan the parameters of every stack in one batch
+    scanResults = scan_payloads((stackArn, paramList) for sn, stackArn, paramList in stacks)
+    for sn, stackArn, paramList in stacks:
+        # if there are no results then there are no secrets found!
+        if not scanResults[stackArn]:
+            # this is a passing check
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": stackArn + "/cloudformation-params-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": stackArn,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.CloudFormation.1] CloudFormation Stack parameters should not have secrets stored in Plaintext",
+                "Description": "CloudFormation Stack "
+                + sn
+                + " does not have any secrets in Parameters.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about parameters refer to the Parameters section of the AWS CloudFormation User Guide.",
+                        "Url": "https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/parameters-section-structure.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                        
+                "Resources": [
+                    {
+                        "Type": "AwsCloudFormationStack",
+                        "Id": stackArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {
+                            "StackName": sn
+                            }
+                        }
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED"
+            }
+            yield finding
+        else:
+            # this is a failing check - we won't actually parse the full payload of potential secrets
+            # otherwise we would break the mutability of a finding...so we will sample the first one
+            # and note that in the finding itself
+            secretType = scanResults[stackArn][0]
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": stackArn + "/cloudformation-params-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": stackArn,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "CRITICAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.CloudFormation.1] CloudFormation Stack parameters should not have secrets stored in Plaintext",
+                "Description": "CloudFormation Stack "
+                + sn
+                + " has at least one secret in Plaintext parameters. Detect-secrets is reporting it as "
+                + secretType
+                + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about parameters refer to the Parameters section of the AWS CloudFormation User Guide.",
+                        "Url": "https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/parameters-section-structure.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                        
+                "Resources": [
+                    {
+                        "Type": "AwsCloudFormationStack",
+                        "Id": stackArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {"Other": {
+                            "StackName": sn
+                            }
+                        }
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE"
+            }
+            yield finding
 
 @registry.register_check("ecs")
 def secret_scan_ecs_task_def_envvar_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Secrets.ECS.1] ECS Task Definition environment variables should not have secrets stored in Plaintext"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # setup some reusable variables
-    scanFile = f"{dirPath}/ecs-data-sample.json"
-    resultsFile = f"{dirPath}/ecs-scan-result.json"
-    scanCommand = f"detect-secrets scan {scanFile} > {resultsFile}"
     # Paginate through all Active ECS Task Defs
     taskList = []
     paginator = ecs.get_paginator("list_task_definitions")
@@ -420,6 +382,7 @@ def secret_scan_ecs_task_def_envvar_check(cache: dict, awsAccountId: str, awsReg
         for tdarn in page["taskDefinitionArns"]:
             taskList.append(str(tdarn))
 
+    containers = []
     for t in taskList:
         task = ecs.describe_task_definition(taskDefinition=t)["taskDefinition"]
         tdefFamily = str(task["family"])
@@ -429,178 +392,165 @@ def secret_scan_ecs_task_def_envvar_check(cache: dict, awsAccountId: str, awsReg
             cdefEnvList = []
             for e in c["environment"]:
                 cdefEnvList.append({"name": str(e["name"]),"value": str(e["value"])})
-            # Write the results out to a file
-            with open(scanFile, 'w') as writejson:
-                json.dump(cdefEnvList, writejson, indent=2, default=str)
-            # execute command
-            os.system(scanCommand)
-            time.sleep(1)
-            # read the results file
-            with open(resultsFile, 'r') as readjson:
-                data = json.load(readjson)
-            # if results is an empty dict then there are no secrets found!
-            if str(data["results"]) == "{}":
-                # this is a passing check
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": t + cdefName + "/ecs-envvar-secrets-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": t + cdefName,
-                    "AwsAccountId": awsAccountId,
-                    "Types": [
-                        "Software and Configuration Checks/AWS Security Best Practices",
-                        "Effects/Data Exposure"
-                    ],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "INFORMATIONAL"},
-                    "Confidence": 99,
-                    "Title": "[Secrets.ECS.1] ECS Task Definition environment variables should not have secrets stored in Plaintext",
-                    "Description": "ECS Task Definition family "
-                    + tdefFamily
-                    + " Container Definition "
-                    + cdefName
-                    + " does not have any secrets in Environment Variables.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
-                            "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
+            containers.append((t, tdefFamily, cdefName, cdefEnvList))
+    # scan the env vars of every container definition in one batch
+    scanResults = scan_payloads(
+        ((t, cdefName), cdefEnvList) for t, tdefFamily, cdefName, cdefEnvList in containers
+    )
+    for t, tdefFamily, cdefName, cdefEnvList in containers:
+        # if there are no results then there are no secrets found!
+        if not scanResults[(t, cdefName)]:
+            # this is a passing check
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": t + cdefName + "/ecs-envvar-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": t + cdefName,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.ECS.1] ECS Task Definition environment variables should not have secrets stored in Plaintext",
+                "Description": "ECS Task Definition family "
+                + tdefFamily
+                + " Container Definition "
+                + cdefName
+                + " does not have any secrets in Environment Variables.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
+                        "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
                     
-                    "Resources": [
-                        {
-                            "Type": "AwsEcsTaskDefinition",
-                            "Id": t,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEcsTaskDefinition": {
-                                    "ContainerDefinitions": [
-                                        {
-                                            "Name": cdefName
-                                        }
-                                    ],
-                                    "Family": tdefFamily,
-                                }
+                "Resources": [
+                    {
+                        "Type": "AwsEcsTaskDefinition",
+                        "Id": t,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsEcsTaskDefinition": {
+                                "ContainerDefinitions": [
+                                    {
+                                        "Name": cdefName
+                                    }
+                                ],
+                                "Family": tdefFamily,
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "PASSED",
-                        "RelatedRequirements": [
-                            "NIST CSF PR.AC-3",
-                            "NIST SP 800-53 AC-1",
-                            "NIST SP 800-53 AC-17",
-                            "NIST SP 800-53 AC-19",
-                            "NIST SP 800-53 AC-20",
-                            "NIST SP 800-53 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1"
-                        ]
-                    },
-                    "Workflow": {"Status": "RESOLVED"},
-                    "RecordState": "ARCHIVED"
-                }
-                yield finding
-            else:
-                # this is a failing check - we won't actually parse the full payload of potential secrets
-                # otherwise we would break the mutability of a finding...so we will sample the first one
-                # and note that in the finding itself
-                secretType = str(data["results"]["ecs-data-sample.json"][0]["type"])
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": t + cdefName + "/ecs-envvar-secrets-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": t + cdefName,
-                    "AwsAccountId": awsAccountId,
-                    "Types": [
-                        "Software and Configuration Checks/AWS Security Best Practices",
-                        "Effects/Data Exposure"
-                    ],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "CRITICAL"},
-                    "Confidence": 99,
-                    "Title": "[Secrets.ECS.1] ECS Task Definition environment variables should not have secrets stored in Plaintext",
-                    "Description": "ECS Task Definition family "
-                    + tdefFamily
-                    + " Container Definition "
-                    + cdefName
-                    + " has at least one secret in Plaintext environment variables. Detect-secrets is reporting it as "
-                    + secretType
-                    + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
-                            "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
-                        }
-                    },
-                    "ProductFields": {"Product Name": "ElectricEye"},
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED"
+            }
+            yield finding
+        else:
+            # this is a failing check - we won't actually parse the full payload of potential secrets
+            # otherwise we would break the mutability of a finding...so we will sample the first one
+            # and note that in the finding itself
+            secretType = scanResults[(t, cdefName)][0]
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": t + cdefName + "/ecs-envvar-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": t + cdefName,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "CRITICAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.ECS.1] ECS Task Definition environment variables should not have secrets stored in Plaintext",
+                "Description": "ECS Task Definition family "
+                + tdefFamily
+                + " Container Definition "
+                + cdefName
+                + " has at least one secret in Plaintext environment variables. Detect-secrets is reporting it as "
+                + secretType
+                + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
+                        "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
                     
-                    "Resources": [
-                        {
-                            "Type": "AwsEcsTaskDefinition",
-                            "Id": t,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEcsTaskDefinition": {
-                                    "ContainerDefinitions": [
-                                        {
-                                            "Name": cdefName
-                                        }
-                                    ],
-                                    "Family": tdefFamily,
-                                }
+                "Resources": [
+                    {
+                        "Type": "AwsEcsTaskDefinition",
+                        "Id": t,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsEcsTaskDefinition": {
+                                "ContainerDefinitions": [
+                                    {
+                                        "Name": cdefName
+                                    }
+                                ],
+                                "Family": tdefFamily,
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF PR.AC-3",
-                            "NIST SP 800-53 AC-1",
-                            "NIST SP 800-53 AC-17",
-                            "NIST SP 800-53 AC-19",
-                            "NIST SP 800-53 AC-20",
-                            "NIST SP 800-53 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1"
-                        ]
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE"
-                }
-                yield finding
-            # clear out memory and prevent duplicates from being cached
-            os.system("rm " + scanFile)
-            os.system("rm " + resultsFile)
-            del cdefEnvList
-            del writejson
-            del readjson
-            del data
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE"
+            }
+            yield finding
 
 @registry.register_check("ec2")
 def secret_scan_ec2_userdata_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Secrets.EC2.1] EC2 User Data should not have secrets stored in Plaintext"""
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # setup some reusable variables
-    scanFile = f"{dirPath}/ec2-data-sample.json"
-    resultsFile = f"{dirPath}/ec2-scan-result.json"
-    scanCommand = f"detect-secrets scan {scanFile} > {resultsFile}"
     # Paginate through Running and Stopped EC2 Instances
+    instances = []
     paginator = ec2.get_paginator("describe_instances")
     for page in paginator.paginate(Filters=[{'Name': 'instance-state-name','Values': ['running','stopped']}]):
         for r in page["Reservations"]:
@@ -618,159 +568,153 @@ def secret_scan_ec2_userdata_check(cache: dict, awsAccountId: str, awsRegion: st
                 except KeyError:
                     continue
                 userdata = base64.b64decode(idata)
-                with open(scanFile, 'w') as writejson:
-                    json.dump({"value": str(userdata)}, writejson, indent=2, default=str)
-                # execute command
-                os.system(scanCommand)
-                time.sleep(1)
-                # read the results file
-                with open(resultsFile, 'r') as readjson:
-                    data = json.load(readjson)
-                # if results is an empty dict then there are no secrets found!
-                if str(data["results"]) == "{}":
-                    # this is a passing check
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": instanceArn + "/ec2-userdata-secrets-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": instanceArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": [
-                            "Software and Configuration Checks/AWS Security Best Practices",
-                            "Effects/Data Exposure"
-                        ],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "INFORMATIONAL"},
-                        "Confidence": 99,
-                        "Title": "[Secrets.EC2.1] EC2 User Data should not have secrets stored in Plaintext",
-                        "Description": "EC2 Instance "
-                        + instanceId
-                        + " does not have any secrets in Environment Variables.",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
-                                "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
-                            }
-                        },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsEc2Instance",
-                                "Id": instanceArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {
-                                    "AwsEc2Instance": {
-                                        "Type": instanceType,
-                                        "ImageId": instanceImage,
-                                        "VpcId": vpcId,
-                                        "SubnetId": subnetId,
-                                        "LaunchedAt": parse(instanceLaunchedAt).isoformat(),
-                                    }
-                                },
-                            }
-                        ],
-                        "Compliance": {
-                            "Status": "PASSED",
-                            "RelatedRequirements": [
-                                "NIST CSF PR.AC-3",
-                                "NIST SP 800-53 AC-1",
-                                "NIST SP 800-53 AC-17",
-                                "NIST SP 800-53 AC-19",
-                                "NIST SP 800-53 AC-20",
-                                "NIST SP 800-53 SC-15",
-                                "AICPA TSC CC6.6",
-                                "ISO 27001:2013 A.6.2.1",
-                                "ISO 27001:2013 A.6.2.2",
-                                "ISO 27001:2013 A.11.2.6",
-                                "ISO 27001:2013 A.13.1.1",
-                                "ISO 27001:2013 A.13.2.1"
-                            ]
-                        },
-                        "Workflow": {"Status": "RESOLVED"},
-                        "RecordState": "ARCHIVED"
+                instances.append(
+                    (instanceId, instanceArn, instanceType, instanceImage, subnetId, vpcId, instanceLaunchedAt, str(userdata))
+                )
+    # scan the User Data of every instance in one batch
+    scanResults = scan_payloads(
+        (instanceId, {"value": userdata})
+        for instanceId, instanceArn, instanceType, instanceImage, subnetId, vpcId, instanceLaunchedAt, userdata in instances
+    )
+    for instanceId, instanceArn, instanceType, instanceImage, subnetId, vpcId, instanceLaunchedAt, userdata in instances:
+        # if there are no results then there are no secrets found!
+        if not scanResults[instanceId]:
+            # this is a passing check
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": instanceArn + "/ec2-userdata-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": instanceArn,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.EC2.1] EC2 User Data should not have secrets stored in Plaintext",
+                "Description": "EC2 Instance "
+                + instanceId
+                + " does not have any secrets in Environment Variables.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about environmental variables for ECS refer to the Specifying environment variables section of the Amazon Elastic Container Service Developer Guide.",
+                        "Url": "https://docs.aws.amazon.com/AmazonECS/latest/developerguide/taskdef-envfiles.html",
                     }
-                    yield finding
-                else:
-                    # this is a failing check - we won't actually parse the full payload of potential secrets
-                    # otherwise we would break the mutability of a finding...so we will sample the first one
-                    # and note that in the finding itself
-                    secretType = str(data["results"]["ec2-data-sample.json"][0]["type"])
-                    finding = {
-                        "SchemaVersion": "2018-10-08",
-                        "Id": instanceArn + "/ec2-userdata-secrets-check",
-                        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                        "GeneratorId": instanceArn,
-                        "AwsAccountId": awsAccountId,
-                        "Types": [
-                            "Software and Configuration Checks/AWS Security Best Practices",
-                            "Effects/Data Exposure"
-                        ],
-                        "FirstObservedAt": iso8601Time,
-                        "CreatedAt": iso8601Time,
-                        "UpdatedAt": iso8601Time,
-                        "Severity": {"Label": "CRITICAL"},
-                        "Confidence": 99,
-                        "Title": "[Secrets.EC2.1] EC2 User Data should not have secrets stored in Plaintext",
-                        "Description": "EC2 Instance "
-                        + instanceId
-                        + " has at least one secret in Plaintext environment variables. Detect-secrets is reporting it as "
-                        + secretType
-                        + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
-                        "Remediation": {
-                            "Recommendation": {
-                                "Text": "To learn more about working with Instance User Data refer to the Work with instance user data section of the Amazon Elastic Compute Cloud User Guide.",
-                                "Url": "https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/instancedata-add-user-data.html"
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsEc2Instance",
+                        "Id": instanceArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsEc2Instance": {
+                                "Type": instanceType,
+                                "ImageId": instanceImage,
+                                "VpcId": vpcId,
+                                "SubnetId": subnetId,
+                                "LaunchedAt": parse(instanceLaunchedAt).isoformat(),
                             }
                         },
-                        "ProductFields": {"Product Name": "ElectricEye"},
-                        "Resources": [
-                            {
-                                "Type": "AwsEc2Instance",
-                                "Id": instanceArn,
-                                "Partition": awsPartition,
-                                "Region": awsRegion,
-                                "Details": {
-                                    "AwsEc2Instance": {
-                                        "Type": instanceType,
-                                        "ImageId": instanceImage,
-                                        "VpcId": vpcId,
-                                        "SubnetId": subnetId,
-                                        "LaunchedAt": parse(instanceLaunchedAt).isoformat(),
-                                    }
-                                }
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED"
+            }
+            yield finding
+        else:
+            # this is a failing check - we won't actually parse the full payload of potential secrets
+            # otherwise we would break the mutability of a finding...so we will sample the first one
+            # and note that in the finding itself
+            secretType = scanResults[instanceId][0]
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": instanceArn + "/ec2-userdata-secrets-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": instanceArn,
+                "AwsAccountId": awsAccountId,
+                "Types": [
+                    "Software and Configuration Checks/AWS Security Best Practices",
+                    "Effects/Data Exposure"
+                ],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "CRITICAL"},
+                "Confidence": 99,
+                "Title": "[Secrets.EC2.1] EC2 User Data should not have secrets stored in Plaintext",
+                "Description": "EC2 Instance "
+                + instanceId
+                + " has at least one secret in Plaintext environment variables. Detect-secrets is reporting it as "
+                + secretType
+                + " secrets in plaintext can be leaked or exploited by unauthroized personnel who have permissions to access them and read the data. Refer to the remediation instructions if this configuration is not intended.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "To learn more about working with Instance User Data refer to the Work with instance user data section of the Amazon Elastic Compute Cloud User Guide.",
+                        "Url": "https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/instancedata-add-user-data.html"
+                    }
+                },
+                "ProductFields": {"Product Name": "ElectricEye"},
+                "Resources": [
+                    {
+                        "Type": "AwsEc2Instance",
+                        "Id": instanceArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsEc2Instance": {
+                                "Type": instanceType,
+                                "ImageId": instanceImage,
+                                "VpcId": vpcId,
+                                "SubnetId": subnetId,
+                                "LaunchedAt": parse(instanceLaunchedAt).isoformat(),
                             }
-                        ],
-                        "Compliance": {
-                            "Status": "FAILED",
-                            "RelatedRequirements": [
-                                "NIST CSF PR.AC-3",
-                                "NIST SP 800-53 AC-1",
-                                "NIST SP 800-53 AC-17",
-                                "NIST SP 800-53 AC-19",
-                                "NIST SP 800-53 AC-20",
-                                "NIST SP 800-53 SC-15",
-                                "AICPA TSC CC6.6",
-                                "ISO 27001:2013 A.6.2.1",
-                                "ISO 27001:2013 A.6.2.2",
-                                "ISO 27001:2013 A.11.2.6",
-                                "ISO 27001:2013 A.13.1.1",
-                                "ISO 27001:2013 A.13.2.1"
-                            ]
-                        },
-                        "Workflow": {"Status": "NEW"},
-                        "RecordState": "ACTIVE"
+                        }
                     }
-                    yield finding
-                # clear out memory and prevent duplicates from being cached
-                os.system("rm " + scanFile)
-                os.system("rm " + resultsFile)
-                del userdata
-                del writejson
-                del readjson
-                del data
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF PR.AC-3",
+                        "NIST SP 800-53 AC-1",
+                        "NIST SP 800-53 AC-17",
+                        "NIST SP 800-53 AC-19",
+                        "NIST SP 800-53 AC-20",
+                        "NIST SP 800-53 SC-15",
+                        "AICPA TSC CC6.6",
+                        "ISO 27001:2013 A.6.2.1",
+                        "ISO 27001:2013 A.6.2.2",
+                        "ISO 27001:2013 A.11.2.6",
+                        "ISO 27001:2013 A.13.1.1",
+                        "ISO 27001:2013 A.13.2.1"
+                    ]
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE"
+            }
+            yield finding
 
 '''
 TODO :)
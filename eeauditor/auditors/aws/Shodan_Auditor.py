@@ -18,24 +18,25 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
+from aws_clients import get_client
 import os
-import requests
-import socket
 import datetime
 from check_register import CheckRegister
+from shodan_client import ShodanClient
 
 registry = CheckRegister()
 # import boto3 clients
-ssm = boto3.client("ssm")
-ec2 = boto3.client("ec2")
-elbv2 = boto3.client("elbv2")
-rds = boto3.client("rds")
-elasticsearch = boto3.client("es")
-elb = boto3.client("elb")
-dms = boto3.client("dms")
-amzmq = boto3.client("mq")
-cloudfront = boto3.client("cloudfront")
+ssm = get_client("ssm")
+ec2 = get_client("ec2")
+elbv2 = get_client("elbv2")
+rds = get_client("rds")
+elasticsearch = get_client("es")
+elb = get_client("elb")
+dms = get_client("dms")
+amzmq = get_client("mq")
+cloudfront = get_client("cloudfront")
+# Global Accelerator API is only available in us-west-2
+globalaccelerator = get_client("globalaccelerator", region_name="us-west-2")
 
 class ShodanError(Exception):
     pass
@@ -49,8 +50,8 @@ try:
 except KeyError:
     raise
 
-# Shodan information for Requests
-shodanUrl = "https://api.shodan.io/shodan/host/"
+# pooled, rate limited and cached Shodan lookups shared by every check, see shodan_client.py
+shodan = ShodanClient.from_environment(shodanApiKey)
 
 @registry.register_check("shodan")
 def public_ec2_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
@@ -58,6 +59,10 @@ def public_ec2_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = ec2.describe_instances(DryRun=False, MaxResults=500)
+    shodan.prefetch(ips=[
+        inst["PublicIpAddress"]
+        for res in response["Reservations"] for inst in res["Instances"] if "PublicIpAddress" in inst
+    ])
     for res in response["Reservations"]:
         for inst in res["Instances"]:
             ec2Type = str(inst["InstanceType"])
@@ -68,9 +73,8 @@ def public_ec2_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
             ec2VpcId = str(inst["VpcId"])
             ec2SubnetId = str(inst["SubnetId"])
             ec2PublicIp = str(inst["PublicIpAddress"])
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + ec2PublicIp + "?key=" + shodanApiKey)
-            data = r.json()
+            # check the Shodan index for your host
+            data = shodan.host(ec2PublicIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -219,6 +223,10 @@ def public_alb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = elbv2.describe_load_balancers()
+    shodan.prefetch(hostnames=[
+        lbs["DNSName"] for lbs in response["LoadBalancers"]
+        if lbs["Scheme"] == "internet-facing" and lbs["Type"] == "application"
+    ])
     for lbs in response["LoadBalancers"]:
         elbv2Scheme = str(lbs["Scheme"])
         elbv2Type = str(lbs["Type"])
@@ -228,10 +236,9 @@ def public_alb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         elbv2Dns = str(lbs["DNSName"])
         if elbv2Scheme == "internet-facing" and elbv2Type == "application":
             # use Socket to do a DNS lookup and retrieve the IP address
-            elbv2Ip = socket.gethostbyname(elbv2Dns)
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + elbv2Ip + "?key=" + shodanApiKey)
-            data = r.json()
+            elbv2Ip = shodan.resolve(elbv2Dns)
+            # check the Shodan index for your host
+            data = shodan.host(elbv2Ip)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -380,6 +387,10 @@ def public_rds_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = rds.describe_db_instances()
+    shodan.prefetch(hostnames=[
+        rdsdb["Endpoint"]["Address"] for rdsdb in response["DBInstances"]
+        if rdsdb["PubliclyAccessible"] and "Endpoint" in rdsdb
+    ])
     for rdsdb in response["DBInstances"]:
         rdsInstanceId = str(rdsdb["DBInstanceIdentifier"])
         rdsInstanceArn = str(rdsdb["DBInstanceArn"])
@@ -391,10 +402,9 @@ def public_rds_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         publicCheck = str(rdsdb["PubliclyAccessible"])
         if publicCheck == "True":
             # use Socket to do a DNS lookup and retrieve the IP address
-            rdsIp = socket.gethostbyname(rdsDns)
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + rdsIp + "?key=" + shodanApiKey)
-            data = r.json()
+            rdsIp = shodan.resolve(rdsDns)
+            # check the Shodan index for your host
+            data = shodan.host(rdsIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -562,10 +572,9 @@ def public_es_domain_shodan_check(cache: dict, awsAccountId: str, awsRegion: str
         except Exception as e:
             if str(e) == "'VPCOptions'":
                 # use Socket to do a DNS lookup and retrieve the IP address
-                esDomainIp = socket.gethostbyname(esDomainEndpoint)
-                # use requests Library to check the Shodan index for your host
-                r = requests.get(url=shodanUrl + esDomainIp + "?key=" + shodanApiKey)
-                data = r.json()
+                esDomainIp = shodan.resolve(esDomainEndpoint)
+                # check the Shodan index for your host
+                data = shodan.host(esDomainIp)
                 shodanOutput = str(data)
                 if shodanOutput == "{'error': 'No information available for that IP.'}":
                     # this is a passing check
@@ -722,6 +731,9 @@ def public_clb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = elb.describe_load_balancers()
+    shodan.prefetch(hostnames=[
+        clbs["DNSName"] for clbs in response["LoadBalancerDescriptions"] if clbs["Scheme"] == "internet-facing"
+    ])
     for clbs in response["LoadBalancerDescriptions"]:
         clbName = str(clbs["LoadBalancerName"])
         clbArn = f"arn:{awsPartition}:elasticloadbalancing:{awsRegion}:{awsAccountId}:loadbalancer/{clbName}"
@@ -729,10 +741,9 @@ def public_clb_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
         clbScheme = str(clbs["Scheme"])
         if clbScheme == "internet-facing":
             # use Socket to do a DNS lookup and retrieve the IP address
-            clbIp = socket.gethostbyname(clbDnsName)
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + clbIp + "?key=" + shodanApiKey)
-            data = r.json()
+            clbIp = shodan.resolve(clbDnsName)
+            # check the Shodan index for your host
+            data = shodan.host(clbIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -875,15 +886,18 @@ def public_dms_replication_instance_shodan_check(cache: dict, awsAccountId: str,
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     response = dms.describe_replication_instances()
+    shodan.prefetch(ips=[
+        repinstances["ReplicationInstancePublicIpAddress"] for repinstances in response["ReplicationInstances"]
+        if repinstances["PubliclyAccessible"] and "ReplicationInstancePublicIpAddress" in repinstances
+    ])
     for repinstances in response["ReplicationInstances"]:
         dmsInstanceId = str(repinstances["ReplicationInstanceIdentifier"])
         dmsInstanceArn = str(repinstances["ReplicationInstanceArn"])
         publicAccessCheck = str(repinstances["PubliclyAccessible"])
         if publicAccessCheck == "True":
             dmsPublicIp = str(repinstances["ReplicationInstancePublicIpAddress"])
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + dmsPublicIp + "?key=" + shodanApiKey)
-            data = r.json()
+            # check the Shodan index for your host
+            data = shodan.host(dmsPublicIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -1033,10 +1047,10 @@ def public_amazon_mq_broker_shodan_check(cache: dict, awsAccountId: str, awsRegi
         publicAccessCheck = str(response["PubliclyAccessible"])
         if publicAccessCheck == "True":
             mqInstances = response["BrokerInstances"]
+            shodan.prefetch(ips=[instance["IpAddress"] for instance in mqInstances if "IpAddress" in instance])
             for instance in mqInstances:
                 mqBrokerIpv4 = str(instance["IpAddress"])
-                r = requests.get(url=shodanUrl + mqBrokerIpv4 + "?key=" + shodanApiKey)
-                data = r.json()
+                data = shodan.host(mqBrokerIpv4)
                 shodanOutput = str(data)
                 iso8601time = (
                     datetime.datetime.utcnow()
@@ -1183,14 +1197,14 @@ def cloudfront_shodan_check(cache: dict, awsAccountId: str, awsRegion: str, awsP
     paginator = cloudfront.get_paginator("list_distributions")
     iterator = paginator.paginate()
     for page in iterator:
+        shodan.prefetch(hostnames=[cfront["DomainName"] for cfront in page["DistributionList"].get("Items", [])])
         for cfront in page["DistributionList"]["Items"]:
             domainName = str(cfront["DomainName"])
             cfArn = str(cfront["ARN"])
             cfId = str(cfront["Id"])
-            cfDomainIp = socket.gethostbyname(domainName)
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + cfDomainIp + "?key=" + shodanApiKey)
-            data = r.json()
+            cfDomainIp = shodan.resolve(domainName)
+            # check the Shodan index for your host
+            data = shodan.host(cfDomainIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
@@ -1330,20 +1344,17 @@ def global_accelerator_shodan_check(cache: dict, awsAccountId: str, awsRegion: s
     """[Shodan.CloudFront.1] CloudFront Distributions should be monitored for being indexed by Shodan"""
     # ISO Time
     iso8601time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    # Create a Session is us-west-2 - which is where the Global Accelerator API is in
-    session = boto3.Session(region_name="us-west-2")
-    gax = session.client("globalaccelerator")
-    paginator = gax.get_paginator("list_accelerators")
+    paginator = globalaccelerator.get_paginator("list_accelerators")
     iterator = paginator.paginate()
     for page in iterator:
+        shodan.prefetch(hostnames=[ga["DnsName"] for ga in page["Accelerators"]])
         for ga in page["Accelerators"]:
             gaxArn = str(ga["AcceleratorArn"])
             gaxName = str(ga["Name"])
             gaxDns = str(ga["DnsName"])
-            gaxDomainIp = socket.gethostbyname(gaxDns)
-            # use requests Library to check the Shodan index for your host
-            r = requests.get(url=shodanUrl + gaxDomainIp + "?key=" + shodanApiKey)
-            data = r.json()
+            gaxDomainIp = shodan.resolve(gaxDns)
+            # check the Shodan index for your host
+            data = shodan.host(gaxDomainIp)
             shodanOutput = str(data)
             if shodanOutput == "{'error': 'No information available for that IP.'}":
                 # this is a passing check
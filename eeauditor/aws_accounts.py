@@ -0,0 +1,109 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import os
+import threading
+import boto3
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session
+
+def get_organization_accounts():
+    """Returns the ID of every ACTIVE Account in the AWS Organization, requires Organizations read access"""
+    organizations = boto3.client("organizations")
+    accounts = []
+    paginator = organizations.get_paginator("list_accounts")
+    for page in paginator.paginate():
+        for account in page["Accounts"]:
+            if account["Status"] == "ACTIVE":
+                accounts.append(account["Id"])
+    return accounts
+
+def read_account_list(accounts):
+    """Returns a list of Account IDs from either a file (one or more IDs per line) or a comma-separated string"""
+    if os.path.isfile(accounts):
+        with open(accounts) as f:
+            accounts = f.read().replace("\n", ",")
+    return [account.strip() for account in accounts.split(",") if account.strip()]
+
+class AssumeRoleSessionCache(object):
+    """Creates and caches one boto3 Session per Account using an assumed IAM Role
+
+        Credentials are refreshable, botocore assumes the Role again shortly before they
+        expire so long running scans do not fail halfway through an Account.
+    """
+
+    def __init__(self, role_name, external_id=None, session_name="ElectricEye", duration=3600, base_session=None, base_account_id=None):
+        self.role_name = role_name
+        self.external_id = external_id
+        self.session_name = session_name
+        self.duration = duration
+        self.base_session = base_session or boto3.Session()
+        # no need to assume a Role in the Account of the base Session
+        self.base_account_id = base_account_id
+        self.sts = self.base_session.client("sts")
+        self._sessions = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _assume_role(self, awsAccountId, awsPartition):
+        kwargs = {
+            "RoleArn": f"arn:{awsPartition}:iam::{awsAccountId}:role/{self.role_name}",
+            "RoleSessionName": self.session_name,
+            "DurationSeconds": self.duration,
+        }
+        if self.external_id:
+            kwargs["ExternalId"] = self.external_id
+        credentials = self.sts.assume_role(**kwargs)["Credentials"]
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+    def create_session(self, awsAccountId, awsPartition="aws"):
+        """Returns a new boto3 Session for an Account which is not cached"""
+        if awsAccountId == self.base_account_id:
+            return self.base_session
+        botocoreSession = get_session()
+        botocoreSession._credentials = RefreshableCredentials.create_from_metadata(
+            metadata=self._assume_role(awsAccountId, awsPartition),
+            refresh_using=lambda: self._assume_role(awsAccountId, awsPartition),
+            method="sts-assume-role",
+        )
+        return boto3.Session(botocore_session=botocoreSession)
+
+    def get_session(self, awsAccountId, awsPartition="aws"):
+        """Returns the boto3 Session for an Account, assuming the Role on first use"""
+        # one lock per Account so Roles in different Accounts are assumed in parallel
+        with self._lock:
+            accountLock = self._locks.setdefault(awsAccountId, threading.Lock())
+        with accountLock:
+            session = self._sessions.get(awsAccountId)
+            if session is None:
+                session = self.create_session(awsAccountId, awsPartition)
+                self._sessions[awsAccountId] = session
+            return session
+
+    def evict(self, awsAccountId):
+        """Drops and returns the cached Session of an Account, None when there is none. The Role
+        is assumed again if the Account is used afterwards"""
+        with self._lock:
+            self._locks.pop(awsAccountId, None)
+            return self._sessions.pop(awsAccountId, None)
@@ -0,0 +1,178 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import contextvars
+import threading
+from contextlib import contextmanager
+import boto3
+from botocore.config import Config
+
+# one consistent botocore Config for every client: adaptive client side rate limiting
+# with retries so throttled APIs back off instead of failing checks, and timeouts so
+# a hung connection cannot stall a worker forever
+DEFAULT_CLIENT_CONFIG = {
+    "retries": {"max_attempts": 10, "mode": "adaptive"},
+    "connect_timeout": 10,
+    "read_timeout": 60,
+    "max_pool_connections": 10,
+}
+
+# the boto3 Session and Region the current thread is running checks against, a context
+# variable so pools started by a check can carry it over with run_in_context()
+_activeTarget = contextvars.ContextVar("activeTarget", default=None)
+
+@contextmanager
+def use_session(session, region_name):
+    """Routes every RoutedClient used by the current thread to session and region_name"""
+    previous = _activeTarget.get()
+    _activeTarget.set((session, region_name))
+    try:
+        yield
+    finally:
+        _activeTarget.set(previous)
+
+def run_in_context(fn):
+    """Returns fn wrapped to run in a copy of the calling thread's context
+
+        Threads of a pool do not inherit the context of the thread submitting work, wrap the
+        work of pools started by checks so their API calls keep the Account & Region routing
+        of use_session() and are attributed to the check by RunReport.measure()
+    """
+    context = contextvars.copy_context()
+
+    def wrapped(*args, **kwargs):
+        # a context can only be entered by one thread at a time, each call runs in its own copy
+        return context.copy().run(fn, *args, **kwargs)
+
+    return wrapped
+
+class RoutingSession(object):
+    """Central provider of the boto3 clients used by Auditors
+
+        Auditors declare their clients at import time with get_client() (or boto3.client(),
+        while they are loaded boto3.DEFAULT_SESSION is the provider). Those are RoutedClients,
+        the real client is only built on first use, for the Account (boto3 Session) and
+        Region of the check being ran, and shared by every Auditor and worker using the
+        same service. Plugins are then loaded only once no matter how many Accounts and
+        Regions are audited.
+    """
+
+    def __init__(self, session=None, region_name=None):
+        # used when no check is running, e.g. API calls made at import time or unit tests
+        self._default = (session, region_name) if session else None
+        self.config = Config(**DEFAULT_CLIENT_CONFIG)
+        # callables given every new real client, e.g. to register botocore event handlers
+        self.clientHooks = []
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def default(self):
+        if self._default is None:
+            with self._lock:
+                if self._default is None:
+                    session = boto3.Session()
+                    self._default = (session, session.region_name)
+        return self._default
+
+    @property
+    def region_name(self):
+        return self.active()[1]
+
+    def configure(self, max_pool_connections=None, **kwargs):
+        """Updates the botocore Config of every client created from now on, e.g. to size
+        connection pools to the number of workers sharing a client"""
+        if max_pool_connections:
+            kwargs["max_pool_connections"] = max(max_pool_connections, DEFAULT_CLIENT_CONFIG["max_pool_connections"])
+        self.config = self.config.merge(Config(**kwargs))
+
+    def add_client_hook(self, hook):
+        """Calls hook(client) for every real client created from now on"""
+        self.clientHooks.append(hook)
+
+    def active(self):
+        return _activeTarget.get() or self.default
+
+    def client(self, service_name, region_name=None, **kwargs):
+        return RoutedClient(service_name, region_name, kwargs, self)
+
+    def get_client(self, service_name, region_name=None, **kwargs):
+        """Returns the real boto3 client for the active Session, one per (Session, service, Region)"""
+        session, activeRegion = self.active()
+        region_name = region_name or activeRegion
+        # keyed by the Session itself, an id() could be reused by the Session of another Account
+        key = (session, service_name, region_name, repr(sorted(kwargs.items())))
+        client = self._clients.get(key)
+        if client is None:
+            # boto3 Sessions are not thread safe, only create one client at a time
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    config = self.config
+                    if kwargs.get("config"):
+                        config = config.merge(kwargs["config"])
+                    clientKwargs = dict(kwargs, config=config)
+                    client = session.client(service_name, region_name=region_name, **clientKwargs)
+                    for hook in self.clientHooks:
+                        hook(client)
+                    self._clients[key] = client
+        return client
+
+    def evict(self, session):
+        """Drops every client of session, e.g. once all checks of its Account have ran"""
+        with self._lock:
+            for key in [key for key in self._clients if key[0] is session]:
+                del self._clients[key]
+
+class RoutedClient(object):
+    """Lazily proxies every attribute to the real client of the active Account and Region"""
+
+    def __init__(self, service_name, region_name=None, kwargs=None, router=None):
+        self._service_name = service_name
+        self._region_name = region_name
+        self._kwargs = kwargs or {}
+        # None follows the module level provider, see set_client_provider()
+        self._router = router
+
+    def __getattr__(self, name):
+        router = self._router or _provider
+        return getattr(
+            router.get_client(self._service_name, self._region_name, **self._kwargs), name
+        )
+
+    def __repr__(self):
+        return f"RoutedClient({self._service_name})"
+
+# the provider used by get_client(), EEAuditor replaces it with one for its default Session
+_provider = RoutingSession()
+
+def get_client(service_name, region_name=None, **kwargs):
+    """Returns a lazy, shared client for Auditors to bind at import time
+
+        region_name pins the client to one Region (e.g. us-east-1 only APIs), otherwise it
+        follows the Region of the running check
+    """
+    return RoutedClient(service_name, region_name, kwargs)
+
+def get_client_provider():
+    return _provider
+
+def set_client_provider(provider):
+    global _provider
+    _provider = provider
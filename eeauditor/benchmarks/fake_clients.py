@@ -0,0 +1,131 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import functools
+import botocore.session
+from botocore.exceptions import ClientError
+
+# number of items per page returned by FakePaginator
+DEFAULT_PAGE_SIZE = 1000
+
+# loads the service and pagination models, never makes an API call
+modelSession = botocore.session.get_session()
+
+@functools.lru_cache(maxsize=None)
+def get_model_client(service_name):
+    """Returns a real, never called botocore client used for its exceptions and service model"""
+    return modelSession.create_client(
+        service_name,
+        region_name="us-east-1",
+        aws_access_key_id="benchmark",
+        aws_secret_access_key="benchmark",
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_result_keys(service_name, operation_name):
+    """Returns the top level keys botocore paginates for an operation"""
+    config = modelSession.get_paginator_model(service_name).get_paginator(operation_name)
+    resultKeys = config["result_key"]
+    if isinstance(resultKeys, str):
+        resultKeys = [resultKeys]
+    # nested result keys are served as a single page
+    return [key for key in resultKeys if key.isalnum()]
+
+def client_error(code, message, operation_name):
+    """Returns the ClientError botocore would raise for an API error"""
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation_name)
+
+class FakeClient(object):
+    """In-memory stand-in for a boto3 client
+
+        operations maps client method names (e.g. "describe_security_groups") to callables
+        receiving the API parameters and returning the response. Unknown operations raise
+        the same ClientError as an Account without access would. Unlike botocore's Stubber
+        responses do not need to be queued in the order the check makes its calls, so the
+        same estate can serve every check of an Auditor.
+    """
+
+    def __init__(self, service_name, operations):
+        self.service_name = service_name
+        self.operations = operations
+        self.calls = 0
+        model = get_model_client(service_name)
+        self.exceptions = model.exceptions
+        self.meta = model.meta
+
+    def _operation_name(self, method_name):
+        return self.meta.method_to_api_mapping.get(method_name, method_name)
+
+    def call(self, method_name, **kwargs):
+        self.calls += 1
+        operation = self.operations.get(method_name)
+        if operation is None:
+            raise client_error(
+                "AccessDenied", "Not implemented by the synthetic estate", self._operation_name(method_name)
+            )
+        return operation(**kwargs)
+
+    def get_paginator(self, method_name):
+        return FakePaginator(self, method_name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return functools.partial(self.call, name)
+
+class FakePaginator(object):
+    """Splits the result of a FakeClient operation into pages using botocore's pagination model"""
+
+    def __init__(self, client, method_name, page_size=DEFAULT_PAGE_SIZE):
+        self.client = client
+        self.method_name = method_name
+        self.page_size = page_size
+
+    def paginate(self, **kwargs):
+        response = self.client.call(self.method_name, **kwargs)
+        resultKeys = [
+            key for key in get_result_keys(self.client.service_name, self.client._operation_name(self.method_name))
+            if key in response
+        ]
+        if not resultKeys:
+            yield response
+            return
+        pages = max(
+            1, max((len(response[key]) + self.page_size - 1) // self.page_size for key in resultKeys)
+        )
+        for page in range(pages):
+            pageResponse = dict(response)
+            for key in resultKeys:
+                pageResponse[key] = response[key][page * self.page_size : (page + 1) * self.page_size]
+            yield pageResponse
+
+class FakeClientProvider(object):
+    """Client provider for aws_clients.set_client_provider() serving FakeClients
+
+        Every client bound by an Auditor with get_client() resolves to the FakeClient of its
+        service, clients of services the estate does not model reject every call
+    """
+
+    def __init__(self, clients):
+        self.clients = clients
+
+    def get_client(self, service_name, region_name=None, **kwargs):
+        if service_name not in self.clients:
+            self.clients[service_name] = FakeClient(service_name, {})
+        return self.clients[service_name]
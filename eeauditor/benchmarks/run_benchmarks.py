@@ -0,0 +1,166 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import importlib
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from auditor_cache import AuditorCache
+from aws_clients import get_client_provider, set_client_provider
+from benchmarks.fake_clients import FakeClientProvider
+from benchmarks.synthetic import SyntheticEstate
+from check_index import CheckIndex
+
+# Auditors whose services are modelled by SyntheticEstate
+DEFAULT_AUDITORS = [
+    "Amazon_EC2_Security_Group_Auditor",
+    "Amazon_EC2_Auditor",
+    "Amazon_S3_Auditor",
+    "AWS_IAM_Auditor",
+]
+DEFAULT_SIZES = "10,1000"
+# growth of run time relative to the estate size above which a check is reported, 1 is linear
+DEFAULT_MAX_EXPONENT = 1.5
+# checks faster than this at the largest size are too noisy to judge their scaling
+MIN_SECONDS_FOR_SCALING = 0.05
+
+searchpath = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "auditors", "aws"))
+
+def run_check(check, estate, clients, cache):
+    """Runs one check to completion, returns its findings, API calls, run time and peak memory"""
+    callsBefore = sum(client.calls for client in clients.values())
+    tracemalloc.reset_peak()
+    memoryBefore = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    findings = 0
+    error = None
+    try:
+        for finding in check(
+            cache=cache, awsAccountId=estate.awsAccountId, awsRegion="us-east-1", awsPartition="aws"
+        ):
+            findings += 1
+    except Exception as e:
+        error = repr(e)
+    seconds = time.perf_counter() - start
+    peakMemory = tracemalloc.get_traced_memory()[1] - memoryBefore
+    return {
+        "Findings": findings,
+        "ApiCalls": sum(client.calls for client in clients.values()) - callsBefore,
+        "Seconds": round(seconds, 4),
+        "PeakMemoryBytes": max(0, peakMemory),
+        "Error": error,
+    }
+
+def benchmark_auditors(sizes, auditors=None, check_name=None, seed=0):
+    """Runs the checks of every Auditor against a SyntheticEstate of each size
+
+        Each check gets a fresh cache so it pays for the collection of its own inventory,
+        the same as the first check of an Auditor does in a real run
+    """
+    auditors = auditors or DEFAULT_AUDITORS
+    checks = [
+        (module_name, name) for module_name, service_name, name, doc in CheckIndex(searchpath).checks()
+        if module_name in auditors and (not check_name or name == check_name)
+    ]
+    results = []
+    previousProvider = get_client_provider()
+    tracemalloc.start()
+    try:
+        for size in sizes:
+            estate = SyntheticEstate(size, seed=seed)
+            clients = estate.clients()
+            set_client_provider(FakeClientProvider(clients))
+            for module_name, name in checks:
+                check = getattr(importlib.import_module(f"auditors.aws.{module_name}"), name)
+                cache = AuditorCache().scope(module_name, estate.awsAccountId, "us-east-1")
+                result = run_check(check, estate, clients, cache)
+                result.update({"Auditor": module_name, "CheckName": name, "Size": size})
+                result["ResourcesPerSecond"] = round(size / result["Seconds"], 1) if result["Seconds"] else None
+                results.append(result)
+    finally:
+        tracemalloc.stop()
+        set_client_provider(previousProvider)
+    return results
+
+def scaling_exponents(results):
+    """Returns {check name: exponent} of run time against estate size between the smallest and largest size
+
+        An exponent of 1 is linear, 2 is quadratic. Checks too fast to measure are left out.
+    """
+    byCheck = {}
+    for result in results:
+        byCheck.setdefault(result["CheckName"], []).append(result)
+    exponents = {}
+    for name, checkResults in byCheck.items():
+        checkResults = sorted(checkResults, key=lambda result: result["Size"])
+        smallest, largest = checkResults[0], checkResults[-1]
+        if (
+            largest["Size"] <= smallest["Size"]
+            or largest["Seconds"] < MIN_SECONDS_FOR_SCALING
+            or not smallest["Seconds"]
+        ):
+            continue
+        exponents[name] = round(
+            math.log(largest["Seconds"] / smallest["Seconds"]) / math.log(largest["Size"] / smallest["Size"]), 2
+        )
+    return exponents
+
+def print_results(results, exponents, max_exponent):
+    print(f"{'Check':<60} {'Size':>7} {'Seconds':>9} {'Res/s':>10} {'Calls':>7} {'Findings':>9} {'Peak MiB':>9}")
+    for result in results:
+        resourcesPerSecond = result["ResourcesPerSecond"] if result["ResourcesPerSecond"] is not None else "-"
+        print(
+            f"{result['CheckName']:<60} {result['Size']:>7} {result['Seconds']:>9.3f} {resourcesPerSecond:>10} "
+            f"{result['ApiCalls']:>7} {result['Findings']:>9} {result['PeakMemoryBytes'] / 1048576:>9.1f}"
+        )
+        if result["Error"]:
+            print(f"  failed with {result['Error']}")
+    for name, exponent in sorted(exponents.items(), key=lambda item: item[1], reverse=True):
+        if exponent > max_exponent:
+            print(f"Check {name} scales with exponent {exponent} of the estate size (max {max_exponent})")
+
+@click.command()
+@click.option("--sizes", default=DEFAULT_SIZES, show_default=True, help="Comma-separated synthetic estate sizes, e.g. 10,1000,50000")
+@click.option("-a", "--auditors", default=",".join(DEFAULT_AUDITORS), show_default=True, help="Comma-separated Auditors to benchmark")
+@click.option("-c", "--check-name", default="", help="Only benchmark this Check")
+@click.option("--seed", default=0, show_default=True, help="Seed of the synthetic estate")
+@click.option("--max-exponent", default=DEFAULT_MAX_EXPONENT, show_default=True, help="Exit with 1 when a Check's run time grows faster than size to this power")
+@click.option("--output-file", default="", help="Also write the results as JSON to this file")
+def main(sizes, auditors, check_name, seed, max_exponent, output_file):
+    sizeList = sorted(int(size) for size in sizes.split(",") if size.strip())
+    results = benchmark_auditors(
+        sizeList, auditors=[auditor.strip() for auditor in auditors.split(",")], check_name=check_name, seed=seed
+    )
+    exponents = scaling_exponents(results)
+    print_results(results, exponents, max_exponent)
+    if output_file:
+        with open(output_file, "w") as jsonfile:
+            json.dump({"Results": results, "ScalingExponents": exponents}, jsonfile, indent=2)
+    if any(exponent > max_exponent for exponent in exponents.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
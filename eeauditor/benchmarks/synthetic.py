@@ -0,0 +1,395 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import datetime
+import io
+import json
+import random
+from benchmarks.fake_clients import FakeClient, client_error
+
+SYNTHETIC_ACCOUNT_ID = "012345678901"
+# ports commonly found in Security Group rules, the sensitive ones trigger findings
+COMMON_PORTS = [22, 25, 53, 80, 443, 445, 1433, 3306, 3389, 5432, 6379, 8080, 9200, 27017]
+NOW = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+
+class SyntheticEstate(object):
+    """Deterministic, in-memory inventory of an AWS Account of a given size
+
+        size is the number of Security Groups, EC2 instances, S3 buckets and IAM users (and
+        of the roles, groups and policies scaled from it). The same seed always produces the
+        same estate so benchmark runs can be compared.
+    """
+
+    def __init__(self, size, seed=0, awsAccountId=SYNTHETIC_ACCOUNT_ID):
+        self.size = size
+        self.awsAccountId = awsAccountId
+        self.random = random.Random(seed)
+        self.vpcs = [f"vpc-{n:08x}" for n in range(max(1, size // 100))]
+        self.subnets = [f"subnet-{n:08x}" for n in range(max(1, size // 20))]
+        self.security_groups = [self.make_security_group(n) for n in range(size)]
+        self.instances = [self.make_instance(n) for n in range(size)]
+        self.buckets = [self.make_bucket(n) for n in range(size)]
+        self.users = [self.make_user(n) for n in range(size)]
+        self.roles = [self.make_role(n) for n in range(max(1, size // 2))]
+        self.groups = [self.make_group(n) for n in range(max(1, size // 10))]
+        self.policies = [self.make_policy(n) for n in range(max(1, size // 10))]
+
+    def random_cidr(self):
+        if self.random.random() < 0.1:
+            return "0.0.0.0/0"
+        return f"10.{self.random.randrange(256)}.{self.random.randrange(256)}.0/24"
+
+    def make_policy_document(self):
+        if self.random.random() < 0.1:
+            statement = {"Effect": "Allow", "Action": "*", "Resource": "*"}
+        else:
+            statement = {
+                "Effect": "Allow",
+                "Action": ["s3:GetObject", "s3:ListBucket"],
+                "Resource": [f"arn:aws:s3:::bucket-{self.random.randrange(self.size + 1)}/*"],
+            }
+        return {"Version": "2012-10-17", "Statement": [statement]}
+
+    def make_security_group(self, n):
+        permissions = []
+        for _ in range(self.random.randint(1, 5)):
+            if self.random.random() < 0.02:
+                permissions.append({"IpProtocol": "-1", "IpRanges": [{"CidrIp": self.random_cidr()}]})
+                continue
+            fromPort = self.random.choice(COMMON_PORTS)
+            toPort = fromPort if self.random.random() < 0.9 else fromPort + self.random.randint(1, 1000)
+            permissions.append({
+                "IpProtocol": self.random.choice(["tcp", "tcp", "tcp", "udp"]),
+                "FromPort": fromPort,
+                "ToPort": toPort,
+                "IpRanges": [{"CidrIp": self.random_cidr()} for _ in range(self.random.randint(1, 3))],
+                "Ipv6Ranges": [],
+                "UserIdGroupPairs": [],
+            })
+        return {
+            "GroupName": f"sg-name-{n}",
+            "GroupId": f"sg-{n:08x}",
+            "OwnerId": self.awsAccountId,
+            "VpcId": self.random.choice(self.vpcs),
+            "Description": "synthetic",
+            "IpPermissions": permissions,
+            "IpPermissionsEgress": [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}],
+        }
+
+    def make_instance(self, n):
+        launchTime = NOW - datetime.timedelta(days=self.random.randrange(1000))
+        return {
+            "InstanceId": f"i-{n:017x}",
+            "InstanceType": self.random.choice(["t3.micro", "m5.large", "c5.xlarge"]),
+            "ImageId": f"ami-{self.random.randrange(max(1, self.size // 50)):08x}",
+            "SubnetId": self.random.choice(self.subnets),
+            "VpcId": self.random.choice(self.vpcs),
+            "LaunchTime": launchTime,
+            "BlockDeviceMappings": [{"DeviceName": "/dev/xvda", "Ebs": {"AttachTime": launchTime, "VolumeId": f"vol-{n:017x}"}}],
+            "MetadataOptions": {"HttpEndpoint": "enabled", "HttpTokens": self.random.choice(["optional", "required"])},
+            "EnclaveOptions": {"Enabled": False},
+            "PublicDnsName": "" if self.random.random() < 0.8 else f"ec2-{n}.compute.amazonaws.com",
+            "SourceDestCheck": self.random.random() < 0.95,
+            "SecurityGroups": [
+                {"GroupId": group["GroupId"], "GroupName": group["GroupName"]}
+                for group in self.random.sample(self.security_groups, min(2, len(self.security_groups)))
+            ],
+            "State": {"Name": "running"},
+        }
+
+    def make_bucket(self, n):
+        return {
+            "Name": f"bucket-{n}",
+            "CreationDate": NOW,
+            "Encrypted": self.random.random() < 0.8,
+            "Versioning": self.random.choice(["Enabled", "Suspended"]),
+            "Logging": self.random.random() < 0.5,
+            "Lifecycle": self.random.random() < 0.5,
+            "Policy": self.random.random() < 0.3,
+            "IsPublic": self.random.random() < 0.05,
+        }
+
+    def make_user(self, n):
+        user = {
+            "UserName": f"user-{n}",
+            "UserId": f"AIDA{n:016d}",
+            "Arn": f"arn:aws:iam::{self.awsAccountId}:user/user-{n}",
+            "Path": "/",
+            "CreateDate": NOW,
+            "AccessKeys": [
+                {
+                    "UserName": f"user-{n}",
+                    "AccessKeyId": f"AKIA{n:012d}{k:04d}",
+                    "Status": "Active",
+                    "CreateDate": NOW - datetime.timedelta(days=self.random.randrange(200)),
+                }
+                for k in range(self.random.randint(0, 2))
+            ],
+            "MFADevices": [] if self.random.random() < 0.3 else [{"SerialNumber": f"mfa-{n}", "UserName": f"user-{n}"}],
+            "InlinePolicies": {f"inline-{k}": self.make_policy_document() for k in range(self.random.randint(0, 2))},
+            "AttachedPolicies": [],
+        }
+        if self.random.random() < 0.7:
+            user["PasswordLastUsed"] = NOW
+        return user
+
+    def make_role(self, n):
+        return {
+            "RoleName": f"role-{n}",
+            "RoleId": f"AROA{n:016d}",
+            "Arn": f"arn:aws:iam::{self.awsAccountId}:role/role-{n}",
+            "Path": "/",
+            "CreateDate": NOW,
+            "InlinePolicies": {f"inline-{k}": self.make_policy_document() for k in range(self.random.randint(0, 3))},
+        }
+
+    def make_group(self, n):
+        return {
+            "GroupName": f"group-{n}",
+            "GroupId": f"AGPA{n:016d}",
+            "Arn": f"arn:aws:iam::{self.awsAccountId}:group/group-{n}",
+            "Path": "/",
+            "CreateDate": NOW,
+            "InlinePolicies": {f"inline-{k}": self.make_policy_document() for k in range(self.random.randint(0, 2))},
+        }
+
+    def make_policy(self, n):
+        return {
+            "PolicyName": f"policy-{n}",
+            "PolicyId": f"ANPA{n:016d}",
+            "Arn": f"arn:aws:iam::{self.awsAccountId}:policy/policy-{n}",
+            "DefaultVersionId": "v1",
+            "Document": self.make_policy_document(),
+        }
+
+    def security_group_rules(self):
+        """Returns the ingress rules of every Security Group as DescribeSecurityGroupRules does"""
+        rules = []
+        for group in self.security_groups:
+            for permission in group["IpPermissions"]:
+                for ipRange in permission["IpRanges"]:
+                    rules.append({
+                        "SecurityGroupRuleId": f"sgr-{len(rules):017x}",
+                        "GroupId": group["GroupId"],
+                        "GroupOwnerId": self.awsAccountId,
+                        "IsEgress": False,
+                        "IpProtocol": permission["IpProtocol"],
+                        "FromPort": permission.get("FromPort", -1),
+                        "ToPort": permission.get("ToPort", -1),
+                        "CidrIpv4": ipRange["CidrIp"],
+                    })
+        return rules
+
+    def ec2_operations(self):
+        imageIds = sorted(set(instance["ImageId"] for instance in self.instances))
+        images = {
+            imageId: {"ImageId": imageId, "CreationDate": "2021-06-01T00:00:00.000Z", "State": "available"}
+            for imageId in imageIds
+        }
+        return {
+            "describe_security_groups": lambda **kwargs: {"SecurityGroups": self.security_groups},
+            "describe_security_group_rules": lambda **kwargs: {"SecurityGroupRules": self.security_group_rules()},
+            "describe_instances": lambda **kwargs: {
+                "Reservations": [{"ReservationId": f"r-{n:017x}", "Instances": [instance]} for n, instance in enumerate(self.instances)]
+            },
+            "describe_images": lambda ImageIds=(), **kwargs: {
+                "Images": [images[imageId] for imageId in ImageIds if imageId in images]
+            },
+            "describe_subnets": lambda SubnetIds=(), **kwargs: {
+                "Subnets": [
+                    {
+                        "SubnetId": subnetId,
+                        "VpcId": self.vpcs[0],
+                        "AvailabilityZone": f"us-east-1{'abc'[int(subnetId.split('-')[1], 16) % 3]}",
+                        "MapPublicIpOnLaunch": False,
+                    }
+                    for subnetId in (SubnetIds or self.subnets)
+                ]
+            },
+            "get_serial_console_access_status": lambda **kwargs: {"SerialConsoleAccessEnabled": False},
+        }
+
+    def s3_operations(self):
+        buckets = {bucket["Name"]: bucket for bucket in self.buckets}
+
+        def get_bucket(Bucket, flag, operation_name, code, message):
+            bucket = buckets[Bucket]
+            if not bucket[flag]:
+                raise client_error(code, message, operation_name)
+            return bucket
+
+        def get_bucket_encryption(Bucket, **kwargs):
+            get_bucket(
+                Bucket, "Encrypted", "GetBucketEncryption", "ServerSideEncryptionConfigurationNotFoundError",
+                "The server side encryption configuration was not found",
+            )
+            return {"ServerSideEncryptionConfiguration": {"Rules": [{"ApplyServerSideEncryptionByDefault": {"SSEAlgorithm": "AES256"}}]}}
+
+        def get_bucket_lifecycle_configuration(Bucket, **kwargs):
+            get_bucket(
+                Bucket, "Lifecycle", "GetBucketLifecycleConfiguration", "NoSuchLifecycleConfiguration",
+                "The lifecycle configuration does not exist",
+            )
+            return {"Rules": [{"ID": "expire", "Status": "Enabled", "Filter": {"Prefix": ""}, "Expiration": {"Days": 365}}]}
+
+        def get_bucket_policy(Bucket, **kwargs):
+            get_bucket(Bucket, "Policy", "GetBucketPolicy", "NoSuchBucketPolicy", "The bucket policy does not exist")
+            return {"Policy": json.dumps(self.make_policy_document())}
+
+        def get_bucket_policy_status(Bucket, **kwargs):
+            get_bucket(Bucket, "Policy", "GetBucketPolicyStatus", "NoSuchBucketPolicy", "The bucket policy does not exist")
+            return {"PolicyStatus": {"IsPublic": buckets[Bucket]["IsPublic"]}}
+
+        def get_bucket_logging(Bucket, **kwargs):
+            if buckets[Bucket]["Logging"]:
+                return {"LoggingEnabled": {"TargetBucket": "logs", "TargetPrefix": Bucket}}
+            return {}
+
+        return {
+            "list_buckets": lambda **kwargs: {
+                "Buckets": [{"Name": bucket["Name"], "CreationDate": bucket["CreationDate"]} for bucket in self.buckets],
+                "Owner": {"ID": self.awsAccountId},
+            },
+            "get_bucket_encryption": get_bucket_encryption,
+            "get_bucket_lifecycle_configuration": get_bucket_lifecycle_configuration,
+            "get_bucket_logging": get_bucket_logging,
+            "get_bucket_policy": get_bucket_policy,
+            "get_bucket_policy_status": get_bucket_policy_status,
+            "get_bucket_versioning": lambda Bucket, **kwargs: {"Status": buckets[Bucket]["Versioning"]},
+        }
+
+    def s3control_operations(self):
+        return {
+            "get_public_access_block": lambda **kwargs: {
+                "PublicAccessBlockConfiguration": {
+                    "BlockPublicAcls": True,
+                    "IgnorePublicAcls": True,
+                    "BlockPublicPolicy": True,
+                    "RestrictPublicBuckets": True,
+                }
+            }
+        }
+
+    def iam_operations(self):
+        users = {user["UserName"]: user for user in self.users}
+        roles = {role["RoleName"]: role for role in self.roles}
+        groups = {group["GroupName"]: group for group in self.groups}
+        policies = {policy["Arn"]: policy for policy in self.policies}
+        userKeys = ["UserName", "UserId", "Arn", "Path", "CreateDate", "PasswordLastUsed"]
+        principalKeys = ["RoleName", "GroupName", "RoleId", "GroupId", "Arn", "Path", "CreateDate"]
+
+        def summary(item, keys):
+            return {key: item[key] for key in keys if key in item}
+
+        def inline_policies(item):
+            return [
+                {"PolicyName": name, "PolicyDocument": document} for name, document in item["InlinePolicies"].items()
+            ]
+
+        def authorization_details(**kwargs):
+            return {
+                "UserDetailList": [
+                    dict(
+                        summary(user, userKeys[:-1]),
+                        UserPolicyList=inline_policies(user),
+                        AttachedManagedPolicies=user["AttachedPolicies"],
+                    )
+                    for user in self.users
+                ],
+                "RoleDetailList": [dict(summary(role, principalKeys), RolePolicyList=inline_policies(role)) for role in self.roles],
+                "GroupDetailList": [dict(summary(group, principalKeys), GroupPolicyList=inline_policies(group)) for group in self.groups],
+                "Policies": [
+                    dict(
+                        {key: value for key, value in policy.items() if key != "Document"},
+                        PolicyVersionList=[{"Document": policy["Document"], "VersionId": "v1", "IsDefaultVersion": True}],
+                    )
+                    for policy in self.policies
+                ],
+                "IsTruncated": False,
+            }
+
+        return {
+            "list_users": lambda **kwargs: {"Users": [summary(user, userKeys) for user in self.users], "IsTruncated": False},
+            "list_access_keys": lambda UserName, **kwargs: {"AccessKeyMetadata": users[UserName]["AccessKeys"]},
+            "list_mfa_devices": lambda UserName, **kwargs: {"MFADevices": users[UserName]["MFADevices"]},
+            "list_user_policies": lambda UserName, **kwargs: {"PolicyNames": list(users[UserName]["InlinePolicies"])},
+            "get_user_policy": lambda UserName, PolicyName, **kwargs: {
+                "UserName": UserName, "PolicyName": PolicyName, "PolicyDocument": users[UserName]["InlinePolicies"][PolicyName]
+            },
+            "list_attached_user_policies": lambda UserName, **kwargs: {"AttachedPolicies": users[UserName]["AttachedPolicies"]},
+            "list_roles": lambda **kwargs: {"Roles": [summary(role, principalKeys) for role in self.roles], "IsTruncated": False},
+            "list_role_policies": lambda RoleName, **kwargs: {"PolicyNames": list(roles[RoleName]["InlinePolicies"])},
+            "get_role_policy": lambda RoleName, PolicyName, **kwargs: {
+                "RoleName": RoleName, "PolicyName": PolicyName, "PolicyDocument": roles[RoleName]["InlinePolicies"][PolicyName]
+            },
+            "list_groups": lambda **kwargs: {"Groups": [summary(group, principalKeys) for group in self.groups], "IsTruncated": False},
+            "list_group_policies": lambda GroupName, **kwargs: {"PolicyNames": list(groups[GroupName]["InlinePolicies"])},
+            "get_group_policy": lambda GroupName, PolicyName, **kwargs: {
+                "GroupName": GroupName, "PolicyName": PolicyName, "PolicyDocument": groups[GroupName]["InlinePolicies"][PolicyName]
+            },
+            "list_policies": lambda **kwargs: {
+                "Policies": [{key: value for key, value in policy.items() if key != "Document"} for policy in self.policies],
+                "IsTruncated": False,
+            },
+            "get_policy_version": lambda PolicyArn, VersionId, **kwargs: {
+                "PolicyVersion": {"Document": policies[PolicyArn]["Document"], "VersionId": VersionId, "IsDefaultVersion": True}
+            },
+            "get_account_password_policy": lambda **kwargs: {
+                "PasswordPolicy": {
+                    "MinimumPasswordLength": 14,
+                    "RequireSymbols": True,
+                    "RequireNumbers": True,
+                    "RequireUppercaseCharacters": True,
+                    "RequireLowercaseCharacters": True,
+                    "MaxPasswordAge": 90,
+                    "PasswordReusePrevention": 24,
+                }
+            },
+            "list_server_certificates": lambda **kwargs: {"ServerCertificateMetadataList": []},
+            "get_account_authorization_details": authorization_details,
+            "generate_credential_report": lambda **kwargs: {"State": "COMPLETE"},
+            "get_credential_report": lambda **kwargs: {"Content": self.credential_report(), "ReportFormat": "text/csv"},
+        }
+
+    def credential_report(self):
+        """Returns the IAM credential report of every user as GetCredentialReport does"""
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(["user", "arn", "password_enabled", "mfa_active", "access_key_1_active", "access_key_2_active"])
+        for user in self.users:
+            activeKeys = [key["Status"] == "Active" for key in user["AccessKeys"]] + [False, False]
+            writer.writerow([
+                user["UserName"],
+                user["Arn"],
+                str("PasswordLastUsed" in user).lower(),
+                str(bool(user["MFADevices"])).lower(),
+                str(activeKeys[0]).lower(),
+                str(activeKeys[1]).lower(),
+            ])
+        return content.getvalue().encode("utf-8")
+
+    def clients(self):
+        """Returns a FakeClient for every service the estate models"""
+        return {
+            "ec2": FakeClient("ec2", self.ec2_operations()),
+            "s3": FakeClient("s3", self.s3_operations()),
+            "s3control": FakeClient("s3control", self.s3control_operations()),
+            "iam": FakeClient("iam", self.iam_operations()),
+        }
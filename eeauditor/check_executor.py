@@ -0,0 +1,135 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from collections import deque
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# default number of checks for the same service (the key passed to register_check)
+# which are allowed to run at the same time
+DEFAULT_SERVICE_CONCURRENCY = 2
+
+class ConcurrentCheckExecutor(object):
+    """Runs checks on a thread pool and yields their findings as a single stream
+
+        Concurrency is capped per service name so one API family cannot be flooded
+        with requests regardless of how many workers are available. Checks wait in a
+        queue per service and are only handed to the pool once their service has room,
+        so workers never sit idle behind a busy service. Services are taken in the order
+        they were queued, the checks of one Account finish before the next one starts.
+    """
+
+    def __init__(self, workers, service_concurrency=DEFAULT_SERVICE_CONCURRENCY, queue_size=1000):
+        self.workers = max(1, workers)
+        self.service_concurrency = max(1, service_concurrency)
+        # {service_name: deque of (check_name, run)} waiting for their service to have room
+        self._waiting = {}
+        # services with waiting checks, in the order they were queued
+        self._services = deque()
+        # {service_name: checks running}
+        self._running = {}
+        self._inFlight = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._findings = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+
+    def _put(self, item):
+        # keep trying so workers notice when the consumer stopped reading
+        while not self._stop.is_set():
+            try:
+                self._findings.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _next_task(self):
+        """Returns the next runnable (service_name, check_name, run) of the first service with room, or None"""
+        for service_name in self._services:
+            if self._running.get(service_name, 0) >= self.service_concurrency:
+                continue
+            waiting = self._waiting[service_name]
+            check_name, run = waiting.popleft()
+            if not waiting:
+                del self._waiting[service_name]
+                self._services.remove(service_name)
+            return service_name, check_name, run
+        return None
+
+    def _dispatch(self):
+        """Hands runnable checks to the pool while it has idle workers"""
+        with self._lock:
+            while not self._stop.is_set() and self._inFlight < self.workers:
+                task = self._next_task()
+                if task is None:
+                    return
+                service_name = task[0]
+                self._running[service_name] = self._running.get(service_name, 0) + 1
+                self._inFlight += 1
+                try:
+                    self._pool.submit(self._worker, *task)
+                except RuntimeError:
+                    # the pool was shut down by the consumer stopping in between
+                    return
+
+    def _worker(self, service_name, check_name, run):
+        try:
+            for finding in run():
+                if self._stop.is_set():
+                    return
+                self._put(finding)
+        except Exception as e:
+            print(f"Failed to execute check {check_name} with exception {e}")
+        finally:
+            with self._lock:
+                self._running[service_name] -= 1
+                self._inFlight -= 1
+            self._dispatch()
+            self._put(_CheckDone)
+
+    def run(self, tasks):
+        """Yields findings from tasks, a list of (service_name, check_name, run) tuples
+
+            run is called in a worker thread and must return an iterable of findings
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return
+        for service_name, check_name, run in tasks:
+            if service_name not in self._waiting:
+                self._waiting[service_name] = deque()
+                self._services.append(service_name)
+            self._waiting[service_name].append((check_name, run))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="eeauditor")
+        try:
+            self._dispatch()
+            pending = len(tasks)
+            while pending:
+                item = self._findings.get()
+                if item is _CheckDone:
+                    pending -= 1
+                else:
+                    yield item
+        finally:
+            self._stop.set()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+class _CheckDone(object):
+    """Sentinel put on the findings queue when a check has finished"""
@@ -0,0 +1,112 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import ast
+import hashlib
+import json
+import os
+
+# written next to the Auditors, rebuild it with `python3 eeauditor/check_index.py`
+INDEX_FILE_NAME = "check_index.json"
+
+def index_module(source, filename="<auditor>"):
+    """Returns the checks registered in an Auditor module's source without importing it
+
+        Checks are found by static analysis of the @registry.register_check("service") decorators
+    """
+    checks = []
+    for node in ast.parse(source, filename=filename).body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if (
+                isinstance(decorator, ast.Call)
+                and isinstance(decorator.func, ast.Attribute)
+                and decorator.func.attr == "register_check"
+                and decorator.args
+                and isinstance(decorator.args[0], ast.Constant)
+            ):
+                checks.append(
+                    {
+                        "name": node.name,
+                        "service": decorator.args[0].value,
+                        "doc": ast.get_docstring(node, clean=False) or "",
+                    }
+                )
+    return checks
+
+class CheckIndex(object):
+    """Maps every check to its service, docstring and Auditor module
+
+        The index is read from INDEX_FILE_NAME in the search path and every entry is validated
+        against a hash of its module, modules which were added or changed since the index was
+        built (e.g. Auditors copied from S3 at startup) are analyzed again in memory.
+    """
+
+    def __init__(self, searchpath):
+        self.searchpath = searchpath
+        self.index_file = os.path.join(searchpath, INDEX_FILE_NAME)
+        self.modules = {}
+        if os.path.isfile(self.index_file):
+            with open(self.index_file) as f:
+                self.modules = json.load(f)
+        self.refresh()
+
+    def refresh(self):
+        """Re-indexes new or changed modules and drops deleted ones, returns True if anything changed"""
+        changed = False
+        current = {}
+        for fileName in sorted(os.listdir(self.searchpath)):
+            moduleName, extension = os.path.splitext(fileName)
+            if extension != ".py" or moduleName.startswith("_"):
+                continue
+            with open(os.path.join(self.searchpath, fileName), "rb") as f:
+                source = f.read()
+            digest = hashlib.sha256(source).hexdigest()
+            entry = self.modules.get(moduleName)
+            if not entry or entry["sha256"] != digest:
+                entry = {"sha256": digest, "checks": index_module(source, fileName)}
+                changed = True
+            current[moduleName] = entry
+        if set(current) != set(self.modules):
+            changed = True
+        self.modules = current
+        return changed
+
+    def save(self):
+        with open(self.index_file, "w") as f:
+            json.dump(self.modules, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def checks(self):
+        """Yields (module_name, service_name, check_name, doc) in the order plugins are loaded"""
+        for moduleName in sorted(self.modules):
+            for check in self.modules[moduleName]["checks"]:
+                yield moduleName, check["service"], check["name"], check["doc"]
+
+    def modules_for_check(self, check_name):
+        """Returns the names of the Auditor modules which define check_name"""
+        return sorted(
+            set(moduleName for moduleName, _, checkName, _ in self.checks() if checkName == check_name)
+        )
+
+if __name__ == "__main__":
+    index = CheckIndex(os.path.join(os.path.abspath(os.path.dirname(__file__)), "auditors", "aws"))
+    index.save()
+    print(f"Indexed {sum(1 for _ in index.checks())} checks in {len(index.modules)} Auditors to {index.index_file}")
@@ -19,33 +19,115 @@
 #under the License.
 
 import sys
+from functools import partial
 import boto3
 import click
 from insights import create_sechub_insights
-from eeauditor import EEAuditor
+from check_executor import DEFAULT_SERVICE_CONCURRENCY
+from aws_accounts import AssumeRoleSessionCache, get_organization_accounts, read_account_list
+from eeauditor import AuditTarget, EEAuditor, get_enabled_regions, get_partition
 from processor.main import get_providers, process_findings
+from run_report import DEFAULT_REPORT_TOP, RUN_REPORT_FORMATS
+from secret_scanner import configure_scan_cache
+from port_scanner import DEFAULT_SCAN_BACKEND, SCAN_BACKENDS, configure_scan_backend
 
 
 def print_checks():
     app = EEAuditor(name="AWS Auditor")
 
-    app.load_plugins()
-    
+    # the check index is built by static analysis, no Auditor needs to be loaded
     app.print_checks_md()
 
-def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, output_file=""):
+def get_requested_regions(regions, homeRegion):
+    """Turns the --regions value, "all" or a comma-separated list, into a list of Regions"""
+    if regions.strip().lower() == "all":
+        regionList = get_enabled_regions()
+    else:
+        regionList = [region.strip() for region in regions.split(",") if region.strip()]
+    # global services run in the home Region, prefer the Region of the current Session, see
+    # eeauditor.get_global_services() for global services pinned to another Region
+    if homeRegion in regionList:
+        regionList.remove(homeRegion)
+        regionList.insert(0, homeRegion)
+    return regionList
+
+def get_targets(app, sessions, regions="", accounts="", organization=False):
+    """Returns the AuditTargets for every requested Account and Region, the home Region of each Account comes first
+
+        sessions is the AssumeRoleSessionCache providing the boto3 Session of each Account
+    """
+    regionList = get_requested_regions(regions, app.awsRegion) if regions else [app.awsRegion]
+
+    if organization:
+        accountList = get_organization_accounts()
+    elif accounts:
+        accountList = read_account_list(accounts)
+    else:
+        accountList = [app.awsAccountId]
+
+    targets = []
+    for awsAccountId in accountList:
+        for region in regionList:
+            targets.append(
+                AuditTarget(
+                    awsAccountId,
+                    region,
+                    partial(sessions.get_session, awsAccountId, get_partition(region)),
+                    release=partial(sessions.evict, awsAccountId)
+                )
+            )
+    return targets
+
+def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, output_file="", workers=1, service_concurrency=DEFAULT_SERVICE_CONCURRENCY, regions="", accounts="", organization=False, assume_role_name="", external_id=None, run_report="", report_top=DEFAULT_REPORT_TOP, rescan_all=False, scan_backend=DEFAULT_SCAN_BACKEND):
     if not outputs:
         # default to AWS SecHub even if somehow Click destination is stripped
         outputs = ["sechub"]
 
     app = EEAuditor(name="AWS Auditor")
 
-    app.load_plugins(plugin_name=auditor_name)
+    # payloads the Secrets Auditor already scanned in a previous run reuse their verdict
+    scanCache = configure_scan_cache(rescan_all=rescan_all)
+    # port scanner of the Attack Surface Auditor
+    configure_scan_backend(scan_backend)
+
+    # Auditors are only loaded once, their clients follow the Account & Region of each check
+    app.load_plugins(plugin_name=auditor_name, check_name=check_name)
+
+    # the Session of every audited Account, the current Account keeps the Session of the profile
+    sessions = AssumeRoleSessionCache(
+        role_name=assume_role_name,
+        external_id=external_id,
+        base_session=app.session,
+        base_account_id=app.awsAccountId
+    )
+
+    targets = None
+    if regions or accounts or organization:
+        targets = get_targets(
+            app,
+            sessions,
+            regions=regions,
+            accounts=accounts,
+            organization=organization
+        )
+
+    findings = app.run_checks(
+        requested_check_name=check_name,
+        delay=delay,
+        workers=workers,
+        service_concurrency=service_concurrency,
+        targets=targets
+    )
 
-    findings = list(app.run_checks(requested_check_name=check_name, delay=delay))
+    # This function streams the findings to Security Hub, or otherwise, while checks are running
+    process_findings(findings=findings, outputs=outputs, output_file=output_file, sessions=sessions)
+    scanCache.save()
+    if scanCache.hits or scanCache.misses:
+        print(f"Secrets scan cache hits: {scanCache.hits}, misses: {scanCache.misses}")
 
-    # This function writes the findings to Security Hub, or otherwise
-    process_findings(findings=findings, outputs=outputs, output_file=output_file)
+    if run_report:
+        app.report.write(output_file, run_report)
+        app.report.print_summary(report_top)
 
     print("Done running Checks")
 
@@ -77,6 +159,52 @@ def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, outpu
     default=0, 
     help="Time in seconds to sleep between Auditors being ran, defaults to 0"
 )
+# Workers
+@click.option(
+    "-w",
+    "--workers",
+    default=1,
+    show_default=True,
+    help="Number of Checks to run in parallel, values above 1 run Checks on a thread pool and ignore --delay"
+)
+# Per-service concurrency
+@click.option(
+    "--service-concurrency",
+    default=DEFAULT_SERVICE_CONCURRENCY,
+    show_default=True,
+    help="Maximum number of Checks for the same AWS service to run at once when using --workers"
+)
+# Regions
+@click.option(
+    "-r",
+    "--regions",
+    default="",
+    help="Run against several AWS Regions in one invocation, either \"all\" enabled Regions or a comma-separated list. Defaults to the Region of your current Session"
+)
+# Accounts
+@click.option(
+    "--accounts",
+    default="",
+    help="Run against several AWS Accounts, either a comma-separated list of Account IDs or a file with one Account ID per line. Requires --assume-role-name"
+)
+# Organization
+@click.option(
+    "--organization",
+    is_flag=True,
+    help="Run against every active Account in your AWS Organization. Requires --assume-role-name and Organizations read access"
+)
+# Assume Role
+@click.option(
+    "--assume-role-name",
+    default="",
+    help="Name of the IAM Role ElectricEye assumes in every Account when using --accounts or --organization"
+)
+# External ID
+@click.option(
+    "--external-id",
+    default=None,
+    help="Optional External ID to provide when assuming --assume-role-name"
+)
 # Outputs
 @click.option(
     "-o",
@@ -93,6 +221,34 @@ def run_auditor(auditor_name=None, check_name=None, delay=0, outputs=None, outpu
     show_default=True, 
     help="Name of the file for output, if using anything other than SecHub or Dops"
 )
+# Run Report
+@click.option(
+    "--run-report",
+    type=click.Choice(RUN_REPORT_FORMATS),
+    default=None,
+    help="Write the wall time, AWS API calls, retries, throttles, bytes received and findings of every Check to {output-file}-run-report.json or .csv and print the slowest Checks"
+)
+# Run Report summary size
+@click.option(
+    "--report-top",
+    default=DEFAULT_REPORT_TOP,
+    show_default=True,
+    help="Number of the slowest Checks to print at the end of the run when using --run-report"
+)
+# Secrets scan cache
+@click.option(
+    "--rescan-all",
+    is_flag=True,
+    help="Scan every payload of the Secrets Auditor again instead of reusing the verdicts of previous runs"
+)
+# Attack Surface port scanner
+@click.option(
+    "--scan-backend",
+    type=click.Choice(SCAN_BACKENDS),
+    default=DEFAULT_SCAN_BACKEND,
+    show_default=True,
+    help="Port scanner of the Attack Surface Auditor, asyncio is a pure Python TCP connect scan which does not need nmap"
+)
 # List Output Options
 @click.option(
     "--list-options",
@@ -117,8 +273,19 @@ def main(
     auditor_name,
     check_name,
     delay,
+    workers,
+    service_concurrency,
+    regions,
+    accounts,
+    organization,
+    assume_role_name,
+    external_id,
     outputs,
     output_file,
+    run_report,
+    report_top,
+    rescan_all,
+    scan_backend,
     list_options,
     list_checks,
     create_insights,
@@ -138,12 +305,27 @@ def main(
         create_sechub_insights()
         sys.exit(2)
 
+    if (accounts or organization) and not assume_role_name:
+        print("--assume-role-name is required when using --accounts or --organization")
+        sys.exit(2)
+
     run_auditor(
         auditor_name=auditor_name,
         check_name=check_name,
         delay=delay,
         outputs=outputs,
+        workers=workers,
+        service_concurrency=service_concurrency,
+        regions=regions,
+        accounts=accounts,
+        organization=organization,
+        assume_role_name=assume_role_name,
+        external_id=external_id,
         output_file=output_file,
+        run_report=run_report,
+        report_top=report_top,
+        rescan_all=rescan_all,
+        scan_backend=scan_backend,
     )
 
 if __name__ == "__main__":
@@ -18,25 +18,94 @@
 #specific language governing permissions and limitations
 #under the License.
 from functools import partial
-import inspect
 import os
+import threading
 from time import sleep
 import boto3
-from check_register import CheckRegister, accumulate_paged_results
+from auditor_cache import AuditorCache
+from aws_clients import RoutingSession, set_client_provider, use_session
+from check_index import CheckIndex
+from check_executor import DEFAULT_SERVICE_CONCURRENCY, ConcurrentCheckExecutor
+from check_register import CheckRegister
 from pluginbase import PluginBase
+from region_availability import get_service_regions, is_check_available
+from run_report import RunReport
+from shodan_client import configure_shodan_workers
 
 here = os.path.abspath(os.path.dirname(__file__))
 get_path = partial(os.path.join, here)
-ssm = boto3.client("ssm")
 sts = boto3.client("sts")
 
+# services whose APIs or resources are global, when running against several Regions
+# their checks only run once per Account in the "home" Region
+GLOBAL_SERVICES = ["cloudfront", "health", "iam", "route53", "s3", "support"]
+# global services whose API only answers in one Region, their checks run in that Region
+# whenever it is audited instead of the home Region
+GLOBAL_SERVICE_REGIONS = {"support": "us-east-1"}
+# default size of the worker pool when auditing several Accounts and/or Regions
+DEFAULT_TARGET_WORKERS = 10
+
+def get_partition(awsRegion):
+    """Returns the AWS Partition a Region belongs to"""
+    # GovCloud partition override
+    if awsRegion in ["us-gov-east-1", "us-gov-west-1"]:
+        return "aws-us-gov"
+    # China partition override
+    elif awsRegion in ["cn-north-1", "cn-northwest-1"]:
+        return "aws-cn"
+    # AWS Secret Region override
+    elif awsRegion in ["us-isob-east-1"]:
+        return "aws-isob"
+    # AWS Top Secret Region override
+    elif awsRegion in ["us-iso-east-1"]:
+        return "aws-iso"
+    # default to Commercial AWS Partition
+    return "aws"
+
+class AuditTarget(object):
+    """An AWS Account and Region to run checks against
+
+        get_session is a callable returning the boto3 Session for the Account, it is only
+        called when the first check runs so Roles are assumed lazily from the worker pool.
+        release is an optional callable dropping that Session once every check of the
+        Account has ran, it returns the Session or None when it was never created
+    """
+
+    def __init__(self, awsAccountId, awsRegion, get_session, release=None):
+        self.awsAccountId = awsAccountId
+        self.awsRegion = awsRegion
+        self.awsPartition = get_partition(awsRegion)
+        self.get_session = get_session
+        self.release = release
+
+def get_global_services(targets):
+    """Returns {AuditTarget: set of GLOBAL_SERVICES to run in it}, each ran once per Account
+
+        Global services run in the first target of each Account, the home Region, unless the
+        Region of GLOBAL_SERVICE_REGIONS their API lives in is audited for that Account
+    """
+    accountRegions = {}
+    for target in targets:
+        accountRegions.setdefault(target.awsAccountId, []).append(target.awsRegion)
+    globalServices = {}
+    for target in targets:
+        regions = accountRegions[target.awsAccountId]
+        globalServices[target] = set()
+        for service_name in GLOBAL_SERVICES:
+            serviceRegion = GLOBAL_SERVICE_REGIONS.get(service_name)
+            if serviceRegion not in regions:
+                serviceRegion = regions[0]
+            if target.awsRegion == serviceRegion:
+                globalServices[target].add(service_name)
+    return globalServices
+
 class EEAuditor(object):
     """ElectricEye controller
 
         This class manages loading auditor plugins and running checks
     """
 
-    def __init__(self, name, search_path=None):
+    def __init__(self, name, search_path=None, cache=None):
         if not search_path:
             search_path = "./auditors/aws"
         self.name = name
@@ -44,114 +113,227 @@ class EEAuditor(object):
         # each check must be decorated with the @registry.register_check("cache_name")
         # to be discovered during plugin loading.
         self.registry = CheckRegister()
+        self.registry.checks = {}
+        # run-scoped cache, each Auditor gets its own namespace within it
+        self.cache = cache if cache is not None else AuditorCache()
         # vendor specific credentials dictionary
-        self.awsAccountId = sts.get_caller_identity()["Account"]
+        callerIdentity = sts.get_caller_identity()
+        self.awsAccountId = callerIdentity["Account"]
+        self.awsArn = callerIdentity["Arn"]
+        # the Session which Auditors were loaded with, used for the current Account
+        self.session = boto3.DEFAULT_SESSION or boto3.Session()
         # pull Region from STS Meta - we can use this to cheese which partition we are in
-        self.awsRegion = boto3.Session().region_name
-        # default to Commercial AWS Partition
-        self.awsPartition = "aws"
-        
-        # GovCloud partition override
-        if self.awsRegion in ["us-gov-east-1", "us-gov-west-1"]:
-            self.awsPartition = "aws-us-gov"
-        # China partition override
-        elif self.awsRegion in ["cn-north-1", "cn-northwest-1"]:
-            self.awsPartition = "aws-cn"
-        # AWS Secret Region override
-        elif self.awsRegion in ["us-isob-east-1"]:
-            self.awsPartition = "aws-isob"
-        # AWS Top Secret Region override
-        elif self.awsRegion in ["us-iso-east-1"]:
-            self.awsPartition = "aws-iso"
+        self.awsRegion = self.session.region_name
+        self.awsPartition = get_partition(self.awsRegion)
+        # shared provider of every Auditor client, see aws_clients.py
+        self.clients = RoutingSession(self.session, self.awsRegion)
+        # per check timing and API usage, every client reports to it through botocore events
+        self.report = RunReport()
+        self.clients.add_client_hook(self.report.instrument)
+        self._pendingLock = threading.Lock()
 
         # If there is a desire to add support for multiple clouds, this would be
         # a great place to implement it.
+        self.searchpath = get_path(search_path)
         self.source = self.plugin_base.make_plugin_source(
-            searchpath=[get_path(search_path)], identifier=self.name
+            searchpath=[self.searchpath], identifier=self.name
         )
+        # built on first use from the check index, see check_index.py
+        self._check_index = None
+
+    @property
+    def check_index(self):
+        """Index of every check built by static analysis, used to list and select checks without importing Auditors"""
+        if self._check_index is None:
+            self._check_index = CheckIndex(self.searchpath)
+        return self._check_index
 
-    def load_plugins(self, plugin_name=None):
-        if plugin_name:
-            try:
-                plugin = self.source.load_plugin(plugin_name)
-            except Exception as e:
-                print(f"Failed to load plugin {plugin_name} with exception {e}")
+    def load_plugins(self, plugin_name=None, check_name=None):
+        # Auditors create their boto3 clients from the default Session at import time and
+        # register checks on the class level CheckRegister.checks. Point both at this instance
+        # while loading, clients are routed to the Account & Region of the running check so
+        # the Auditors only need to be loaded once for every Account and Region
+        if check_name and not plugin_name:
+            # only import the Auditor(s) defining the requested check
+            pluginNames = self.check_index.modules_for_check(check_name)
+            if not pluginNames:
+                print(f"Check {check_name} was not found in any Auditor")
+        elif plugin_name:
+            pluginNames = [plugin_name]
         else:
-            for plugin_name in self.source.list_plugins():
+            pluginNames = self.source.list_plugins()
+
+        defaultSession = boto3.DEFAULT_SESSION
+        sharedChecks = CheckRegister.checks
+        # Auditors using get_client() resolve their clients from the module level provider,
+        # custom Auditors still calling boto3.client() go through the DEFAULT_SESSION
+        set_client_provider(self.clients)
+        boto3.DEFAULT_SESSION = self.clients
+        CheckRegister.checks = self.registry.checks
+        try:
+            for plugin_name in pluginNames:
                 try:
                     plugin = self.source.load_plugin(plugin_name)
                 except Exception as e:
                     print(f"Failed to load plugin {plugin_name} with exception {e}")
+        finally:
+            boto3.DEFAULT_SESSION = defaultSession
+            CheckRegister.checks = sharedChecks
+
+    def default_target(self):
+        """Returns the AuditTarget for the current Account and Region"""
+        return AuditTarget(self.awsAccountId, self.awsRegion, lambda: self.session)
 
     def get_regions(self, service):
-        # create an empty list for Commercial Region lookups
-        values = []
-        if self.awsPartition == "aws":
-            # only check validity for AWS Commercial Region
-            # Handle the weird v2 services names - global service overrides for lookup
-            if service == 'kinesisanalyticsv2':
-                service = 'kinesisanalytics'
-            elif service == 'macie2':
-                service = 'macie'
-            elif service == 'elbv2':
-                service = 'elb'
-            elif service == 'wafv2':
-                service = 'waf'
-            else:
-                service = service
-            paginator = ssm.get_paginator("get_parameters_by_path")
-            response_iterator = paginator.paginate(
-                Path=f"/aws/service/global-infrastructure/services/{service}/regions",
-                PaginationConfig={"MaxItems": 1000, "PageSize": 10},
-            )
-            results = accumulate_paged_results(
-                page_iterator=response_iterator, key="Parameters")
-            
-            for parameter in results["Parameters"]:
-                values.append(parameter["Value"])
-        else:
-            print(f"Your partition is {self.awsPartition} and therfore service endpoint validity cannot be checked which may lead to a lot of Boto3 errors, sorry!")
-            values = values
+        """Returns the Regions a service is available in for the current Partition, empty when unknown"""
+        return sorted(get_service_regions(service, self.awsPartition) or [])
 
-        return values
+    def _run_check(self, check_name, check, target):
+        """Runs a single check against a target and yields its findings, any exception is printed and swallowed"""
+        # checks within the same Auditor share a namespace of the run cache so
+        # cached list/describe calls are only made once per Account & Region
+        auditor_cache = self.cache.scope(
+            check.__module__, awsAccountId=target.awsAccountId, awsRegion=target.awsRegion
+        )
+        stats = self.report.get_stats(
+            check_name, check.__module__, target.awsAccountId, target.awsRegion
+        )
+        try:
+            print(f"Executing Check: {check_name}")
+            with self.report.measure(stats):
+                session = target.get_session()
+                findings = iter(check(
+                    cache=auditor_cache,
+                    awsAccountId=target.awsAccountId,
+                    awsRegion=target.awsRegion,
+                    awsPartition=target.awsPartition,
+                ))
+            while True:
+                # only route Auditor clients and measure time while the check itself is running,
+                # the thread consuming the findings may be running other targets in between
+                with self.report.measure(stats), use_session(session, target.awsRegion):
+                    finding = next(findings, None)
+                if finding is None:
+                    break
+                self.report.add_finding(stats)
+                yield finding
+        except Exception as e:
+            print(f"Failed to execute check {check_name} with exception {e}")
 
-    # called from eeauditor/controller.py run_auditor()
-    def run_checks(self, requested_check_name=None, delay=0):
-        # Gather STS information
-        details = sts.get_caller_identity()
-        awsAccount = str(details["Account"])
-        awsArn = str(details["Arn"])
-        # Print some very basic orientation data
-        print(f"Running ElectricEye in AWS Region {self.awsRegion}.\n Located in Partition {self.awsPartition}.\n Profile AWS Account is {awsAccount}.\n Profile current IAM principal ARN is {awsArn}")
+    def _release_account(self, target):
+        """Drops the clients and Session of the Account of target, called after its last check"""
+        session = target.release() if target.release else target.get_session()
+        if session is not None:
+            self.clients.evict(session)
 
-        for service_name, check_list in self.registry.checks.items():
-            # only check regions if in AWS Commerical Partition
-            if self.awsPartition == "aws":
-                if self.awsRegion not in self.get_regions(service_name):
-                    next
+    def _run_and_release(self, run, target, pending):
+        """Runs a check task, pending counts the tasks left per Account and the Account's
+        clients and Session are released once its last check has ended"""
+        try:
+            for finding in run():
+                yield finding
+        finally:
+            with self._pendingLock:
+                pending[target.awsAccountId] -= 1
+                last = pending[target.awsAccountId] == 0
+            if last:
+                self._release_account(target)
 
+    def _selected_checks(self, target, requested_check_name=None, global_services=True):
+        """Yields (service_name, check_name, check) for every check which should be ran
+
+            global_services is the GLOBAL_SERVICES to run against the target, True for all of them
+        """
+        if global_services is True:
+            global_services = GLOBAL_SERVICES
+        for service_name, check_list in self.registry.checks.items():
+            # global services only run in one Region of each Account
+            if service_name in GLOBAL_SERVICES and service_name not in (global_services or ()):
+                continue
             for check_name, check in check_list.items():
-                # clearing cache for each control whithin a auditor
-                auditor_cache = {}
                 # if a specific check is requested, only run that one check
                 if (
                     not requested_check_name
                     or requested_check_name
                     and requested_check_name == check_name
                 ):
-                    try:
-                        print(f"Executing Check: {check_name}")
-                        for finding in check(
-                            cache=auditor_cache,
-                            awsAccountId=self.awsAccountId,
-                            awsRegion=self.awsRegion,
-                            awsPartition=self.awsPartition,
-                        ):
-                            yield finding
-                    except Exception as e:
-                        print(f"Failed to execute check {check_name} with exception {e}")
-            # optional sleep if specified - hardcode to 0 seconds
-            sleep(delay)
+                    # skip checks whose service is not available in the Region, resolved from the
+                    # client the check calls and botocore's bundled endpoint data so no API calls are made
+                    if not is_check_available(service_name, check, target.awsRegion, target.awsPartition):
+                        print(f"Skipping {check_name}, the {service_name} service is not available in {target.awsRegion}")
+                        continue
+                    yield service_name, check_name, check
+
+    def print_orientation(self, targets):
+        # Print some very basic orientation data
+        print(f"Running ElectricEye in AWS Region {self.awsRegion}.\n Located in Partition {self.awsPartition}.\n Profile AWS Account is {self.awsAccountId}.\n Profile current IAM principal ARN is {self.awsArn}")
+        if len(targets) > 1:
+            accounts = sorted(set(target.awsAccountId for target in targets))
+            regions = sorted(set(target.awsRegion for target in targets))
+            print(f"Auditing {len(accounts)} Accounts across {len(regions)} Regions: {', '.join(regions)}")
+
+    def check_tasks(self, target, requested_check_name=None, global_services=True):
+        """Returns (executor key, check_name, run) tuples for a ConcurrentCheckExecutor
+
+            The executor key pairs the Account and Region with the service name so the per-service
+            concurrency limit applies to each regional API endpoint separately
+        """
+        return [
+            (
+                f"{target.awsAccountId}:{target.awsRegion}:{service_name}",
+                check_name,
+                partial(self._run_check, check_name, check, target)
+            )
+            for service_name, check_name, check in self._selected_checks(target, requested_check_name, global_services)
+        ]
+
+    # called from eeauditor/controller.py run_auditor()
+    def run_checks(self, requested_check_name=None, delay=0, workers=1, service_concurrency=DEFAULT_SERVICE_CONCURRENCY, targets=None):
+        """Runs checks and yields their findings
+
+            targets is a list of AuditTarget, defaults to the current Account and Region. Checks
+            for GLOBAL_SERVICES only run once per Account, see get_global_services().
+        """
+        if not targets:
+            targets = [self.default_target()]
+        self.print_orientation(targets)
+
+        if len(targets) > 1 and workers == 1:
+            workers = DEFAULT_TARGET_WORKERS
+        # size the connection pools of the shared clients to the number of workers using them
+        self.clients.configure(max_pool_connections=workers)
+        configure_shodan_workers(workers)
+
+        if workers > 1:
+            # checks are ran on a thread pool, the delay between Auditors does not apply
+            tasks = []
+            globalServices = get_global_services(targets)
+            # {awsAccountId: check tasks not finished}, clients of an Account are only held until
+            # its last check ends so memory does not grow with the number of Accounts audited
+            pending = {}
+            for target in targets:
+                targetTasks = self.check_tasks(
+                    target, requested_check_name, global_services=globalServices[target]
+                )
+                pending[target.awsAccountId] = pending.get(target.awsAccountId, 0) + len(targetTasks)
+                for key, check_name, run in targetTasks:
+                    tasks.append((key, check_name, partial(self._run_and_release, run, target, pending)))
+            executor = ConcurrentCheckExecutor(workers=workers, service_concurrency=service_concurrency)
+            for finding in executor.run(tasks):
+                yield finding
+        else:
+            target = targets[0]
+            previousService = None
+            for service_name, check_name, check in self._selected_checks(target, requested_check_name):
+                # optional sleep between Auditors if specified - hardcode to 0 seconds
+                if previousService and previousService != service_name:
+                    sleep(delay)
+                previousService = service_name
+                for finding in self._run_check(check_name, check, target):
+                    yield finding
+
+        cacheStats = self.cache.stats()
+        print(f"Cache hits: {cacheStats['hits']}, misses: {cacheStats['misses']}")
 
     # called from eeauditor/controller.py print_checks()
     def print_checks_md(self):
@@ -163,14 +345,24 @@ class EEAuditor(object):
             "|----------------------------------------|-------------------------------|----------------------------------------------------------------------------------------|"
         )
 
-        for service_name, check_list in self.registry.checks.items():
-            for check_name, check in check_list.items():
-                doc = check.__doc__
+        # read from the check index so no Auditor has to be imported, checks are grouped
+        # by service in the same order the registry would hold them
+        services = {}
+        for module_name, service_name, check_name, doc in self.check_index.checks():
+            services.setdefault(service_name, []).append((module_name, doc))
+
+        for service_name, check_list in services.items():
+            for module_name, doc in check_list:
                 if doc:
-                    description = (check.__doc__).replace("\n", "")
+                    description = doc.replace("\n", "")
                 else:
                     description = ""
                 table.append(
-                    f"|{inspect.getfile(check).rpartition('/')[2]} | {service_name} | {description}"
+                    f"|{module_name}.py | {service_name} | {description}"
                 )
-        print("\n".join(table))
\ No newline at end of file
+        print("\n".join(table))
+
+def get_enabled_regions():
+    """Returns the name of every Region enabled for the current Account"""
+    ec2 = boto3.client("ec2")
+    return sorted(region["RegionName"] for region in ec2.describe_regions()["Regions"])
@@ -0,0 +1,127 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import io
+import json
+import time
+
+# entity types collected with GetAccountAuthorizationDetails, AWS managed policies are left out
+AUTHORIZATION_DETAILS_FILTER = ["User", "Role", "Group", "LocalManagedPolicy"]
+# key of the inventory in the cache of the IAM Auditor
+INVENTORY_CACHE_KEY = "iam_inventory"
+# seconds to wait between GenerateCredentialReport calls and how many times to try
+CREDENTIAL_REPORT_DELAY = 2
+CREDENTIAL_REPORT_ATTEMPTS = 15
+
+class IamInventory(object):
+    """Users, Groups, Roles and customer managed Policies of an Account with their credential report
+
+        Collected with a paginated GetAccountAuthorizationDetails and one credential report
+        instead of listing the policies, keys and MFA devices of every principal. The report is
+        only generated by the first check needing it, when it is not available the per user
+        lookups fall back to the IAM API.
+    """
+
+    def __init__(self, iam, details):
+        self.iam = iam
+        self.users = details.get("UserDetailList", [])
+        self.groups = details.get("GroupDetailList", [])
+        self.roles = details.get("RoleDetailList", [])
+        self.policies = details.get("Policies", [])
+        self._credentialReport = None
+        self._credentialReportLoaded = False
+
+    @classmethod
+    def collect(cls, iam):
+        details = {"UserDetailList": [], "GroupDetailList": [], "RoleDetailList": [], "Policies": []}
+        paginator = iam.get_paginator("get_account_authorization_details")
+        for page in paginator.paginate(Filter=AUTHORIZATION_DETAILS_FILTER):
+            for key in details:
+                details[key].extend(page.get(key, []))
+        return cls(iam, details)
+
+    @property
+    def credential_report(self):
+        """{user name: credential report row}, None when the report is not available"""
+        if not self._credentialReportLoaded:
+            self._credentialReport = get_credential_report(self.iam)
+            self._credentialReportLoaded = True
+        return self._credentialReport
+
+    def _report_row(self, user_name):
+        if self.credential_report is None:
+            return None
+        return self.credential_report.get(user_name)
+
+    def has_password(self, user_name):
+        row = self._report_row(user_name)
+        if row is not None:
+            return row["password_enabled"] == "true"
+        try:
+            self.iam.get_login_profile(UserName=user_name)
+            return True
+        except self.iam.exceptions.NoSuchEntityException:
+            return False
+
+    def has_mfa(self, user_name):
+        row = self._report_row(user_name)
+        if row is not None:
+            return row["mfa_active"] == "true"
+        return bool(self.iam.list_mfa_devices(UserName=user_name)["MFADevices"])
+
+    def has_active_access_keys(self, user_name):
+        """Returns False only when the credential report shows the user has no active access key"""
+        row = self._report_row(user_name)
+        if row is not None:
+            return row["access_key_1_active"] == "true" or row["access_key_2_active"] == "true"
+        return True
+
+    def default_policy_document(self, policy):
+        """Returns the document of the default version of a customer managed policy"""
+        for version in policy.get("PolicyVersionList", []):
+            if version["IsDefaultVersion"]:
+                document = version["Document"]
+                if isinstance(document, str):
+                    document = json.loads(document)
+                return document
+        return None
+
+def get_credential_report(iam):
+    """Returns the credential report as {user name: row}, None if it could not be generated"""
+    try:
+        for attempt in range(CREDENTIAL_REPORT_ATTEMPTS):
+            if iam.generate_credential_report()["State"] == "COMPLETE":
+                break
+            time.sleep(CREDENTIAL_REPORT_DELAY)
+        content = iam.get_credential_report()["Content"]
+    except Exception as e:
+        print(f"Failed to get the IAM credential report, falling back to per user API calls: {e}")
+        return None
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    return {row["user"]: row for row in csv.DictReader(io.StringIO(content))}
+
+def get_iam_inventory(cache, iam):
+    """Returns the IamInventory of the Account, collected once and shared by every IAM check"""
+    inventory = cache.get(INVENTORY_CACHE_KEY)
+    if inventory is None:
+        inventory = IamInventory.collect(iam)
+        cache[INVENTORY_CACHE_KEY] = inventory
+    return inventory
@@ -0,0 +1,111 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+from auditor_cache import get_shared_cache
+
+# GetMetricData accepts up to 500 queries per request
+MAX_METRIC_DATA_QUERIES = 500
+# key of the collector in the shared cache of each Account and Region
+METRICS_CACHE_KEY = "cloudwatch_metrics"
+_collectorLock = threading.Lock()
+
+def metric_stat(namespace, metric_name, dimensions, period, stat, unit=None):
+    """Returns the MetricStat of a GetMetricData query, dimensions is a {name: value} dict"""
+    metricStat = {
+        "Metric": {
+            "Namespace": namespace,
+            "MetricName": metric_name,
+            "Dimensions": [{"Name": name, "Value": value} for name, value in dimensions.items()],
+        },
+        "Period": period,
+        "Stat": stat,
+    }
+    if unit:
+        metricStat["Unit"] = unit
+    return metricStat
+
+class MetricsCollector(object):
+    """Batches the CloudWatch metrics of many resources into as few GetMetricData requests as possible
+
+        Checks add() the MetricStat they need for each resource under a key of their own, such as
+        ("AWS/Lambda", "Invocations", functionName), then collect() runs every pending query.
+        Queries sharing a time window go out 500 per request, each request is paginated and the
+        results are returned in a map keyed by resource, every result holding the Timestamps and
+        Values of its metric.
+    """
+
+    def __init__(self, cloudwatch):
+        self.cloudwatch = cloudwatch
+        # {(StartTime, EndTime): {key: MetricStat}}
+        self._pending = {}
+        # {key: {"Label", "Timestamps", "Values", "StatusCode"}}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def add(self, key, query, start_time, end_time):
+        """Registers the MetricStat query of a resource, queries already collected are not added again"""
+        with self._lock:
+            if key not in self._results:
+                self._pending.setdefault((start_time, end_time), {})[key] = query
+
+    def _get_metric_data(self, queries, start_time, end_time):
+        keys = list(queries)
+        # query Ids must start with a lowercase letter and be unique within a request
+        ids = {f"m{index + 1}": key for index, key in enumerate(keys)}
+        results = {
+            key: {"Label": None, "Timestamps": [], "Values": [], "StatusCode": "Complete"} for key in keys
+        }
+        paginator = self.cloudwatch.get_paginator("get_metric_data")
+        for page in paginator.paginate(
+            MetricDataQueries=[{"Id": queryId, "MetricStat": queries[key]} for queryId, key in ids.items()],
+            StartTime=start_time,
+            EndTime=end_time,
+        ):
+            for metric in page["MetricDataResults"]:
+                result = results[ids[metric["Id"]]]
+                result["Label"] = metric.get("Label")
+                result["Timestamps"].extend(metric.get("Timestamps", []))
+                result["Values"].extend(metric.get("Values", []))
+                result["StatusCode"] = metric.get("StatusCode", result["StatusCode"])
+        return results
+
+    def collect(self):
+        """Runs every pending query and returns the results of every query added so far, keyed by resource"""
+        with self._lock:
+            while self._pending:
+                (startTime, endTime), queries = next(iter(self._pending.items()))
+                keys = list(queries)
+                for i in range(0, len(keys), MAX_METRIC_DATA_QUERIES):
+                    batch = {key: queries[key] for key in keys[i:i + MAX_METRIC_DATA_QUERIES]}
+                    self._results.update(self._get_metric_data(batch, startTime, endTime))
+                    for key in batch:
+                        del queries[key]
+                del self._pending[(startTime, endTime)]
+            return self._results
+
+def get_metrics_collector(cache, cloudwatch):
+    """Returns the MetricsCollector of an Account and Region, shared by every Auditor"""
+    sharedCache = get_shared_cache(cache)
+    with _collectorLock:
+        collector = sharedCache.get(METRICS_CACHE_KEY)
+        if collector is None:
+            collector = MetricsCollector(cloudwatch)
+            sharedCache[METRICS_CACHE_KEY] = collector
+    return collector
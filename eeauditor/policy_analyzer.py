@@ -0,0 +1,118 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import hashlib
+import json
+import threading
+
+# least privilege ratings of a policy document, from the least to the most severe
+LEAST_PRIVILEGE_PASSING = "passing"
+LEAST_PRIVILEGE_FAILED_LOW = "failedLow"
+LEAST_PRIVILEGE_FAILED_HIGH = "failedHigh"
+LEAST_PRIVILEGE_RATINGS = [LEAST_PRIVILEGE_PASSING, LEAST_PRIVILEGE_FAILED_LOW, LEAST_PRIVILEGE_FAILED_HIGH]
+# number of analyzed documents kept in memory, AWS managed and copy-pasted documents repeat a lot
+MAX_CACHED_ANALYSES = 10000
+
+def load_policy(document):
+    """Returns a policy document as a dict, APIs return some documents as JSON strings"""
+    if isinstance(document, (str, bytes)):
+        document = json.loads(document)
+    return document
+
+def as_list(value):
+    """Policy elements can be a single string or a list of strings"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+def document_hash(document):
+    """Returns the SHA-256 of the canonical JSON form of a policy document"""
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def is_wildcard_action(action):
+    return action == "*" or ":*" in action
+
+class PolicyStatement(object):
+    """A statement of a policy document with every element normalized to a list"""
+
+    __slots__ = ("effect", "actions", "resources", "principals", "hasCondition")
+
+    def __init__(self, statement):
+        self.effect = statement.get("Effect")
+        self.actions = as_list(statement.get("Action"))
+        self.resources = as_list(statement.get("Resource"))
+        # "*" and {"AWS": "*"} are both anonymous access, other principal types are ignored
+        principal = statement.get("Principal")
+        if isinstance(principal, dict):
+            self.principals = as_list(principal.get("AWS"))
+        else:
+            self.principals = as_list(principal)
+        self.hasCondition = bool(statement.get("Condition"))
+
+    @property
+    def is_unconditional_allow(self):
+        return self.effect == "Allow" and not self.hasCondition
+
+    def least_privilege_rating(self):
+        if not self.is_unconditional_allow or not any(is_wildcard_action(action) for action in self.actions):
+            return LEAST_PRIVILEGE_PASSING
+        if "*" in self.resources:
+            return LEAST_PRIVILEGE_FAILED_HIGH
+        if self.resources:
+            return LEAST_PRIVILEGE_FAILED_LOW
+        return LEAST_PRIVILEGE_PASSING
+
+    def is_public(self):
+        return self.is_unconditional_allow and "*" in self.principals
+
+class PolicyAnalysis(object):
+    """Results of analyzing a policy document, computed once per distinct document
+
+        least_privilege_rating is the most severe rating of any statement: "failedHigh" when
+        an unconditional Allow grants wildcard actions on every resource, "failedLow" when it
+        grants them on specific resources. is_public is True when an unconditional Allow has
+        an anonymous ("*") principal.
+    """
+
+    def __init__(self, document):
+        statements = [PolicyStatement(statement) for statement in as_list(document.get("Statement"))]
+        self.least_privilege_rating = max(
+            [LEAST_PRIVILEGE_PASSING] + [statement.least_privilege_rating() for statement in statements],
+            key=LEAST_PRIVILEGE_RATINGS.index
+        )
+        self.is_public = any(statement.is_public() for statement in statements)
+
+_analyses = {}
+_analysesLock = threading.Lock()
+
+def analyze_policy(document):
+    """Returns the PolicyAnalysis of a policy document (dict or JSON string), memoized by document hash"""
+    document = load_policy(document)
+    key = document_hash(document)
+    analysis = _analyses.get(key)
+    if analysis is None:
+        analysis = PolicyAnalysis(document)
+        with _analysesLock:
+            if len(_analyses) >= MAX_CACHED_ANALYSES:
+                _analyses.clear()
+            _analyses[key] = analysis
+    return analysis
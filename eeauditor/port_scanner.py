@@ -0,0 +1,295 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import asyncio
+import ipaddress
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import nmap3
+
+# backends selectable with --scan-backend, nmap needs the nmap binary while asyncio is pure Python
+SCAN_BACKENDS = ["nmap", "asyncio"]
+DEFAULT_SCAN_BACKEND = "nmap"
+# hostnames resolved at the same time
+RESOLVE_WORKERS = 16
+# IPs scanned by a single nmap invocation, override with NMAP_SCAN_BATCH_SIZE
+DEFAULT_SCAN_BATCH_SIZE = 16
+# nmap invocations running at the same time, override with NMAP_SCAN_WORKERS
+DEFAULT_SCAN_WORKERS = 4
+# connections the asyncio backend keeps in flight overall and per host, and how long a
+# connection may take, override with TCP_SCAN_CONCURRENCY, TCP_SCAN_HOST_CONCURRENCY and TCP_SCAN_TIMEOUT
+DEFAULT_TCP_SCAN_CONCURRENCY = 500
+DEFAULT_TCP_SCAN_HOST_CONCURRENCY = 25
+DEFAULT_TCP_SCAN_TIMEOUT = 3.0
+# service names nmap's nmap-services table gives the TCP ports, used by every backend so the
+# names end up the same in finding Ids whichever backend scanned the port
+NMAP_SERVICE_NAMES = {
+    21: "ftp",
+    22: "ssh",
+    23: "telnet",
+    25: "smtp",
+    80: "http",
+    110: "pop3",
+    139: "netbios-ssn",
+    443: "https",
+    445: "microsoft-ds",
+    1433: "ms-sql-s",
+    1521: "oracle",
+    2049: "nfs",
+    2375: "docker",
+    3306: "mysql",
+    3389: "ms-wbt-server",
+    5432: "postgresql",
+    5601: "esmagent",
+    5672: "amqp",
+    6379: "redis",
+    8080: "http-proxy",
+    8182: "vmware-fdm",
+    9092: "XmlIpcRegSvc",
+    27017: "mongod"
+}
+
+# backend used by get_port_scanner(), set by configure_scan_backend()
+_scanBackend = DEFAULT_SCAN_BACKEND
+_scanners = {}
+_scannersLock = threading.Lock()
+
+def service_name(port):
+    """Returns the nmap service name of a TCP port, unknown when nmap-services has none"""
+    return NMAP_SERVICE_NAMES.get(int(port), "unknown")
+
+def is_ip_address(value):
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+def resolve_target(target):
+    """Returns the IPv4 address of an IP or hostname target, None when it does not resolve"""
+    if is_ip_address(target):
+        return target
+    try:
+        # Route53 record names are fully qualified and end with a dot
+        return socket.gethostbyname(target.rstrip("."))
+    except (OSError, UnicodeError):
+        return None
+
+class ScanResults(object):
+    """Parsed port scan results of every scanned IP and the IP each target resolved to"""
+
+    def __init__(self, hosts=None, addresses=None):
+        # {ip: nmap host result with its "ports"}
+        self.hosts = hosts or {}
+        # {target: ip or None when it did not resolve}
+        self.addresses = addresses or {}
+
+    @property
+    def scanned(self):
+        """IPs which were scanned, including those nmap had no results for"""
+        return set(ip for ip in self.addresses.values() if ip)
+
+    def __contains__(self, target):
+        return target in self.addresses
+
+    def update(self, other):
+        self.hosts.update(other.hosts)
+        self.addresses.update(other.addresses)
+
+    def lookup(self, target):
+        """Returns {ip: host result} for a target, shaped like a single host nmap scan, or None"""
+        ip = self.addresses.get(target)
+        host = self.hosts.get(ip)
+        if host is None:
+            return None
+        return {ip: host}
+
+class PortScanner(object):
+    """Scans many targets for open TCP ports, backends implement scan_ips()
+
+        Hostnames are resolved up front and targets are de-duplicated by IP so a host
+        reached through several names, such as a load balancer and the Route53 record
+        aliasing it, is only scanned once.
+    """
+
+    def __init__(self, ports):
+        self.ports = ports
+
+    def scan_ips(self, ips):
+        """Returns {ip: host result} in the shape of nmap3's parsed output"""
+        raise NotImplementedError
+
+    def scan(self, targets, scanned=()):
+        """Returns the ScanResults of IPs and hostnames, each unique IP is scanned once
+
+            IPs in scanned were already scanned, targets resolving to them are only resolved
+        """
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            return ScanResults()
+        with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="resolve") as pool:
+            addresses = dict(zip(targets, pool.map(resolve_target, targets)))
+        scanned = set(scanned)
+        ips = list(dict.fromkeys(ip for ip in addresses.values() if ip and ip not in scanned))
+        print(f"Scanning {len(targets)} targets on {len(ips)} unique IPs")
+        return ScanResults(self.scan_ips(ips) if ips else {}, addresses)
+
+class NmapPortScanner(PortScanner):
+    """Scans IPs with batched nmap TCP connect scans
+
+        IPs are split into batches of batch_size, each batch is scanned by one multi
+        target nmap run and up to workers runs are in flight.
+    """
+
+    def __init__(self, ports, batch_size=DEFAULT_SCAN_BATCH_SIZE, workers=DEFAULT_SCAN_WORKERS, nmap=None):
+        super().__init__(ports)
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.nmap = nmap or nmap3.NmapScanTechniques()
+
+    @classmethod
+    def from_environment(cls, ports):
+        """Returns a NmapPortScanner using the NMAP_SCAN_BATCH_SIZE and NMAP_SCAN_WORKERS environment variables"""
+        return cls(
+            ports,
+            batch_size=int(os.environ.get("NMAP_SCAN_BATCH_SIZE", DEFAULT_SCAN_BATCH_SIZE)),
+            workers=int(os.environ.get("NMAP_SCAN_WORKERS", DEFAULT_SCAN_WORKERS))
+        )
+
+    def _scan_batch(self, ips):
+        results = self.nmap.nmap_tcp_scan(
+            " ".join(ips),
+            args=f"-Pn -p {','.join(str(port) for port in self.ports)}"
+        )
+        # the parsed output also carries "runtime", "stats" and "task_results" keys
+        hosts = {ip: results[ip] for ip in ips if ip in results}
+        for host in hosts.values():
+            for port in host.get("ports", []):
+                port.setdefault("service", {})["name"] = service_name(port["portid"])
+            host["ports"] = sort_ports(host.get("ports", []))
+        return hosts
+
+    def scan_ips(self, ips):
+        batches = [ips[i:i + self.batch_size] for i in range(0, len(ips), self.batch_size)]
+        hosts = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nmap") as pool:
+            futures = [pool.submit(self._scan_batch, batch) for batch in batches]
+            for batch, future in zip(batches, futures):
+                try:
+                    hosts.update(future.result())
+                except Exception as e:
+                    print(f"Failed to scan {', '.join(batch)}: {e}")
+        return hosts
+
+def sort_ports(ports):
+    """Returns port results ordered by port number like nmap lists them, checks number their findings in this order"""
+    return sorted(ports, key=lambda port: int(port["portid"]))
+
+def port_result(port, state, reason):
+    """Returns the result of a TCP port in the shape of nmap3's parsed output"""
+    return {
+        "protocol": "tcp",
+        "portid": str(port),
+        "state": state,
+        "reason": reason,
+        "reason_ttl": "0",
+        "service": {"name": service_name(port), "method": "table", "conf": "3"},
+        "cpe": [],
+        "scripts": []
+    }
+
+class AsyncTcpPortScanner(PortScanner):
+    """Scans IPs with asyncio TCP connect probes, without the nmap binary
+
+        Every (IP, port) pair is one connection attempt: an accepted connection is open, a
+        refused one closed and anything else, including no answer within timeout, filtered.
+        At most concurrency connections are in flight overall and host_concurrency per IP.
+    """
+
+    def __init__(self, ports, concurrency=DEFAULT_TCP_SCAN_CONCURRENCY, host_concurrency=DEFAULT_TCP_SCAN_HOST_CONCURRENCY, timeout=DEFAULT_TCP_SCAN_TIMEOUT):
+        super().__init__(ports)
+        self.concurrency = max(1, concurrency)
+        self.host_concurrency = max(1, host_concurrency)
+        self.timeout = timeout
+
+    @classmethod
+    def from_environment(cls, ports):
+        """Returns an AsyncTcpPortScanner using the TCP_SCAN_* environment variables"""
+        return cls(
+            ports,
+            concurrency=int(os.environ.get("TCP_SCAN_CONCURRENCY", DEFAULT_TCP_SCAN_CONCURRENCY)),
+            host_concurrency=int(os.environ.get("TCP_SCAN_HOST_CONCURRENCY", DEFAULT_TCP_SCAN_HOST_CONCURRENCY)),
+            timeout=float(os.environ.get("TCP_SCAN_TIMEOUT", DEFAULT_TCP_SCAN_TIMEOUT))
+        )
+
+    async def _probe(self, ip, port, scanLimit, hostLimit):
+        async with scanLimit, hostLimit:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.timeout)
+            except asyncio.TimeoutError:
+                return port_result(port, "filtered", "no-response")
+            except ConnectionRefusedError:
+                return port_result(port, "closed", "conn-refused")
+            except OSError:
+                return port_result(port, "filtered", "host-unreach")
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return port_result(port, "open", "syn-ack")
+
+    async def _scan_host(self, ip, scanLimit):
+        hostLimit = asyncio.Semaphore(self.host_concurrency)
+        ports = await asyncio.gather(*(self._probe(ip, port, scanLimit, hostLimit) for port in self.ports))
+        return {
+            "osmatch": {},
+            "ports": sort_ports(ports),
+            "hostname": [],
+            "macaddress": None,
+            "state": {"state": "up", "reason": "user-set", "reason_ttl": "0"}
+        }
+
+    async def _scan_ips(self, ips):
+        scanLimit = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._scan_host(ip, scanLimit) for ip in ips))
+        return dict(zip(ips, results))
+
+    def scan_ips(self, ips):
+        # checks run on worker threads, each scan gets its own event loop
+        return asyncio.run(self._scan_ips(ips))
+
+SCANNERS = {"nmap": NmapPortScanner, "asyncio": AsyncTcpPortScanner}
+
+def configure_scan_backend(backend=DEFAULT_SCAN_BACKEND):
+    """Selects the backend of the PortScanners returned by get_port_scanner()"""
+    global _scanBackend
+    if backend not in SCANNERS:
+        raise ValueError(f"Unknown scan backend {backend}, valid backends are {', '.join(SCAN_BACKENDS)}")
+    _scanBackend = backend
+
+def get_port_scanner(ports):
+    """Returns the PortScanner of the configured backend for ports, created once per run"""
+    key = (_scanBackend, tuple(ports))
+    with _scannersLock:
+        if key not in _scanners:
+            _scanners[key] = SCANNERS[_scanBackend].from_environment(ports)
+        return _scanners[key]
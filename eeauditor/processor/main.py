@@ -17,16 +17,72 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-from processor.outputs.output_base import ElectricEyeOutput
+from itertools import islice
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
-def process_findings(findings: list, outputs: list, **kwargs):
-    """Process all findings from json file and send to outputs sepecified"""
-    for output in outputs:
+# number of findings handed to the outputs at once
+FINDINGS_BATCH_SIZE = 100
+
+class LegacyOutput(BatchedOutput):
+    """Adapts providers which only implement write_findings(), they still receive every finding at once"""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def open(self, **kwargs):
+        self.kwargs = kwargs
+        self.findings = []
+
+    def write_batch(self, findings: list):
+        self.findings.extend(findings)
+
+    def close(self):
+        return self.provider.write_findings(findings=self.findings, **self.kwargs)
+
+def close_providers(providers):
+    """Closes every provider, even when another one fails to close, then raises the first error"""
+    closeError = None
+    for provider in providers:
         try:
-            ElectricEyeOutput.get_provider(output)().write_findings(findings=findings, **kwargs)
+            provider.close()
         except Exception as e:
-            print(f"Error writing output: {e}")
-            raise e
+            print(f"Error closing output: {e}")
+            closeError = closeError or e
+    if closeError is not None:
+        raise closeError
+
+def process_findings(findings, outputs: list, batch_size=FINDINGS_BATCH_SIZE, **kwargs):
+    """Stream findings from any iterable to the outputs specified in batches of batch_size
+
+        Findings are written while checks are still running and never held in memory all at once.
+        Every output which was opened is closed, even when another output or a check fails, so
+        files are terminated and connections released
+    """
+    providers = []
+    # providers which were opened and must be closed
+    opened = []
+    try:
+        try:
+            for output in outputs:
+                provider = ElectricEyeOutput.get_provider(output)()
+                if not isinstance(provider, BatchedOutput):
+                    provider = LegacyOutput(provider)
+                providers.append(provider)
+            for provider in providers:
+                provider.open(**kwargs)
+                opened.append(provider)
+            findings = iter(findings)
+            while True:
+                batch = list(islice(findings, batch_size))
+                if not batch:
+                    break
+                for provider in providers:
+                    provider.write_batch(batch)
+        finally:
+            close_providers(opened)
+    except Exception as e:
+        print(f"Error writing output: {e}")
+        raise e
 
 def get_providers():
     return ElectricEyeOutput.get_all_providers()
\ No newline at end of file
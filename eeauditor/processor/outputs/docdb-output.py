@@ -21,15 +21,16 @@ import os
 import boto3
 import requests
 import pymongo
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 ssm = boto3.client("ssm")
 
 @ElectricEyeOutput
-class JsonProvider(object):
+class JsonProvider(BatchedOutput):
     __provider__ = "docdb"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
+    def open(self, **kwargs):
+        self.count = 0
         # Ensure that the required variables are present
         try:
             mongoUname = os.environ["MONGODB_USERNAME"]
@@ -68,7 +69,6 @@ class JsonProvider(object):
         # Build hostname - these are the default options for TLS sign-on into Mongo
         fullMongoHost = f"mongodb://{mongoUname}:{mongoPw}@{mongoHostname}:27017/?ssl=true&ssl_ca_certs={mongoTlsCertPath}&replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false"
 
-        print(f"Writing {len(findings)} findings to MongoDB")
         try:
             mongoConn = pymongo.MongoClient(fullMongoHost)
         except Exception as e:
@@ -76,18 +76,25 @@ class JsonProvider(object):
 
         print(f"Connected to MongoDB succesfully with {mongoConn}")
 
+        self.mongoConn = mongoConn
+
         eeMongoDb = mongoConn["ElectricEye"]
 
-        mycol = eeMongoDb["ElectricEye-Findings"]
+        self.mycol = eeMongoDb["ElectricEye-Findings"]
 
+    def write_batch(self, findings: list):
         # write to mongo in chunks of 40 using `insert_many()` method
         for i in range(0, len(findings), 40):
             # here is where the fun begins
             chunked = findings[i:i + 40]
 
             try:
-                mycol.insert_many(chunked)
+                self.mycol.insert_many(chunked)
             except Exception as e:
                 print(e)
+        self.count += len(findings)
 
-        return True
\ No newline at end of file
+    def close(self):
+        self.mongoConn.close()
+        print(f"Wrote {self.count} findings to MongoDB")
+        return True
@@ -22,11 +22,11 @@ import boto3
 import json
 import os
 import requests
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 
 @ElectricEyeOutput
-class DopsProvider(object):
+class DopsProvider(BatchedOutput):
     __provider__ = "dops"
 
     def __init__(self):
@@ -53,14 +53,20 @@ class DopsProvider(object):
         self.client_id = str(client_id_response["Parameter"]["Value"])
         self.api_key = str(api_key_response["Parameter"]["Value"])
 
-    def write_findings(self, findings: list, **kwargs):
-        print(f"Writing {len(findings)} results to DisruptOps")
-        if self.client_id and self.api_key and self.url:
-            for finding in findings:
-                requests.post(
-                    self.url, 
-                    data=json.dumps(finding),
-                    auth=(self.client_id, self.api_key)
-                )
-        else:
-            raise ValueError("Missing credentials for client_id or api_key")
\ No newline at end of file
+    def open(self, **kwargs):
+        self.count = 0
+        if not (self.client_id and self.api_key and self.url):
+            raise ValueError("Missing credentials for client_id or api_key")
+        # reuse one connection for every finding
+        self.session = requests.Session()
+        self.session.auth = (self.client_id, self.api_key)
+
+    def write_batch(self, findings: list):
+        for finding in findings:
+            self.session.post(self.url, data=json.dumps(finding))
+        self.count += len(findings)
+
+    def close(self):
+        self.session.close()
+        print(f"Wrote {self.count} results to DisruptOps")
+        return True
@@ -18,24 +18,28 @@
 #specific language governing permissions and limitations
 #under the License.
 import json
-from processor.outputs.output_base import ElectricEyeOutput
+from textwrap import indent
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 @ElectricEyeOutput
-class JsonProvider(object):
+class JsonProvider(BatchedOutput):
     __provider__ = "json_normalized"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
-        # create a new empty list to store flattened findings
-        newFindings = []
-        # create another list to hold Finding IDs, this is to prevent duplicates by looking up values later on
-        allIds = []
+    def open(self, output_file: str, **kwargs):
+        # hold Finding IDs in a set, this is to prevent duplicates by looking up values later on
+        self.allIds = set()
 
-        print(f"Writing {len(findings)} findings to Normalized JSON file (final total may be different due to dedupe)")
+        print(f"Writing findings to Normalized JSON file (final total may be different due to dedupe)")
         # create output file based on inputs
         jsonfile = f"{output_file}-normalized.json"
 
         print(f"Your filename is called {jsonfile}")
 
+        # flattened findings are streamed into a JSON array as they arrive
+        self.file = open(jsonfile, "w")
+        self.file.write("[")
+
+    def write_batch(self, findings: list):
         # loop the findings and create a flatter structure - better for indexing without the nested lists
         for fi in findings:
             findingId = str(fi["Id"])
@@ -74,22 +78,21 @@ class JsonProvider(object):
                     "WorkflowStatus": str(fi["Workflow"]["Status"]),
                     "RecordState": str(fi["RecordState"])
                 }
-                # append new dict to list if we have not already
-                if findingId not in allIds:
-                    newFindings.append(fDict)
-                    # write finding ID to list for later check
-                    allIds.append(findingId)
+                # write the new dict if we have not already
+                if findingId not in self.allIds:
+                    if self.allIds:
+                        self.file.write(",")
+                    self.file.write("\n" + indent(json.dumps(fDict, indent=4), "    "))
+                    # write finding ID to a set for later check
+                    self.allIds.add(findingId)
                 continue
             except KeyError as e:
                 print(f"Issue with Finding ID {findingId} due to missing value {e}")
-        # once complete with parsing findings - write to file and purge findings from memory
-        del findings
-
-        print(f"Wrote {len(allIds)} findings to Normalized JSON file")
 
-        del allIds
+    def close(self):
+        self.file.write("\n]")
+        self.file.close()
 
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(newFindings, jsonfile, indent=4)
+        print(f"Wrote {len(self.allIds)} findings to Normalized JSON file")
 
         return True
\ No newline at end of file
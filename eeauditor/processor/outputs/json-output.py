@@ -19,22 +19,33 @@
 #under the License.
 import json
 import os
+from textwrap import indent
 
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 
 @ElectricEyeOutput
-class JsonProvider(object):
+class JsonProvider(BatchedOutput):
     __provider__ = "json"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
-        print(f"Writing {len(findings)} findings to JSON file")
-        
+    def open(self, output_file: str, **kwargs):
+        self.count = 0
         # create output file based on inputs
-        jsonfile = f"{output_file}.json"
-        print(f"Your filename is called {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(findings, jsonfile, indent=4, default=str)
-            
-        return True
\ No newline at end of file
+        self.jsonfile = f"{output_file}.json"
+        print(f"Your filename is called {self.jsonfile}")
+        # findings are streamed into a JSON array as they arrive
+        self.file = open(self.jsonfile, "w")
+        self.file.write("[")
+
+    def write_batch(self, findings: list):
+        for finding in findings:
+            if self.count:
+                self.file.write(",")
+            self.file.write("\n" + indent(json.dumps(finding, indent=4, default=str), "    "))
+            self.count += 1
+
+    def close(self):
+        self.file.write("\n]")
+        self.file.close()
+        print(f"Wrote {self.count} findings to JSON file")
+        return True
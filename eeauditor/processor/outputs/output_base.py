@@ -37,4 +37,26 @@ class ElectricEyeOutput(object):
     @classmethod
     def get_all_providers(cls):
         """Return a list of all the possible output providers"""
-        return [*cls._outputs]
\ No newline at end of file
+        return [*cls._outputs]
+
+class BatchedOutput(object):
+    """Base class for output providers which consume findings in bounded batches
+
+        process_findings() calls open() once, write_batch() for every batch of findings as
+        the checks produce them and close() once all checks are done. Providers only ever
+        hold one batch in memory. write_findings() is kept for callers with a list.
+    """
+
+    def open(self, **kwargs):
+        self.count = 0
+
+    def write_batch(self, findings: list):
+        raise NotImplementedError
+
+    def close(self):
+        return True
+
+    def write_findings(self, findings: list, **kwargs):
+        self.open(**kwargs)
+        self.write_batch(list(findings))
+        return self.close()
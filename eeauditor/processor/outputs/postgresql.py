@@ -21,11 +21,11 @@ import boto3
 import sys
 import os
 import psycopg2 as psql
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 
 @ElectricEyeOutput
-class PostgresProvider(object):
+class PostgresProvider(BatchedOutput):
     __provider__ = "postgres"
 
     def __init__(self):
@@ -76,76 +76,79 @@ class PostgresProvider(object):
             self.db_password = psqlDbPw
             self.db_name = eePsqlDbName
 
-    def write_findings(self, findings: list, **kwargs):
-        print(f"Writing {len(findings)} results to PostgreSQL")
-        if (self.db_endpoint and self.db_port and self.db_username and self.db_password and self.db_name):
-            try:
-                # Connect to DB and create a Cursor
-                engine = psql.connect(
-                    database=self.db_name,
-                    user=self.db_username,
-                    password=self.db_password,
-                    host=self.db_endpoint,
-                    port=self.db_port
-                )
-                cursor = engine.cursor()
-                
-                # drop previously existing tables
-                cursor.execute("""DROP TABLE IF EXISTS electriceye_findings""")
-                engine.commit()
-                
-                # Create a new table for the ElectricEye findings. Everything is set as Text
-                cursor.execute("""CREATE TABLE IF NOT EXISTS electriceye_findings( schemaversion TEXT, findingid TEXT, awsaccountid TEXT, productarn TEXT, generatorid TEXT, types TEXT, createdat TEXT, severitylabel TEXT, confidence TEXT, title TEXT, description TEXT, resourcetype TEXT, resourceid TEXT, resourceregion TEXT, resourcepartition TEXT, compliancestatus TEXT, compliancecontrols TEXT, workflowstatus TEXT, recordstate TEXT);""")
+    def open(self, **kwargs):
+        self.count = 0
+        if not (self.db_endpoint and self.db_port and self.db_username and self.db_password and self.db_name):
+            raise ValueError("Missing credentials or database parameters")
+        try:
+            # Connect to DB and create a Cursor
+            self.engine = psql.connect(
+                database=self.db_name,
+                user=self.db_username,
+                password=self.db_password,
+                host=self.db_endpoint,
+                port=self.db_port
+            )
+            self.cursor = self.engine.cursor()
 
-                for finding in findings:
-                    # Basic parsing of ASFF to prepare for INSERT into PSQL
-                    try:
-                        awsaccountid = str(finding['AwsAccountId'])
-                    except Exception as e:
-                        if str(e) == "'AwsAccountId'":
-                            awsaccountid = str(finding['awsAccountId'])
-                        else:
-                            continue
-                    schemaversion = str(finding['SchemaVersion'])
-                    findingid = str(finding['Id'])
-                    productarn = str(finding['ProductArn'])
-                    generatorid = str(finding['GeneratorId'])
-                    types = str(finding['Types'][0])
-                    createdat = str(finding['CreatedAt'])
-                    severitylabel = str(finding['Severity']['Label'])
-                    #TODO: Find which findings aren't mapped...
-                    try:
-                        confidence = str(finding['Confidence'])
-                    except Exception:
-                        confidence = '99'
-                    title = str(finding['Title'])
-                    description = str(finding['Description'])
-                    resourcetype = str(finding['Resources'][0]['Type'])
-                    resourceid = str(finding['Resources'][0]['Id'])
-                    resourceregion = str(finding['Resources'][0]['Region'])
-                    resourcepartition = str(finding['Resources'][0]['Partition'])
-                    compliancestatus = str(finding['Compliance']['Status'])
-                    #TODO: Find which findings aren't mapped...
-                    try:
-                        compliancecontrols = str(finding['Compliance']['RelatedRequirements'])
-                    except Exception:
-                        compliancecontrols = str('[]')
-                    workflowstatus = str(finding['Workflow']['Status'])
-                    recordstate = str(finding['RecordState'])
+            # drop previously existing tables
+            self.cursor.execute("""DROP TABLE IF EXISTS electriceye_findings""")
+            self.engine.commit()
 
-                    # Write into Postgres
-                    cursor.execute("INSERT INTO electriceye_findings( schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);", (schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate))
-                
-                # commit the changes
-                engine.commit()
-                # close communication with the postgres server (rds)
-                cursor.close()
+            # Create a new table for the ElectricEye findings. Everything is set as Text
+            self.cursor.execute("""CREATE TABLE IF NOT EXISTS electriceye_findings( schemaversion TEXT, findingid TEXT, awsaccountid TEXT, productarn TEXT, generatorid TEXT, types TEXT, createdat TEXT, severitylabel TEXT, confidence TEXT, title TEXT, description TEXT, resourcetype TEXT, resourceid TEXT, resourceregion TEXT, resourcepartition TEXT, compliancestatus TEXT, compliancecontrols TEXT, workflowstatus TEXT, recordstate TEXT);""")
+        except psql.OperationalError:
+            print("Cannot connect to PostgreSQL! Review your Security Group settings and/or information provided to connect")
+            exit(2)
 
-            except psql.OperationalError:
-                print("Cannot connect to PostgreSQL! Review your Security Group settings and/or information provided to connect")
-                exit(2)
+    def write_batch(self, findings: list):
+        cursor = self.cursor
+        for finding in findings:
+            # Basic parsing of ASFF to prepare for INSERT into PSQL
+            try:
+                awsaccountid = str(finding['AwsAccountId'])
+            except Exception as e:
+                if str(e) == "'AwsAccountId'":
+                    awsaccountid = str(finding['awsAccountId'])
+                else:
+                    continue
+            schemaversion = str(finding['SchemaVersion'])
+            findingid = str(finding['Id'])
+            productarn = str(finding['ProductArn'])
+            generatorid = str(finding['GeneratorId'])
+            types = str(finding['Types'][0])
+            createdat = str(finding['CreatedAt'])
+            severitylabel = str(finding['Severity']['Label'])
+            #TODO: Find which findings aren't mapped...
+            try:
+                confidence = str(finding['Confidence'])
             except Exception:
-                print("Another exception found " + Exception)
-                exit(2)
-        else:
-            raise ValueError("Missing credentials or database parameters")
\ No newline at end of file
+                confidence = '99'
+            title = str(finding['Title'])
+            description = str(finding['Description'])
+            resourcetype = str(finding['Resources'][0]['Type'])
+            resourceid = str(finding['Resources'][0]['Id'])
+            resourceregion = str(finding['Resources'][0]['Region'])
+            resourcepartition = str(finding['Resources'][0]['Partition'])
+            compliancestatus = str(finding['Compliance']['Status'])
+            #TODO: Find which findings aren't mapped...
+            try:
+                compliancecontrols = str(finding['Compliance']['RelatedRequirements'])
+            except Exception:
+                compliancecontrols = str('[]')
+            workflowstatus = str(finding['Workflow']['Status'])
+            recordstate = str(finding['RecordState'])
+
+            # Write into Postgres
+            cursor.execute("INSERT INTO electriceye_findings( schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);", (schemaversion, findingid, awsaccountid, productarn, generatorid, types, createdat, severitylabel, confidence, title, description, resourcetype, resourceid, resourceregion, resourcepartition, compliancestatus, compliancecontrols, workflowstatus, recordstate))
+
+        # commit every batch so findings land while checks are still running
+        self.engine.commit()
+        self.count += len(findings)
+
+    def close(self):
+        # close communication with the postgres server (rds)
+        self.cursor.close()
+        self.engine.close()
+        print(f"Wrote {self.count} results to PostgreSQL")
+        return True
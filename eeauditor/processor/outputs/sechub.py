@@ -17,18 +17,62 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from collections import OrderedDict
 import boto3
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
+
+# Accounts whose Security Hub clients are kept open, findings mostly arrive one Account after another
+MAX_ACCOUNTS = 10
 
 @ElectricEyeOutput
-class SecHubProvider(object):
+class SecHubProvider(BatchedOutput):
     __provider__ = "sechub"
 
-    def write_findings(self, findings: list, **kwargs):
-        print(f"Writing {len(findings)} results to SecurityHub")
-        if findings:
-            sechub = boto3.client("securityhub")
+    def open(self, sessions=None, **kwargs):
+        """sessions is the AssumeRoleSessionCache of the audited Accounts, each Account's findings
+        are imported with its own Session. Without it every finding is imported with the default one"""
+        self.count = 0
+        self.failed = 0
+        self.sessions = sessions
+        # {awsAccountId: (boto3 Session, {region: client})} most recently used last
+        self.accounts = OrderedDict()
+
+    def get_client(self, awsAccountId, awsPartition, region):
+        account = self.accounts.pop(awsAccountId, None)
+        if account is None:
+            if self.sessions:
+                session = self.sessions.create_session(awsAccountId, awsPartition)
+            else:
+                session = boto3.Session()
+            account = (session, {})
+        self.accounts[awsAccountId] = account
+        if len(self.accounts) > MAX_ACCOUNTS:
+            self.accounts.popitem(last=False)
+        session, clients = account
+        if region not in clients:
+            clients[region] = session.client("securityhub", region_name=region)
+        return clients[region]
+
+    def write_batch(self, findings: list):
+        # findings must be imported by their own Account in the Region of their ProductArn,
+        # a multi-Account & Region run produces findings for several of them
+        findingsByTarget = {}
+        for finding in findings:
+            productArn = finding["ProductArn"].split(":")
+            target = (finding["AwsAccountId"], productArn[1], productArn[3])
+            findingsByTarget.setdefault(target, []).append(finding)
+        for (awsAccountId, awsPartition, region), targetFindings in findingsByTarget.items():
+            client = self.get_client(awsAccountId, awsPartition, region)
             # write to securityhub in batches of 100
-            for i in range(0, len(findings), 100):
-                sechub.batch_import_findings(Findings=findings[i : i + 100])
-        return
\ No newline at end of file
+            for i in range(0, len(targetFindings), 100):
+                response = client.batch_import_findings(Findings=targetFindings[i : i + 100])
+                for failed in response.get("FailedFindings", []):
+                    print(f"Failed to import finding {failed['Id']} to SecurityHub: {failed['ErrorCode']} {failed['ErrorMessage']}")
+                self.failed += response.get("FailedCount", 0)
+        self.count += len(findings)
+
+    def close(self):
+        print(f"Wrote {self.count - self.failed} results to SecurityHub")
+        if self.failed:
+            print(f"Failed to write {self.failed} results to SecurityHub")
+        return True
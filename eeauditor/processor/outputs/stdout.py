@@ -18,23 +18,21 @@
 #specific language governing permissions and limitations
 #under the License.
 import json
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
 
 @ElectricEyeOutput
-class StdoutProvider(object):
+class StdoutProvider(BatchedOutput):
     __provider__ = "stdout"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
-        checkedIds = []
+    def open(self, **kwargs):
+        self.checkedIds = set()
 
+    def write_batch(self, findings: list):
         for finding in findings:
-            parsedFinding = json.loads(json.dumps(finding))
-            if parsedFinding["Id"] not in checkedIds:
-                checkedIds.append(parsedFinding["Id"])
+            if finding["Id"] not in self.checkedIds:
+                self.checkedIds.add(finding["Id"])
                 print(json.dumps(finding,default=str))
-            else:
-                del parsedFinding
-                continue
-    
-        del checkedIds
-        return True
\ No newline at end of file
+
+    def close(self):
+        del self.checkedIds
+        return True
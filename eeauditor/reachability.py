@@ -0,0 +1,283 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import bisect
+from auditor_cache import get_shared_cache
+from security_group_index import WORLD_CIDRS, get_security_group_index, is_internet_cidr
+
+# key of the graph in the shared cache of each Account and Region
+GRAPH_CACHE_KEY = "reachability_graph"
+PROTOCOLS = ["tcp", "udp"]
+ALL_PORTS = (0, 65535)
+# return traffic of inbound connections leaves through stateless NACLs on ephemeral ports
+EPHEMERAL_PORTS = (1024, 65535)
+# protocol numbers used by NACL entries (and some Security Group rules)
+PROTOCOL_NAMES = {"6": "tcp", "17": "udp", "tcp": "tcp", "udp": "udp", "-1": "-1", "all": "-1"}
+
+def merge_ranges(ranges):
+    """Returns sorted, non overlapping (from, to) port ranges"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def intersect_ranges(left, right):
+    """Returns the ports in both lists of merged ranges"""
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start <= end:
+            result.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+def subtract_ranges(ranges, removed):
+    """Returns the ports of merged ranges which are not in merged removed"""
+    result = []
+    for start, end in ranges:
+        for removedStart, removedEnd in removed:
+            if removedEnd < start or removedStart > end:
+                continue
+            if removedStart > start:
+                result.append((start, removedStart - 1))
+            start = removedEnd + 1
+            if start > end:
+                break
+        if start <= end:
+            result.append((start, end))
+    return result
+
+def nacl_allowed_ranges(entries, protocol, egress=False, ipv6=False):
+    """Returns the port ranges a Network ACL allows for traffic from (or to) some host on the internet
+
+        Entries are evaluated in RuleNumber order, the first entry matching a port decides. Any
+        allow entry for a CIDR holding internet addresses (e.g. 0.0.0.0/1 or 52.0.0.0/8) lets some
+        internet host through, only entries for 0.0.0.0/0 (or ::/0) decide a port for every host
+        so only those shadow the entries after them. This errs on the side of reachable.
+    """
+    cidrKey = "Ipv6CidrBlock" if ipv6 else "CidrBlock"
+    allowed = []
+    decided = []
+    for entry in sorted(entries, key=lambda entry: entry["RuleNumber"]):
+        cidr = entry.get(cidrKey)
+        if entry["Egress"] != egress or not is_internet_cidr(cidr):
+            continue
+        entryProtocol = PROTOCOL_NAMES.get(str(entry["Protocol"]))
+        if entryProtocol == "-1":
+            entryRange = ALL_PORTS
+        elif entryProtocol == protocol:
+            entryRange = (entry["PortRange"]["From"], entry["PortRange"]["To"])
+        else:
+            continue
+        undecided = subtract_ranges([entryRange], decided)
+        if entry["RuleAction"] == "allow":
+            allowed.extend(undecided)
+        if cidr in WORLD_CIDRS:
+            decided = merge_ranges(decided + [entryRange])
+    return merge_ranges(allowed)
+
+def security_group_ranges(sg_index, group_ids, protocol, ipv6=False):
+    """Returns the port ranges any of the Security Groups allows from sources which may hold internet hosts"""
+    ranges = []
+    for groupId in group_ids:
+        for ipProtocol, fromPort, toPort in sg_index.internet_open_ranges(groupId, ipv6=ipv6):
+            ipProtocol = PROTOCOL_NAMES.get(ipProtocol)
+            if ipProtocol == "-1":
+                ranges.append(ALL_PORTS)
+            elif ipProtocol == protocol:
+                ranges.append((fromPort, toPort))
+    return merge_ranges(ranges)
+
+class InterfaceReachability(object):
+    """The ports of one ENI reachable from anywhere on the internet, resolved when the graph is built"""
+
+    def __init__(self, interface, ranges):
+        self.networkInterfaceId = interface["NetworkInterfaceId"]
+        self.vpcId = interface.get("VpcId")
+        self.subnetId = interface.get("SubnetId")
+        self.instanceId = interface.get("Attachment", {}).get("InstanceId")
+        self.publicIp = interface.get("Association", {}).get("PublicIp")
+        # {protocol: merged (from, to) ranges} and their start ports for bisect lookups
+        self.ranges = ranges
+        self._starts = {protocol: [start for start, end in ranges[protocol]] for protocol in ranges}
+
+    def is_reachable(self, port, protocol="tcp"):
+        ranges = self.ranges.get(protocol)
+        if not ranges:
+            return False
+        position = bisect.bisect_right(self._starts[protocol], port) - 1
+        return position >= 0 and ranges[position][1] >= port
+
+    @property
+    def exposed(self):
+        return any(self.ranges.values())
+
+class ReachabilityGraph(object):
+    """Internet reachability of every ENI of an Account and Region
+
+        Route tables, Network ACLs, Internet Gateways and ENIs are loaded once and linked per
+        VPC: an ENI is reachable on a port when it has a public address, the route table of its
+        subnet has a route for internet addresses to anything but the VPC itself (an Internet
+        Gateway, or a firewall or Gateway Load Balancer endpoint with ingress routing), its
+        subnet's NACL allows the port in and ephemeral ports out, and one of its Security
+        Groups allows the port from a public CIDR or a Prefix List. Every rule which could
+        let an internet host in counts, so an ENI is only unreachable when no host can be.
+        The reachable ports of every ENI are resolved up front so queries never call an API.
+    """
+
+    def __init__(self, interfaces, route_tables, network_acls, internet_gateways, sg_index):
+        # {VpcId: {"subnetRouteTables", "mainRouteTable", "subnetNacls", "internetGateways"}}
+        self.vpcs = {}
+        for routeTable in route_tables:
+            vpc = self._vpc(routeTable["VpcId"])
+            for association in routeTable.get("Associations", []):
+                if association.get("Main"):
+                    vpc["mainRouteTable"] = routeTable
+                elif association.get("SubnetId"):
+                    vpc["subnetRouteTables"][association["SubnetId"]] = routeTable
+        for networkAcl in network_acls:
+            vpc = self._vpc(networkAcl["VpcId"])
+            for association in networkAcl.get("Associations", []):
+                vpc["subnetNacls"][association["SubnetId"]] = networkAcl
+        for internetGateway in internet_gateways:
+            for attachment in internetGateway.get("Attachments", []):
+                self._vpc(attachment["VpcId"])["internetGateways"].add(internetGateway["InternetGatewayId"])
+
+        self.interfaces = {}
+        self.instanceInterfaces = {}
+        for interface in interfaces:
+            node = InterfaceReachability(interface, self._resolve(interface, sg_index))
+            self.interfaces[node.networkInterfaceId] = node
+            if node.instanceId:
+                self.instanceInterfaces.setdefault(node.instanceId, []).append(node)
+
+    def _vpc(self, vpc_id):
+        if vpc_id not in self.vpcs:
+            self.vpcs[vpc_id] = {
+                "subnetRouteTables": {},
+                "mainRouteTable": None,
+                "subnetNacls": {},
+                "internetGateways": set(),
+            }
+        return self.vpcs[vpc_id]
+
+    def _routes_to_internet(self, vpc, subnet_id, ipv6=False):
+        routeTable = vpc["subnetRouteTables"].get(subnet_id) or vpc["mainRouteTable"]
+        if not routeTable:
+            return False
+        for route in routeTable.get("Routes", []):
+            destination = route.get("DestinationIpv6CidrBlock") if ipv6 else route.get("DestinationCidrBlock")
+            if (
+                (is_internet_cidr(destination) or route.get("DestinationPrefixListId"))
+                and route.get("GatewayId") != "local"
+                and route.get("State", "active") == "active"
+            ):
+                return True
+        return False
+
+    def _resolve(self, interface, sg_index):
+        """Returns {protocol: port ranges} reachable from the internet for an ENI"""
+        ranges = {protocol: [] for protocol in PROTOCOLS}
+        vpc = self.vpcs.get(interface.get("VpcId"))
+        if vpc is None:
+            return ranges
+        subnetId = interface.get("SubnetId")
+        networkAcl = vpc["subnetNacls"].get(subnetId)
+        entries = networkAcl["Entries"] if networkAcl else []
+        groupIds = [group["GroupId"] for group in interface.get("Groups", [])]
+        families = []
+        if interface.get("Association", {}).get("PublicIp"):
+            families.append(False)
+        if interface.get("Ipv6Addresses"):
+            families.append(True)
+        for ipv6 in families:
+            if not self._routes_to_internet(vpc, subnetId, ipv6):
+                continue
+            for protocol in PROTOCOLS:
+                # replies to the internet need at least part of the ephemeral range allowed out
+                if not intersect_ranges(
+                    nacl_allowed_ranges(entries, protocol, egress=True, ipv6=ipv6), [EPHEMERAL_PORTS]
+                ):
+                    continue
+                reachable = intersect_ranges(
+                    nacl_allowed_ranges(entries, protocol, ipv6=ipv6),
+                    security_group_ranges(sg_index, groupIds, protocol, ipv6=ipv6),
+                )
+                ranges[protocol] = merge_ranges(ranges[protocol] + reachable)
+        return ranges
+
+    @classmethod
+    def collect(cls, ec2, sg_index):
+        def paginate(operation, key):
+            items = []
+            for page in ec2.get_paginator(operation).paginate():
+                items.extend(page[key])
+            return items
+
+        return cls(
+            interfaces=paginate("describe_network_interfaces", "NetworkInterfaces"),
+            route_tables=paginate("describe_route_tables", "RouteTables"),
+            network_acls=paginate("describe_network_acls", "NetworkAcls"),
+            internet_gateways=paginate("describe_internet_gateways", "InternetGateways"),
+            sg_index=sg_index,
+        )
+
+    def is_reachable(self, network_interface_id, port, protocol="tcp"):
+        """Returns True if the ENI may be reachable from the internet on port"""
+        interface = self.interfaces.get(network_interface_id)
+        return interface is not None and interface.is_reachable(port, protocol)
+
+    def interfaces_for_instance(self, instance_id):
+        return self.instanceInterfaces.get(instance_id, [])
+
+    def is_instance_unreachable(self, instance_id, ports, protocol="tcp"):
+        """Returns True only if every ENI of the instance is known and none is reachable on any of the ports"""
+        interfaces = self.interfaces_for_instance(instance_id)
+        return bool(interfaces) and not any(
+            interface.is_reachable(port, protocol) for interface in interfaces for port in ports
+        )
+
+    def is_instance_reachable(self, instance_id, ports, protocol="tcp"):
+        """Returns True if any ENI of the instance is reachable on any of the ports"""
+        return any(
+            interface.is_reachable(port, protocol)
+            for interface in self.interfaces_for_instance(instance_id)
+            for port in ports
+        )
+
+    def exposed_interfaces(self, port, protocol="tcp"):
+        """Returns every ENI reachable from the internet on port"""
+        return [interface for interface in self.interfaces.values() if interface.is_reachable(port, protocol)]
+
+def get_reachability_graph(cache, ec2):
+    """Returns the ReachabilityGraph of the Account and Region, shared by every Auditor"""
+    sharedCache = get_shared_cache(cache)
+    graph = sharedCache.get(GRAPH_CACHE_KEY)
+    if graph is None:
+        graph = ReachabilityGraph.collect(ec2, get_security_group_index(cache, ec2))
+        sharedCache[GRAPH_CACHE_KEY] = graph
+    return graph
@@ -0,0 +1,96 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from functools import lru_cache
+import inspect
+import threading
+import botocore.session
+from botocore.exceptions import UnknownServiceError
+from aws_clients import RoutedClient
+
+# botocore bundles the endpoint data of every service and Partition, reading it
+# replaces a paginated SSM Parameter Store lookup per service on every run
+_session = botocore.session.get_session()
+_lock = threading.Lock()
+# services whose bundled endpoint data misses Regions they are served in, their endpoints are
+# resolved from endpoint rulesets instead so their checks are never skipped
+INCOMPLETE_ENDPOINT_DATA = ["managedblockchain"]
+
+@lru_cache(maxsize=None)
+def get_service_regions(service_name, awsPartition="aws"):
+    """Returns the set of Regions a service is available in, or None if it cannot be determined
+
+        None is returned for global services (IAM, Health, Shield...) and for registry keys
+        which are not AWS services (e.g. shodan) so that their checks are never skipped
+    """
+    # botocore Sessions are not thread safe, loading data is only done once per service
+    with _lock:
+        try:
+            serviceData = _session.get_service_data(service_name)
+        except UnknownServiceError:
+            return None
+        endpointPrefix = serviceData["metadata"].get("endpointPrefix", service_name)
+        for partition in _session.get_data("endpoints")["partitions"]:
+            if partition["partition"] == awsPartition:
+                break
+        else:
+            return None
+
+    if service_name in INCOMPLETE_ENDPOINT_DATA:
+        return None
+    service = partition["services"].get(endpointPrefix)
+    if service is None or service.get("isRegionalized", True) is False:
+        return None
+    regions = set(service["endpoints"]).intersection(partition["regions"])
+    if not regions:
+        return None
+    return regions
+
+def is_service_available(service_name, awsRegion, awsPartition="aws"):
+    """Returns False only when the service is known not to be available in the Region"""
+    regions = get_service_regions(service_name, awsPartition)
+    return regions is None or awsRegion in regions
+
+def get_client_services(check):
+    """Returns the services of the clients the Auditor module of a check binds which follow the Region of the check"""
+    return {
+        value._service_name for value in getattr(inspect.unwrap(check), "__globals__", {}).values()
+        # clients pinned to a Region (e.g. Shield's us-east-1 client) work from every Region
+        if isinstance(value, RoutedClient) and value._region_name is None
+    }
+
+def get_check_service(service_name, check):
+    """Returns the service whose availability decides if a check can run, None when it cannot be told
+
+        The registry key of a check is not always the service it calls, e.g. the CloudHSM
+        Auditor registers its checks as cloudhsm but calls cloudhsmv2, so the key is only used
+        when the Auditor has a client for it, otherwise the Auditor's only regional client is
+        used, and None is returned when there are several
+    """
+    clientServices = get_client_services(check)
+    if service_name in clientServices:
+        return service_name
+    if len(clientServices) == 1:
+        return next(iter(clientServices))
+    return None
+
+def is_check_available(service_name, check, awsRegion, awsPartition="aws"):
+    """Returns False only when the service a check calls is known not to be available in the Region"""
+    checkService = get_check_service(service_name, check)
+    return checkService is None or is_service_available(checkService, awsRegion, awsPartition)
@@ -0,0 +1,195 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import contextvars
+import csv
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# error codes botocore treats as throttling, see botocore.retries.standard
+THROTTLING_ERROR_CODES = [
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "TransactionInProgressException",
+    "RequestLimitExceeded",
+    "BandwidthLimitExceeded",
+    "LimitExceededException",
+    "RequestThrottled",
+    "SlowDown",
+    "PriorRequestNotComplete",
+    "EC2ThrottledException",
+]
+RUN_REPORT_FORMATS = ["json", "csv"]
+# number of checks printed in the summary at the end of a run
+DEFAULT_REPORT_TOP = 10
+
+# the check the current thread is running, API calls are attributed to it. A context variable
+# so pools started by a check carry it over with aws_clients.run_in_context()
+_activeCheck = contextvars.ContextVar("activeCheck", default=None)
+
+class CheckStats(object):
+    """Timing and API usage of one check against one Account and Region"""
+
+    def __init__(self, check_name, module_name, awsAccountId, awsRegion):
+        self.check_name = check_name
+        self.module_name = module_name
+        self.awsAccountId = awsAccountId
+        self.awsRegion = awsRegion
+        self.wall_time = 0.0
+        self.api_calls = {}
+        self.retries = 0
+        self.throttles = 0
+        self.bytes_received = 0
+        self.findings = 0
+
+    def to_dict(self):
+        return {
+            "CheckName": self.check_name,
+            "Auditor": self.module_name,
+            "AwsAccountId": self.awsAccountId,
+            "AwsRegion": self.awsRegion,
+            "WallTimeSeconds": round(self.wall_time, 3),
+            "ApiCalls": sum(self.api_calls.values()),
+            "ApiCallsByOperation": dict(sorted(self.api_calls.items())),
+            "Retries": self.retries,
+            "Throttles": self.throttles,
+            "BytesReceived": self.bytes_received,
+            "Findings": self.findings,
+        }
+
+class RunReport(object):
+    """Records per check wall time and AWS API usage through botocore's event system
+
+        instrument() is registered as a client hook of the RoutingSession so every Auditor
+        client reports its API calls, they are attributed to the check running on the
+        calling thread with measure()
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, client):
+        """Registers event handlers on a botocore client"""
+        client.meta.events.register("after-call", self._after_call)
+        client.meta.events.register("needs-retry", self._needs_retry)
+
+    def _active(self):
+        return _activeCheck.get()
+
+    def _after_call(self, http_response=None, parsed=None, model=None, **kwargs):
+        stats = self._active()
+        if stats is None:
+            return
+        operation = f"{model.service_model.service_name}:{model.name}"
+        received = 0
+        if http_response is not None:
+            contentLength = http_response.headers.get("content-length")
+            if contentLength:
+                received = int(contentLength)
+            elif http_response.raw is not None and not model.has_streaming_output:
+                # the body of non streaming responses has already been read to parse it,
+                # stubbed responses have no body at all
+                received = len(http_response.content or b"")
+        retries = (parsed or {}).get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        with self._lock:
+            stats.api_calls[operation] = stats.api_calls.get(operation, 0) + 1
+            stats.retries += retries
+            stats.bytes_received += received
+
+    def _needs_retry(self, response=None, **kwargs):
+        # fired after every attempt, only observe, the retry handler decides
+        stats = self._active()
+        if stats is None or not response:
+            return
+        errorCode = response[1].get("Error", {}).get("Code")
+        if errorCode in THROTTLING_ERROR_CODES:
+            with self._lock:
+                stats.throttles += 1
+
+    def get_stats(self, check_name, module_name, awsAccountId, awsRegion):
+        key = (check_name, awsAccountId, awsRegion)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = CheckStats(check_name, module_name, awsAccountId, awsRegion)
+            return self._stats[key]
+
+    @contextmanager
+    def measure(self, stats):
+        """Attributes time spent and API calls made by the current thread to stats"""
+        previous = self._active()
+        _activeCheck.set(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            elapsed = time.perf_counter() - start
+            _activeCheck.set(previous)
+            with self._lock:
+                stats.wall_time += elapsed
+
+    def add_finding(self, stats):
+        with self._lock:
+            stats.findings += 1
+
+    def rows(self):
+        """Returns every check as a dict, slowest first"""
+        with self._lock:
+            rows = [stats.to_dict() for stats in self._stats.values()]
+        return sorted(rows, key=lambda row: row["WallTimeSeconds"], reverse=True)
+
+    def write(self, output_file, report_format="json"):
+        """Writes the report next to the outputs as {output_file}-run-report.json or .csv"""
+        rows = self.rows()
+        fileName = f"{output_file}-run-report.{report_format}"
+        if report_format == "csv":
+            with open(fileName, "w", newline="") as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=list(CheckStats("", "", "", "").to_dict().keys()))
+                writer.writeheader()
+                for row in rows:
+                    row["ApiCallsByOperation"] = ";".join(
+                        f"{operation}={count}" for operation, count in row["ApiCallsByOperation"].items()
+                    )
+                    writer.writerow(row)
+        else:
+            with open(fileName, "w") as jsonfile:
+                json.dump(rows, jsonfile, indent=2)
+        print(f"Wrote run report for {len(rows)} checks to {fileName}")
+        return fileName
+
+    def print_summary(self, top=DEFAULT_REPORT_TOP):
+        rows = self.rows()
+        if not rows:
+            return
+        totalTime = sum(row["WallTimeSeconds"] for row in rows)
+        totalCalls = sum(row["ApiCalls"] for row in rows)
+        totalThrottles = sum(row["Throttles"] for row in rows)
+        print(f"Ran {len(rows)} checks in {totalTime:.1f}s of check time with {totalCalls} API calls and {totalThrottles} throttles")
+        print(f"Top {min(top, len(rows))} slowest checks:")
+        for row in rows[:top]:
+            print(
+                f"  {row['WallTimeSeconds']:>8.2f}s  {row['ApiCalls']:>6} calls  {row['Throttles']:>4} throttles  "
+                f"{row['CheckName']} ({row['AwsAccountId']} {row['AwsRegion']})"
+            )
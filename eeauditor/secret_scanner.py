@@ -0,0 +1,222 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from detect_secrets.core.plugins.util import get_mapping_from_secret_type_to_class
+from detect_secrets.__version__ import VERSION as DETECT_SECRETS_VERSION
+# the line based scan of detect-secrets' own file scanning, private so requirements.txt pins the tested minor version
+from detect_secrets.core.scan import _process_line_based_plugins
+from detect_secrets.settings import cache_bust, configure_settings_from_baseline
+
+# number of payloads sent to a worker process at a time, smaller workloads are scanned in-process
+DEFAULT_SCAN_BATCH_SIZE = 250
+DEFAULT_SCAN_WORKERS = min(4, os.cpu_count() or 1)
+# payloads are scanned as if they were a JSON file, the name is only seen by filename based filters
+PAYLOAD_FILENAME = "payload.json"
+# lines with only JSON punctuation such as "[" or "}," cannot hold a secret and are not scanned
+PUNCTUATION_LINE = re.compile(r"^[\s\[\]{},:]*$")
+# verdicts of previous runs, keyed by the hash of the scanned payload
+DEFAULT_SCAN_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".electriceye", "secrets-scan-cache.json")
+DEFAULT_SCAN_CACHE_SIZE = 100000
+# bump when the way payloads are scanned changes so prior verdicts are discarded
+SCAN_CACHE_VERSION = f"1/detect-secrets-{DETECT_SECRETS_VERSION}"
+
+_configured = False
+_configureLock = threading.Lock()
+# ScanCache used by scan_payloads, set by configure_scan_cache()
+_scanCache = None
+
+class ScanCache(object):
+    """Persistent verdicts of previous secret scans
+
+        Keyed by the SHA-256 of each scanned payload, only the detected secret types are kept so
+        the file never holds a secret. Verdicts of another detect-secrets version are discarded,
+        when the cache is over max_size the least recently used verdicts are evicted on save.
+        With rescan_all prior verdicts are ignored but the fresh ones are still saved.
+    """
+
+    def __init__(self, path=DEFAULT_SCAN_CACHE_FILE, max_size=DEFAULT_SCAN_CACHE_SIZE, rescan_all=False):
+        self.path = path
+        self.max_size = max_size
+        self.rescan_all = rescan_all
+        self.hits = 0
+        self.misses = 0
+        # {payload hash: [secret types, last used epoch]}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._now = int(time.time())
+        # only runs which scanned something rewrite the file
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as cacheFile:
+                data = json.load(cacheFile)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Failed to read the secrets scan cache {self.path}, it will be rebuilt: {e}")
+            return
+        if data.get("version") == SCAN_CACHE_VERSION:
+            self._entries = data.get("entries", {})
+
+    @staticmethod
+    def payload_hash(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text):
+        """Returns the secret types found in text by a previous run, None if it has to be scanned"""
+        key = self.payload_hash(text)
+        with self._lock:
+            entry = None if self.rescan_all else self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry[1] = self._now
+            self._dirty = True
+            return entry[0]
+
+    def put(self, text, secret_types):
+        with self._lock:
+            self._entries[self.payload_hash(text)] = [secret_types, self._now]
+            self._dirty = True
+
+    def save(self):
+        """Writes the cache back to disk, keeping the max_size most recently used verdicts"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            entries = self._entries
+            if len(entries) > self.max_size:
+                keep = sorted(entries, key=lambda key: entries[key][1], reverse=True)[: self.max_size]
+                entries = {key: entries[key] for key in keep}
+                self._entries = entries
+            data = {"version": SCAN_CACHE_VERSION, "entries": entries}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # write to a temporary file first so a crashed run never leaves a truncated cache
+            tempPath = f"{self.path}.{os.getpid()}.tmp"
+            with open(tempPath, "w") as cacheFile:
+                json.dump(data, cacheFile)
+            os.replace(tempPath, self.path)
+        except OSError as e:
+            print(f"Failed to write the secrets scan cache {self.path}: {e}")
+
+def configure_scan_cache(path=DEFAULT_SCAN_CACHE_FILE, max_size=DEFAULT_SCAN_CACHE_SIZE, rescan_all=False):
+    """Makes scan_payloads reuse and record verdicts in a persistent ScanCache, None path disables it"""
+    global _scanCache
+    _scanCache = ScanCache(path, max_size, rescan_all) if path else None
+    return _scanCache
+
+def get_scan_cache():
+    return _scanCache
+
+def configure_detect_secrets():
+    """Enables every detect-secrets plugin with the default filters, as `detect-secrets scan` does
+
+        detect-secrets keeps its settings in a process wide singleton, they are configured
+        once per process (and once in every worker process of the pool)
+    """
+    global _configured
+    with _configureLock:
+        if _configured:
+            return
+        cache_bust()
+        configure_settings_from_baseline({
+            "plugins_used": [
+                {"name": pluginType.__name__}
+                for pluginType in get_mapping_from_secret_type_to_class().values()
+            ]
+        })
+        _configured = True
+
+def serialize_payload(payload):
+    """Returns the text a payload is scanned as, the same JSON the detect-secrets CLI used to read from disk"""
+    return json.dumps(payload, indent=2, default=str)
+
+def scan_text(text):
+    """Returns the type of every potential secret in text, in the order of the lines they were found on"""
+    configure_detect_secrets()
+    lines = [
+        (lineNumber, line) for lineNumber, line in enumerate(text.splitlines(), start=1)
+        if not PUNCTUATION_LINE.match(line)
+    ]
+    secrets = sorted(
+        _process_line_based_plugins(lines=lines, filename=PAYLOAD_FILENAME),
+        key=lambda secret: (secret.line_number, secret.type)
+    )
+    return [secret.type for secret in secrets]
+
+def scan_payload(payload):
+    """Returns the type of every potential secret in a JSON serializable payload"""
+    return scan_text(serialize_payload(payload))
+
+def _scan_batch(texts):
+    return [(text, scan_text(text)) for text in texts]
+
+def scan_payloads(payloads, workers=DEFAULT_SCAN_WORKERS, batch_size=DEFAULT_SCAN_BATCH_SIZE):
+    """Scans (key, payload) pairs in batches and returns {key: [secret types]}
+
+        Payloads are scanned in memory with the detect-secrets plugins, identical payloads
+        (e.g. revisions of a task definition) are only scanned once and payloads with a verdict
+        in the ScanCache are not scanned at all. Batches are spread across a pool of worker
+        processes as the plugins are CPU bound regular expressions.
+    """
+    payloadTexts = [(key, serialize_payload(payload)) for key, payload in payloads]
+    scanCache = _scanCache
+    cached = {}
+    texts = []
+    for text in dict.fromkeys(text for key, text in payloadTexts):
+        secretTypes = scanCache.get(text) if scanCache is not None else None
+        if secretTypes is None:
+            texts.append(text)
+        else:
+            cached[text] = secretTypes
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = {}
+    if workers > 1 and len(batches) > 1:
+        try:
+            # worker processes are spawned, forking the threads running other checks is not safe
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(batches)), mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                for batchResults in pool.map(_scan_batch, batches):
+                    results.update(batchResults)
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Failed to start secret scanning workers, scanning in-process: {e}")
+            results = {}
+    for batch in batches:
+        if batch[0] not in results:
+            results.update(_scan_batch(batch))
+    if scanCache is not None:
+        for text, secretTypes in results.items():
+            scanCache.put(text, secretTypes)
+    results.update(cached)
+    return {key: results[text] for key, text in payloadTexts}
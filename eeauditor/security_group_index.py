@@ -0,0 +1,136 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import ipaddress
+from auditor_cache import get_shared_cache
+
+WORLD_CIDRS = ["0.0.0.0/0", "::/0"]
+# addresses no internet host can have, any other source may include internet hosts
+PRIVATE_NETWORKS = [
+    ipaddress.ip_network(network) for network in (
+        "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "100.64.0.0/10", "127.0.0.0/8", "169.254.0.0/16",
+        "fc00::/7", "fe80::/10", "::1/128"
+    )
+]
+
+def is_internet_cidr(cidr):
+    """Returns True unless a CIDR only holds private addresses, e.g. 0.0.0.0/1 or 52.0.0.0/8 do hold internet hosts"""
+    try:
+        network = ipaddress.ip_network(cidr, strict=False)
+    except (TypeError, ValueError):
+        return False
+    return not any(
+        network.version == private.version and network.subnet_of(private) for private in PRIVATE_NETWORKS
+    )
+# key of the index in the shared cache of each Account and Region
+INDEX_CACHE_KEY = "security_group_rule_index"
+
+class SecurityGroupRuleIndex(object):
+    """Every Security Group rule of an Account and Region, indexed by Security Group ID
+
+        Built from a single paginated DescribeSecurityGroupRules so Auditors answer "is port
+        X open to the world" from memory instead of calling the API for every resource
+    """
+
+    def __init__(self, rules):
+        self._rules = {}
+        # (IpProtocol, FromPort, ToPort, is IPv6) of the ingress rules open to the world per group
+        self._worldOpen = {}
+        # (IpProtocol, FromPort, ToPort, is IPv6 or None for both) of the ingress rules from any
+        # source which may hold internet hosts: public CIDRs and Prefix Lists
+        self._internetOpen = {}
+        for rule in rules:
+            groupId = rule["GroupId"]
+            self._rules.setdefault(groupId, []).append(rule)
+            if rule.get("IsEgress"):
+                continue
+            if rule.get("CidrIpv4") in WORLD_CIDRS or rule.get("CidrIpv6") in WORLD_CIDRS:
+                self._worldOpen.setdefault(groupId, []).append(
+                    (
+                        str(rule["IpProtocol"]),
+                        rule.get("FromPort", -1),
+                        rule.get("ToPort", -1),
+                        rule.get("CidrIpv6") in WORLD_CIDRS,
+                    )
+                )
+            # Prefix Lists may hold addresses of either family
+            if rule.get("PrefixListId"):
+                ruleIpv6 = None
+            elif is_internet_cidr(rule.get("CidrIpv4")):
+                ruleIpv6 = False
+            elif is_internet_cidr(rule.get("CidrIpv6")):
+                ruleIpv6 = True
+            else:
+                # private sources and other Security Groups
+                continue
+            self._internetOpen.setdefault(groupId, []).append(
+                (str(rule["IpProtocol"]), rule.get("FromPort", -1), rule.get("ToPort", -1), ruleIpv6)
+            )
+
+    @classmethod
+    def collect(cls, ec2):
+        rules = []
+        for page in ec2.get_paginator("describe_security_group_rules").paginate():
+            rules.extend(page["SecurityGroupRules"])
+        return cls(rules)
+
+    def rules(self, group_id):
+        """Returns the ingress and egress rules of a Security Group as returned by DescribeSecurityGroupRules"""
+        return self._rules.get(group_id, [])
+
+    def world_open_ranges(self, group_id, ipv6=False):
+        """Returns (IpProtocol, FromPort, ToPort) of the ingress rules of a group open to 0.0.0.0/0, or ::/0 when ipv6"""
+        return [
+            (ipProtocol, fromPort, toPort)
+            for ipProtocol, fromPort, toPort, ruleIpv6 in self._worldOpen.get(group_id, [])
+            if ruleIpv6 == ipv6
+        ]
+
+    def internet_open_ranges(self, group_id, ipv6=False):
+        """Returns (IpProtocol, FromPort, ToPort) of the ingress rules of a group from sources which may hold internet hosts"""
+        return [
+            (ipProtocol, fromPort, toPort)
+            for ipProtocol, fromPort, toPort, ruleIpv6 in self._internetOpen.get(group_id, [])
+            if ruleIpv6 is None or ruleIpv6 == ipv6
+        ]
+
+    def is_open_to_world(self, group_ids, port, protocol="tcp"):
+        """Returns True if any of the Security Groups allows port from 0.0.0.0/0 or ::/0"""
+        if isinstance(group_ids, str):
+            group_ids = [group_ids]
+        for groupId in group_ids:
+            for ipProtocol, fromPort, toPort, ipv6 in self._worldOpen.get(groupId, []):
+                # protocol -1 is every protocol and every port
+                if ipProtocol == "-1":
+                    return True
+                if ipProtocol == protocol and fromPort <= port <= toPort:
+                    return True
+        return False
+
+def get_security_group_index(cache, ec2):
+    """Returns the SecurityGroupRuleIndex of the Account and Region, shared by every Auditor
+
+        Two checks racing to build it may both call the API once, the result is the same
+    """
+    sharedCache = get_shared_cache(cache)
+    index = sharedCache.get(INDEX_CACHE_KEY)
+    if index is None:
+        index = SecurityGroupRuleIndex.collect(ec2)
+        sharedCache[INDEX_CACHE_KEY] = index
+    return index
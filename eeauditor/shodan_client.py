@@ -0,0 +1,218 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from aws_clients import run_in_context
+
+SHODAN_HOST_URL = "https://api.shodan.io/shodan/host/"
+# response of the host API for an IP Shodan never indexed
+SHODAN_NOT_INDEXED = {"error": "No information available for that IP."}
+# queries per second allowed by the Shodan API plan, override with SHODAN_QPS
+DEFAULT_SHODAN_QPS = 1.0
+# lookups running at the same time and size of the HTTP connection pool, raised to the number
+# of check workers by configure_shodan_workers()
+DEFAULT_SHODAN_WORKERS = 4
+# how long host responses are reused within and across runs, override with SHODAN_CACHE_TTL_HOURS
+DEFAULT_SHODAN_CACHE_TTL_HOURS = 24
+DEFAULT_SHODAN_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".electriceye", "shodan-cache.json")
+
+# workers of the ShodanClients returned by from_environment(), set by configure_shodan_workers()
+_shodanWorkers = DEFAULT_SHODAN_WORKERS
+_shodanClients = []
+
+class TokenBucket(object):
+    """Thread safe token bucket, acquire() blocks until a token is available"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class ShodanClient(object):
+    """Shodan host API client shared by every Shodan check
+
+        Requests go through one keep-alive Session sized for the worker pool and are limited
+        to qps by a token bucket. Host responses are kept for ttl seconds in memory and in
+        cache_file so an IP seen by several checks, Regions or runs is only looked up once.
+        Only indexed and never indexed responses are cached, errors such as rate limiting
+        are retried by the next lookup.
+    """
+
+    def __init__(self, api_key, qps=DEFAULT_SHODAN_QPS, workers=DEFAULT_SHODAN_WORKERS, ttl=DEFAULT_SHODAN_CACHE_TTL_HOURS * 3600, cache_file=DEFAULT_SHODAN_CACHE_FILE, session=None):
+        self.api_key = api_key
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.bucket = TokenBucket(qps)
+        # the connection pool is only sized when the Session is our own
+        self._ownsSession = session is None
+        self.session = session or requests.Session()
+        self.resize(workers)
+        # {ip: [epoch, response]}
+        self._hosts = {}
+        # {hostname: ip}, resolved once per run
+        self._addresses = {}
+        # set when a lookup was cached since the last save()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+        # lookups made outside prefetch() are written when the run ends
+        atexit.register(self.save)
+
+    def resize(self, workers):
+        """Sizes the prefetch pool and the HTTP connection pool for workers lookups at the same time"""
+        self.workers = max(1, workers)
+        if self._ownsSession:
+            self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.workers))
+
+    @classmethod
+    def from_environment(cls, api_key):
+        """Returns a ShodanClient using the SHODAN_QPS and SHODAN_CACHE_TTL_HOURS environment variables
+
+            Its pools follow the number of check workers given to configure_shodan_workers()
+        """
+        client = cls(
+            api_key,
+            qps=float(os.environ.get("SHODAN_QPS", DEFAULT_SHODAN_QPS)),
+            workers=_shodanWorkers,
+            ttl=float(os.environ.get("SHODAN_CACHE_TTL_HOURS", DEFAULT_SHODAN_CACHE_TTL_HOURS)) * 3600
+        )
+        _shodanClients.append(client)
+        return client
+
+    def _load(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file) as cacheFile:
+                hosts = json.load(cacheFile)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Failed to read the Shodan cache {self.cache_file}, it will be rebuilt: {e}")
+            return
+        now = time.time()
+        self._hosts = {ip: entry for ip, entry in hosts.items() if now - entry[0] < self.ttl}
+
+    def save(self):
+        """Writes the unexpired host responses to cache_file when lookups were cached since the last save"""
+        if not self.cache_file:
+            return
+        now = time.time()
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            hosts = {ip: entry for ip, entry in self._hosts.items() if now - entry[0] < self.ttl}
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            tempPath = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tempPath, "w") as cacheFile:
+                json.dump(hosts, cacheFile)
+            os.replace(tempPath, self.cache_file)
+        except OSError as e:
+            print(f"Failed to write the Shodan cache {self.cache_file}: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def _cached(self, ip):
+        with self._lock:
+            entry = self._hosts.get(ip)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def _fetch(self, ip):
+        self.bucket.acquire()
+        r = self.session.get(url=SHODAN_HOST_URL + ip, params={"key": self.api_key}, timeout=30)
+        data = r.json()
+        # 404 is how Shodan answers for an IP it never indexed
+        if r.status_code in (200, 404):
+            with self._lock:
+                self._hosts[ip] = [time.time(), data]
+                self._dirty = True
+        return data
+
+    def host(self, ip):
+        """Returns the Shodan host API response for an IP, from the cache when it is fresh"""
+        data = self._cached(ip)
+        if data is None:
+            data = self._fetch(ip)
+        return data
+
+    def resolve(self, hostname):
+        """Returns the IPv4 address of a hostname, resolved once per run"""
+        with self._lock:
+            ip = self._addresses.get(hostname)
+        if ip is None:
+            ip = socket.gethostbyname(hostname)
+            with self._lock:
+                self._addresses[hostname] = ip
+        return ip
+
+    def _prefetch_one(self, ip=None, hostname=None):
+        try:
+            if hostname is not None:
+                ip = self.resolve(hostname)
+            if self._cached(ip) is None:
+                self._fetch(ip)
+        except Exception as e:
+            # host() and resolve() raise again when the check asks for it
+            print(f"Failed to prefetch Shodan data for {hostname or ip}: {e}")
+
+    def prefetch(self, ips=(), hostnames=()):
+        """Resolves hostnames and looks up IPs on the worker pool so the checks read them from the cache"""
+        tasks = [{"hostname": hostname} for hostname in dict.fromkeys(hostnames)]
+        tasks.extend({"ip": ip} for ip in dict.fromkeys(ips) if self._cached(ip) is None)
+        if not tasks:
+            return
+        # lookups are attributed to the check prefetching them
+        prefetchOne = run_in_context(self._prefetch_one)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shodan") as pool:
+            for task in tasks:
+                pool.submit(prefetchOne, **task)
+        self.save()
+
+def configure_shodan_workers(workers):
+    """Sizes the pools of the ShodanClients from from_environment() for workers checks running at once"""
+    global _shodanWorkers
+    _shodanWorkers = max(DEFAULT_SHODAN_WORKERS, workers)
+    for client in _shodanClients:
+        client.resize(_shodanWorkers)
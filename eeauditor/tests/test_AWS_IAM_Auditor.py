@@ -26,10 +26,13 @@ from botocore.stub import Stubber, ANY
 
 from . import context
 from auditors.aws.AWS_IAM_Auditor import (
-    iam_mngd_policy_least_priv_check,
+    iam_access_key_age_check,
+    iam_created_managed_policy_least_priv_check,
     iam_user_policy_least_priv_check,
     iam_group_policy_least_priv_check,
     iam_role_policy_least_priv_check,
+    user_direct_attached_policy_check,
+    user_mfa_check,
     iam
 )
 
@@ -177,18 +180,6 @@ get_policy_action_list_resource = {
     }
 }
 
-list_user_policies = {'PolicyNames': [
-    'example-inline']
-}
-
-list_group_policies = {'PolicyNames': [
-    'example-inline']
-}
-
-list_role_policies = {'PolicyNames': [
-    'example-inline']
-}
-
 get_user_policy_star_star = {
     'UserName': 'example-user1',
     'PolicyName': 'example-inline',
@@ -280,6 +271,67 @@ get_role_policy_list_list_resource = {
     }
 
 
+credential_report = (
+    "user,arn,user_creation_time,password_enabled,password_last_used,password_last_changed,"
+    "password_next_rotation,mfa_active,access_key_1_active,access_key_1_last_rotated,"
+    "access_key_1_last_used_date,access_key_1_last_used_region,access_key_1_last_used_service,"
+    "access_key_2_active,access_key_2_last_rotated,access_key_2_last_used_date,"
+    "access_key_2_last_used_region,access_key_2_last_used_service,cert_1_active,"
+    "cert_1_last_rotated,cert_2_active,cert_2_last_rotated\n"
+    "example-user1,arn:aws:iam::805574742241:user/example-user1,2020-09-03T11:23:13+00:00,"
+    "{password_enabled},2021-05-09T01:25:01+00:00,N/A,N/A,{mfa_active},{access_key_active},N/A,N/A,N/A,N/A,"
+    "false,N/A,N/A,N/A,N/A,false,N/A,false,N/A\n"
+)
+
+def managed_policy_details(policy_version):
+    policy = dict(list_policies["Policies"][0])
+    policy["PolicyVersionList"] = [
+        {
+            "Document": policy_version["PolicyVersion"]["Document"],
+            "VersionId": "v1",
+            "IsDefaultVersion": True
+        }
+    ]
+    return {"Policies": [policy], "IsTruncated": False}
+
+def user_inline_policy_details(user_policy, attached_policies=None):
+    # UserDetailList carries no PasswordLastUsed, passwords come from the credential report
+    user = {key: value for key, value in list_users["Users"][0].items() if key != "PasswordLastUsed"}
+    if user_policy:
+        user["UserPolicyList"] = [
+            {"PolicyName": user_policy["PolicyName"], "PolicyDocument": user_policy["PolicyDocument"]}
+        ]
+    if attached_policies:
+        user["AttachedManagedPolicies"] = attached_policies
+    return {"UserDetailList": [user], "IsTruncated": False}
+
+def group_inline_policy_details(group_policy):
+    group = dict(list_groups["Groups"][0])
+    group["GroupPolicyList"] = [
+        {"PolicyName": group_policy["PolicyName"], "PolicyDocument": group_policy["PolicyDocument"]}
+    ]
+    return {"GroupDetailList": [group], "IsTruncated": False}
+
+def role_inline_policy_details(role_policy):
+    role = dict(list_roles["Roles"][0])
+    role["RolePolicyList"] = [
+        {"PolicyName": role_policy["PolicyName"], "PolicyDocument": role_policy["PolicyDocument"]}
+    ]
+    return {"RoleDetailList": [role], "IsTruncated": False}
+
+def add_credential_report(iam_stubber, password_enabled="true", mfa_active="false", access_key_active="false"):
+    iam_stubber.add_response("generate_credential_report", {"State": "COMPLETE"})
+    iam_stubber.add_response(
+        "get_credential_report",
+        {
+            "Content": credential_report.format(
+                password_enabled=password_enabled,
+                mfa_active=mfa_active,
+                access_key_active=access_key_active
+            ).encode("utf-8"),
+            "ReportFormat": "text/csv"
+        }
+    )
 
 @pytest.fixture(scope="function")
 def iam_stubber():
@@ -289,9 +341,8 @@ def iam_stubber():
     iam_stubber.deactivate()
 
 def test_iam_mngd_policy_cond_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_condition)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_condition))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -300,9 +351,8 @@ def test_iam_mngd_policy_cond_check(iam_stubber):
 
 
 def test_iam_mngd_policy_star_star_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_star_star)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_star_star))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -312,9 +362,8 @@ def test_iam_mngd_policy_star_star_check(iam_stubber):
 
 
 def test_iam_mngd_policy_action_star_star_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_action_star_star)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_action_star_star))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -324,9 +373,8 @@ def test_iam_mngd_policy_action_star_star_check(iam_stubber):
 
 
 def test_iam_mngd_policy_action_star_resource_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_action_star_resource)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_action_star_resource))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -336,9 +384,8 @@ def test_iam_mngd_policy_action_star_resource_check(iam_stubber):
 
 
 def test_iam_mngd_policy_action_resource_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_action_resource)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_action_resource))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -348,9 +395,8 @@ def test_iam_mngd_policy_action_resource_check(iam_stubber):
 
 
 def test_iam_mngd_policy_two_statements_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_two_statements)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_two_statements))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -360,9 +406,8 @@ def test_iam_mngd_policy_two_statements_check(iam_stubber):
 
 
 def test_iam_mngd_policy_action_star_list_check(iam_stubber):
-    iam_stubber.add_response("list_policies", list_policies)
-    iam_stubber.add_response("get_policy_version", get_policy_action_list_resource)
-    results = iam_mngd_policy_least_priv_check(
+    iam_stubber.add_response("get_account_authorization_details", managed_policy_details(get_policy_action_list_resource))
+    results = iam_created_managed_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
     )
     for result in results:
@@ -372,9 +417,7 @@ def test_iam_mngd_policy_action_star_list_check(iam_stubber):
 
 
 def test_iam_user_policy_star_star_check(iam_stubber):
-    iam_stubber.add_response("list_users", list_users)
-    iam_stubber.add_response("list_user_policies", list_user_policies)
-    iam_stubber.add_response("get_user_policy", get_user_policy_star_star)
+    iam_stubber.add_response("get_account_authorization_details", user_inline_policy_details(get_user_policy_star_star))
 
     results = iam_user_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -386,9 +429,7 @@ def test_iam_user_policy_star_star_check(iam_stubber):
 
 
 def test_iam_user_policy_condition_check(iam_stubber):
-    iam_stubber.add_response("list_users", list_users)
-    iam_stubber.add_response("list_user_policies", list_user_policies)
-    iam_stubber.add_response("get_user_policy", get_user_policy_condition)
+    iam_stubber.add_response("get_account_authorization_details", user_inline_policy_details(get_user_policy_condition))
 
     results = iam_user_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -400,9 +441,7 @@ def test_iam_user_policy_condition_check(iam_stubber):
 
 
 def test_group_policy_action_star_list_check(iam_stubber):
-    iam_stubber.add_response("list_groups", list_groups)
-    iam_stubber.add_response("list_group_policies", list_group_policies)
-    iam_stubber.add_response("get_group_policy", get_group_policy_action_list_resource)
+    iam_stubber.add_response("get_account_authorization_details", group_inline_policy_details(get_group_policy_action_list_resource))
 
     results = iam_group_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -414,9 +453,7 @@ def test_group_policy_action_star_list_check(iam_stubber):
 
 
 def test_group_policy_action_star_star_check(iam_stubber):
-    iam_stubber.add_response("list_groups", list_groups)
-    iam_stubber.add_response("list_group_policies", list_group_policies)
-    iam_stubber.add_response("get_group_policy", get_group_policy_action_star_star)
+    iam_stubber.add_response("get_account_authorization_details", group_inline_policy_details(get_group_policy_action_star_star))
 
     results = iam_group_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -428,9 +465,7 @@ def test_group_policy_action_star_star_check(iam_stubber):
 
 
 def test_role_policy_two_statements_check(iam_stubber):
-    iam_stubber.add_response("list_roles", list_roles)
-    iam_stubber.add_response("list_role_policies", list_role_policies)
-    iam_stubber.add_response("get_role_policy", get_role_policy_two_statements)
+    iam_stubber.add_response("get_account_authorization_details", role_inline_policy_details(get_role_policy_two_statements))
 
     results = iam_role_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -442,9 +477,7 @@ def test_role_policy_two_statements_check(iam_stubber):
 
 
 def test_role_policy_list_list_resource_check(iam_stubber):
-    iam_stubber.add_response("list_roles", list_roles)
-    iam_stubber.add_response("list_role_policies", list_role_policies)
-    iam_stubber.add_response("get_role_policy", get_role_policy_list_list_resource)
+    iam_stubber.add_response("get_account_authorization_details", role_inline_policy_details(get_role_policy_list_list_resource))
 
     results = iam_role_policy_least_priv_check(
         cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
@@ -453,3 +486,60 @@ def test_role_policy_list_list_resource_check(iam_stubber):
         assert result["RecordState"] == "ACTIVE"
         assert result["Severity"]["Label"] == "LOW"
     iam_stubber.assert_no_pending_responses()
+
+
+def test_user_mfa_check_password_without_mfa(iam_stubber):
+    iam_stubber.add_response("get_account_authorization_details", user_inline_policy_details(None))
+    add_credential_report(iam_stubber, password_enabled="true", mfa_active="false")
+
+    results = list(user_mfa_check(
+        cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    assert len(results) == 1
+    assert results[0]["RecordState"] == "ACTIVE"
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_user_mfa_check_password_with_mfa(iam_stubber):
+    iam_stubber.add_response("get_account_authorization_details", user_inline_policy_details(None))
+    add_credential_report(iam_stubber, password_enabled="true", mfa_active="true")
+
+    results = list(user_mfa_check(
+        cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    assert len(results) == 1
+    assert results[0]["RecordState"] == "ARCHIVED"
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_access_key_age_check_skips_users_without_active_keys(iam_stubber):
+    iam_stubber.add_response("get_account_authorization_details", user_inline_policy_details(None))
+    add_credential_report(iam_stubber, access_key_active="false")
+
+    results = list(iam_access_key_age_check(
+        cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    # list_access_keys is not stubbed, calling it would raise
+    assert results == []
+    iam_stubber.assert_no_pending_responses()
+
+
+def test_iam_checks_share_one_inventory(iam_stubber):
+    iam_stubber.add_response(
+        "get_account_authorization_details",
+        user_inline_policy_details(
+            get_user_policy_star_star,
+            attached_policies=[{"PolicyName": "ReadOnlyAccess", "PolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess"}]
+        )
+    )
+    cache = {}
+
+    attachedResults = list(user_direct_attached_policy_check(
+        cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    inlineResults = list(iam_user_policy_least_priv_check(
+        cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    assert attachedResults[0]["RecordState"] == "ACTIVE"
+    assert inlineResults[0]["Severity"]["Label"] == "HIGH"
+    iam_stubber.assert_no_pending_responses()
@@ -27,7 +27,7 @@ from botocore.stub import Stubber, ANY
 from . import context
 from auditors.aws.AWS_Lambda_Auditor import (
     unused_function_check,
-    lambda_client,
+    lambdas as lambda_client,
     cloudwatch,
 )
 
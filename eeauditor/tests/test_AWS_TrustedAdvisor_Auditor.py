@@ -0,0 +1,110 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+from botocore.stub import Stubber
+
+from . import context
+from trusted_advisor import get_check_summaries
+from auditors.aws.AWS_TrustedAdvisor_Auditor import (
+    TRUSTED_ADVISOR_CHECK_NAMES,
+    support,
+    trusted_advisor_failing_root_mfa_check,
+    trusted_advisor_failing_elb_listener_security_check,
+    trusted_advisor_failing_cloudfront_ssl_cert_iam_certificate_store_check,
+    trusted_advisor_failing_cloudfront_ssl_cert_on_origin_check,
+    trusted_advisor_failing_exposed_access_keys_check
+)
+
+CHECK_IDS = {name: f"check{index}" for index, name in enumerate(TRUSTED_ADVISOR_CHECK_NAMES)}
+
+describe_trusted_advisor_checks_response = {
+    "checks": [
+        {"id": checkId, "name": name, "description": name, "category": "security", "metadata": []}
+        for name, checkId in CHECK_IDS.items()
+    ] + [{"id": "cost0", "name": "Low Utilization Amazon EC2 Instances", "description": "", "category": "cost_optimizing", "metadata": []}]
+}
+
+
+def check_summaries_response(flagged, names=TRUSTED_ADVISOR_CHECK_NAMES):
+    return {
+        "summaries": [
+            {
+                "checkId": checkId,
+                "timestamp": "2022-06-01T00:00:00Z",
+                "status": "error" if name in flagged else "ok",
+                "resourcesSummary": {
+                    "resourcesProcessed": 1,
+                    "resourcesFlagged": 1 if name in flagged else 0,
+                    "resourcesIgnored": 0,
+                    "resourcesSuppressed": 0
+                },
+                "categorySpecificSummary": {}
+            }
+            for name, checkId in CHECK_IDS.items() if name in names
+        ]
+    }
+
+
+@pytest.fixture(scope="function")
+def support_stubber():
+    support_stubber = Stubber(support)
+    support_stubber.activate()
+    yield support_stubber
+    support_stubber.deactivate()
+
+
+def test_every_check_reads_the_summaries_collected_once(support_stubber):
+    support_stubber.add_response("describe_trusted_advisor_checks", describe_trusted_advisor_checks_response, {"language": "en"})
+    support_stubber.add_response(
+        "describe_trusted_advisor_check_summaries",
+        check_summaries_response(["MFA on Root Account"]),
+        {"checkIds": list(CHECK_IDS.values())}
+    )
+    cache = {}
+    findings = []
+    for check in [
+        trusted_advisor_failing_root_mfa_check,
+        trusted_advisor_failing_elb_listener_security_check,
+        trusted_advisor_failing_cloudfront_ssl_cert_iam_certificate_store_check,
+        trusted_advisor_failing_cloudfront_ssl_cert_on_origin_check,
+        trusted_advisor_failing_exposed_access_keys_check
+    ]:
+        findings.extend(check(cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"))
+    support_stubber.assert_no_pending_responses()
+    assert len(findings) == 5
+    failed = [finding["Id"] for finding in findings if finding["RecordState"] == "ACTIVE"]
+    assert failed == ["012345678901check0/trusted-advisor-failing-root-mfa-check"]
+
+
+def test_summaries_are_reused_across_runs_within_ttl(support_stubber, tmp_path):
+    support_stubber.add_response("describe_trusted_advisor_checks", describe_trusted_advisor_checks_response)
+    support_stubber.add_response("describe_trusted_advisor_check_summaries", check_summaries_response([]))
+    cacheFile = str(tmp_path / "trusted-advisor-cache.json")
+    first = get_check_summaries({}, support, "012345678901", TRUSTED_ADVISOR_CHECK_NAMES, ttl=3600, cache_file=cacheFile)
+    second = get_check_summaries({}, support, "012345678901", TRUSTED_ADVISOR_CHECK_NAMES, ttl=3600, cache_file=cacheFile)
+    support_stubber.assert_no_pending_responses()
+    assert first == second
+    assert len(second) == 5
+    # an expired or different set of checks is collected again
+    support_stubber.add_response("describe_trusted_advisor_checks", describe_trusted_advisor_checks_response)
+    support_stubber.add_response("describe_trusted_advisor_check_summaries", check_summaries_response([], TRUSTED_ADVISOR_CHECK_NAMES[:2]))
+    get_check_summaries({}, support, "012345678901", TRUSTED_ADVISOR_CHECK_NAMES[:2], ttl=3600, cache_file=cacheFile)
+    support_stubber.assert_no_pending_responses()
@@ -0,0 +1,122 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+
+import pytest
+
+from botocore.stub import Stubber, ANY
+
+from . import context
+from auditors.aws import Amazon_EC2_SSM_Auditor as ssm_auditor
+
+INSTANCE_IDS = [f"i-{index:017x}" for index in range(60)]
+# the last 5 instances are not managed by Systems Manager and the last 10 managed ones were never patched
+MANAGED_IDS = INSTANCE_IDS[:55]
+PATCHED_IDS = MANAGED_IDS[:45]
+
+
+def instance(instanceId):
+    return {
+        "InstanceId": instanceId,
+        "InstanceType": "t3.micro",
+        "ImageId": "ami-0123456789abcdef0",
+        "SubnetId": "subnet-0123",
+        "VpcId": "vpc-0123",
+        "LaunchTime": datetime.datetime(2022, 1, 1),
+    }
+
+
+def instance_information(instanceId):
+    return {
+        "InstanceId": instanceId,
+        "PlatformType": "Linux",
+        "IsLatestVersion": True,
+        "AssociationStatus": "Success",
+    }
+
+
+def patch_state(instanceId):
+    return {
+        "InstanceId": instanceId,
+        "PatchGroup": "default",
+        "BaselineId": "pb-0123456789abcdef0",
+        "OperationStartTime": datetime.datetime(2022, 1, 1),
+        "OperationEndTime": datetime.datetime(2022, 1, 1),
+        "Operation": "Scan",
+    }
+
+
+@pytest.fixture(scope="function")
+def ec2_stubber():
+    ec2_stubber = Stubber(ssm_auditor.ec2)
+    ec2_stubber.activate()
+    yield ec2_stubber
+    ec2_stubber.deactivate()
+
+
+@pytest.fixture(scope="function")
+def ssm_stubber():
+    ssm_stubber = Stubber(ssm_auditor.ssm)
+    ssm_stubber.activate()
+    yield ssm_stubber
+    ssm_stubber.deactivate()
+
+
+def test_checks_share_bulk_instance_information_and_patch_states(ec2_stubber, ssm_stubber):
+    ec2_stubber.add_response(
+        "describe_instances",
+        {"Reservations": [{"Instances": [instance(instanceId) for instanceId in INSTANCE_IDS]}]}
+    )
+    ssm_stubber.add_response(
+        "describe_instance_information",
+        {"InstanceInformationList": [instance_information(instanceId) for instanceId in MANAGED_IDS[:30]], "NextToken": "page-2"}
+    )
+    ssm_stubber.add_response(
+        "describe_instance_information",
+        {"InstanceInformationList": [instance_information(instanceId) for instanceId in MANAGED_IDS[30:]]},
+        {"NextToken": "page-2"}
+    )
+    for batch in [MANAGED_IDS[:50], MANAGED_IDS[50:]]:
+        ssm_stubber.add_response(
+            "describe_instance_patch_states",
+            {"InstancePatchStates": [patch_state(instanceId) for instanceId in batch if instanceId in PATCHED_IDS]},
+            {"InstanceIds": batch}
+        )
+    cache = {}
+    findings = {}
+    for check in [
+        ssm_auditor.ec2_instance_ssm_managed_check,
+        ssm_auditor.ssm_instace_agent_update_check,
+        ssm_auditor.ssm_instance_association_check,
+        ssm_auditor.ssm_instance_patch_state_state,
+    ]:
+        findings[check.__name__] = list(
+            check(cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws")
+        )
+    ec2_stubber.assert_no_pending_responses()
+    ssm_stubber.assert_no_pending_responses()
+    failed = {name: sum(f["RecordState"] == "ACTIVE" for f in results) for name, results in findings.items()}
+    assert failed == {
+        "ec2_instance_ssm_managed_check": 5,
+        "ssm_instace_agent_update_check": 0,
+        "ssm_instance_association_check": 0,
+        "ssm_instance_patch_state_state": 15,
+    }
+    assert len(findings["ssm_instance_association_check"]) == 55
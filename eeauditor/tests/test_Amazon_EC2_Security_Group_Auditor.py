@@ -0,0 +1,64 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+from botocore.stub import Stubber
+
+from . import context
+from auditors.aws.Amazon_EC2_Security_Group_Auditor import (
+    security_group_master_auditor_check,
+    ec2
+)
+
+describe_security_groups_response = {
+    "SecurityGroups": [
+        {
+            "GroupName": "web",
+            "GroupId": "sg-00000001",
+            "IpPermissions": [
+                {"IpProtocol": "tcp", "FromPort": 23, "ToPort": 23, "IpRanges": [{"CidrIp": "0.0.0.0/0"}]},
+                {"IpProtocol": "tcp", "FromPort": 3389, "ToPort": 3389, "IpRanges": [{"CidrIp": "10.0.0.0/8"}]},
+                {"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443, "IpRanges": [{"CidrIp": "0.0.0.0/0"}]},
+                {"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]},
+            ],
+        }
+    ]
+}
+
+
+@pytest.fixture(scope="function")
+def ec2_stubber():
+    ec2_stubber = Stubber(ec2)
+    ec2_stubber.activate()
+    yield ec2_stubber
+    ec2_stubber.deactivate()
+
+
+def test_master_auditor_evaluates_configured_ports(ec2_stubber):
+    ec2_stubber.add_response("describe_security_groups", describe_security_groups_response)
+    results = list(security_group_master_auditor_check(
+        cache={}, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    statuses = {result["Id"].split("/")[-1]: result["Compliance"]["Status"] for result in results}
+    assert statuses == {
+        "security-group-telnet-open-check": "FAILED",
+        "security-group-rdp-open-check": "PASSED",
+    }
+    ec2_stubber.assert_no_pending_responses()
@@ -0,0 +1,77 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+from botocore.stub import Stubber
+
+from . import context
+from auditors.aws import Amazon_ElasticsearchService_Auditor as es_auditor
+
+DOMAIN_NAMES = [f"domain-{index}" for index in range(7)]
+
+
+def domain_status(name):
+    return {
+        "DomainId": f"012345678901/{name}",
+        "DomainName": name,
+        "ARN": f"arn:aws:es:us-east-1:012345678901:domain/{name}",
+        "ElasticsearchVersion": "7.10",
+        "ElasticsearchClusterConfig": {"DedicatedMasterEnabled": True},
+        "EBSOptions": {},
+        "CognitoOptions": {"Enabled": False},
+        "EncryptionAtRestOptions": {"Enabled": True},
+        "NodeToNodeEncryptionOptions": {"Enabled": True},
+        "DomainEndpointOptions": {"EnforceHTTPS": True, "TLSSecurityPolicy": "Policy-Min-TLS-1-2-2019-07"},
+        "ServiceSoftwareOptions": {"UpdateAvailable": False, "Description": "There is no software update available for this domain."},
+    }
+
+
+@pytest.fixture(scope="function")
+def es_stubber():
+    es_stubber = Stubber(es_auditor.elasticsearch)
+    es_stubber.activate()
+    yield es_stubber
+    es_stubber.deactivate()
+
+
+def test_every_check_reads_the_batched_domain_descriptions(es_stubber):
+    es_stubber.add_response("list_domain_names", {"DomainNames": [{"DomainName": name} for name in DOMAIN_NAMES]})
+    # batches are described in parallel, the responses are keyed by DomainName whichever call gets them
+    for batch in [DOMAIN_NAMES[:5], DOMAIN_NAMES[5:]]:
+        es_stubber.add_response(
+            "describe_elasticsearch_domains", {"DomainStatusList": [domain_status(name) for name in batch]}
+        )
+    cache = {}
+    findings = []
+    for check in [
+        es_auditor.dedicated_master_check,
+        es_auditor.cognito_check,
+        es_auditor.encryption_at_rest_check,
+        es_auditor.node2node_encryption_check,
+        es_auditor.https_enforcement_check,
+        es_auditor.tls_policy_check,
+        es_auditor.elastic_update_check,
+        es_auditor.elasticsearch_in_vpc_check,
+        es_auditor.elasticsearch_public_access_check,
+    ]:
+        findings.extend(check(cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"))
+    es_stubber.assert_no_pending_responses()
+    assert sorted(es_auditor.describe_elasticsearch_domains(cache)) == DOMAIN_NAMES
+    assert len(findings) == 9 * len(DOMAIN_NAMES)
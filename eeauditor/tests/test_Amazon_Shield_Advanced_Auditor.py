@@ -27,7 +27,11 @@ from botocore.stub import Stubber, ANY
 from . import context
 from auditors.aws.Amazon_Shield_Advanced_Auditor import (
     shield_advanced_subscription_latest_attacks,
-    shield
+    shield_advanced_route_53_protection_check,
+    shield_advanced_cloudfront_protection_check,
+    shield,
+    route53,
+    cloudfront
 )
 
 get_attacks_from_last_7_days = {
@@ -58,6 +62,119 @@ def shield_stubber():
     shield_stubber.deactivate()
 
 
+def hosted_zone(zoneId):
+    return {
+        "Id": f"/hostedzone/{zoneId}",
+        "Name": f"{zoneId.lower()}.example.com.",
+        "CallerReference": zoneId,
+    }
+
+
+def distribution(distributionId):
+    return {
+        "Id": distributionId,
+        "ARN": f"arn:aws:cloudfront::012345678901:distribution/{distributionId}",
+        "Status": "Deployed",
+        "LastModifiedTime": datetime.datetime(2022, 1, 1),
+        "DomainName": f"{distributionId.lower()}.cloudfront.net",
+        "Aliases": {"Quantity": 0},
+        "Origins": {"Quantity": 1, "Items": [{"Id": "origin", "DomainName": "origin.example.com"}]},
+        "DefaultCacheBehavior": {"TargetOriginId": "origin", "ViewerProtocolPolicy": "allow-all"},
+        "CacheBehaviors": {"Quantity": 0},
+        "CustomErrorResponses": {"Quantity": 0},
+        "Comment": "",
+        "PriceClass": "PriceClass_All",
+        "Enabled": True,
+        "ViewerCertificate": {},
+        "Restrictions": {"GeoRestriction": {"RestrictionType": "none", "Quantity": 0}},
+        "WebACLId": "",
+        "HttpVersion": "http2",
+        "IsIPV6Enabled": True,
+        "Staging": False,
+    }
+
+
+def distribution_list(distributions, next_marker=None):
+    distributionList = {
+        "Marker": "",
+        "MaxItems": 100,
+        "IsTruncated": next_marker is not None,
+        "Quantity": len(distributions),
+    }
+    if distributions:
+        distributionList["Items"] = distributions
+    if next_marker:
+        distributionList["NextMarker"] = next_marker
+    return {"DistributionList": distributionList}
+
+
+list_protections_response = {
+    "Protections": [
+        {"Id": "00000000-0000-0000-0000-000000000001", "Name": "zone", "ResourceArn": "arn:aws:route53:::hostedzone/ZPROTECTED"},
+        {"Id": "00000000-0000-0000-0000-000000000002", "Name": "cdn", "ResourceArn": "arn:aws:cloudfront::012345678901:distribution/EPROTECTED"},
+    ]
+}
+
+
+@pytest.fixture(scope="function")
+def route53_stubber():
+    route53_stubber = Stubber(route53)
+    route53_stubber.activate()
+    yield route53_stubber
+    route53_stubber.deactivate()
+
+
+@pytest.fixture(scope="function")
+def cloudfront_stubber():
+    cloudfront_stubber = Stubber(cloudfront)
+    cloudfront_stubber.activate()
+    yield cloudfront_stubber
+    cloudfront_stubber.deactivate()
+
+
+def test_protection_index_is_shared_by_the_checks(shield_stubber, route53_stubber, cloudfront_stubber):
+    shield_stubber.add_response("list_protections", list_protections_response)
+    route53_stubber.add_response(
+        "list_hosted_zones",
+        {"HostedZones": [hosted_zone("ZPROTECTED")], "Marker": "", "IsTruncated": True, "NextMarker": "page-2", "MaxItems": "1"}
+    )
+    route53_stubber.add_response(
+        "list_hosted_zones",
+        {"HostedZones": [hosted_zone("ZOPEN")], "Marker": "page-2", "IsTruncated": False, "MaxItems": "1"}
+    )
+    cloudfront_stubber.add_response("list_distributions", distribution_list([distribution("EPROTECTED")], "page-2"))
+    cloudfront_stubber.add_response("list_distributions", distribution_list([]))
+    cache = {}
+    findings = list(shield_advanced_route_53_protection_check(
+        cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    findings.extend(shield_advanced_cloudfront_protection_check(
+        cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"
+    ))
+    states = {finding["GeneratorId"]: finding["RecordState"] for finding in findings}
+    assert states == {
+        "arn:aws:route53:::hostedzone/ZPROTECTED": "ARCHIVED",
+        "arn:aws:route53:::hostedzone/ZOPEN": "ACTIVE",
+        "arn:aws:cloudfront::012345678901:distribution/EPROTECTED": "ARCHIVED",
+    }
+    shield_stubber.assert_no_pending_responses()
+    route53_stubber.assert_no_pending_responses()
+    cloudfront_stubber.assert_no_pending_responses()
+
+
+def test_account_without_protections_fails_every_resource(shield_stubber, route53_stubber):
+    shield_stubber.add_client_error("list_protections", "ResourceNotFoundException")
+    route53_stubber.add_response(
+        "list_hosted_zones",
+        {"HostedZones": [hosted_zone("ZOPEN")], "Marker": "", "IsTruncated": False, "MaxItems": "100"}
+    )
+    findings = list(shield_advanced_route_53_protection_check(
+        cache={}, awsAccountId="012345678901", awsRegion="eu-west-1", awsPartition="aws"
+    ))
+    assert [finding["Compliance"]["Status"] for finding in findings] == ["FAILED"]
+    shield_stubber.assert_no_pending_responses()
+
+
 def test_shield_recent_attacks(shield_stubber):
     shield_stubber.add_response("list_attacks", get_attacks_from_last_7_days)
     results = shield_advanced_subscription_latest_attacks(
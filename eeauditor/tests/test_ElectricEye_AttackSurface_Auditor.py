@@ -0,0 +1,143 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import socket
+
+import pytest
+
+from . import context
+from .test_port_scanner import FakeNmap
+from auditor_cache import AuditorCache
+from port_scanner import NmapPortScanner
+import auditors.aws.ElectricEye_AttackSurface_Auditor as attack_surface
+
+
+@pytest.fixture(scope="function")
+def cache(monkeypatch):
+    """Cache holding the listings of every check so no API is called"""
+    nmap = FakeNmap()
+    scanner = NmapPortScanner(attack_surface.SCANNED_PORTS, batch_size=2, nmap=nmap)
+    monkeypatch.setattr(attack_surface, "get_port_scanner", lambda ports: scanner)
+    monkeypatch.setattr(attack_surface, "get_reachability", lambda cache: None)
+    addresses = {"alb.example.com": "192.0.2.1", "d111.cloudfront.net": "192.0.2.2", "www.example.com": "192.0.2.1"}
+    monkeypatch.setattr(socket, "gethostbyname", lambda name: addresses[name])
+    cache = {
+        "instances": [{
+            "InstanceId": "i-0123456789abcdef0",
+            "InstanceType": "t3.micro",
+            "ImageId": "ami-0123456789abcdef0",
+            "SubnetId": "subnet-0123",
+            "VpcId": "vpc-0123",
+            "LaunchTime": "2022-01-01T00:00:00Z",
+            "PublicIpAddress": "192.0.2.3"
+        }],
+        "describe_load_balancers": {"LoadBalancers": [{
+            "LoadBalancerArn": "arn:aws:elasticloadbalancing:us-east-1:012345678901:loadbalancer/app/alb/0123",
+            "LoadBalancerName": "alb",
+            "DNSName": "alb.example.com",
+            "Type": "application",
+            "Scheme": "internet-facing",
+            "VpcId": "vpc-0123",
+            "IpAddressType": "ipv4"
+        }]},
+        "describe_clb_load_balancers": {"LoadBalancerDescriptions": []},
+        "describe_addresses": {"Addresses": [{
+            "PublicIp": "192.0.2.3",
+            "AllocationId": "eipalloc-0123",
+            "PrivateIpAddress": "10.0.0.10"
+        }]},
+        "items": [{
+            "Id": "E0123",
+            "ARN": "arn:aws:cloudfront::012345678901:distribution/E0123",
+            "DomainName": "d111.cloudfront.net",
+            "Status": "Deployed"
+        }],
+        "get_hosted_zones": [{"Id": "/hostedzone/Z0123", "Name": "example.com."}],
+        "a_records:/hostedzone/Z0123": [{"Name": "www.example.com.", "Type": "A"}]
+    }
+    cache["nmap"] = nmap
+    return cache
+
+
+def run_check(check, cache):
+    return list(check(cache=cache, awsAccountId="012345678901", awsRegion="us-east-1", awsPartition="aws"))
+
+
+def test_targets_of_every_check_are_scanned_once(cache):
+    findings = []
+    for check in [
+        attack_surface.ec2_attack_surface_open_tcp_port_check,
+        attack_surface.elbv2_attack_surface_open_tcp_port_check,
+        attack_surface.elb_attack_surface_open_tcp_port_check,
+        attack_surface.eip_attack_surface_open_tcp_port_check,
+        attack_surface.cloudfront_attack_surface_open_tcp_port_check,
+        attack_surface.route53_public_hz_attack_surface_open_tcp_port_check,
+    ]:
+        findings.extend(run_check(check, cache))
+    # the ALB and its Route53 alias share an IP, the EC2 instance owns the EIP
+    assert sorted(ip for batch in cache["nmap"].targets for ip in batch) == ["192.0.2.1", "192.0.2.2", "192.0.2.3"]
+    failed = [finding["Title"] for finding in findings if finding["RecordState"] == "ACTIVE"]
+    assert len(failed) == 5
+
+
+def test_only_targets_of_the_running_check_are_scanned(cache):
+    run_check(attack_surface.ec2_attack_surface_open_tcp_port_check, cache)
+    assert cache["nmap"].targets == [["192.0.2.3"]]
+
+
+def test_global_targets_are_scanned_once_per_account(cache):
+    listings = {key: value for key, value in cache.items() if key in ("items", "get_hosted_zones", "a_records:/hostedzone/Z0123")}
+    auditorCache = AuditorCache()
+    for awsRegion in ["us-east-1", "eu-west-1"]:
+        scope = auditorCache.scope(attack_surface.__name__, awsAccountId="012345678901", awsRegion=awsRegion)
+        scope.update(listings)
+        for check in [
+            attack_surface.cloudfront_attack_surface_open_tcp_port_check,
+            attack_surface.route53_public_hz_attack_surface_open_tcp_port_check,
+        ]:
+            findings = list(check(cache=scope, awsAccountId="012345678901", awsRegion=awsRegion, awsPartition="aws"))
+            assert findings
+    assert sorted(ip for batch in cache["nmap"].targets for ip in batch) == ["192.0.2.1", "192.0.2.2"]
+
+
+def test_target_missing_from_the_shared_scan_is_scanned_on_its_own(cache):
+    run_check(attack_surface.eip_attack_surface_open_tcp_port_check, cache)
+    scanned = len(cache["nmap"].targets)
+    cache["describe_addresses"]["Addresses"][0]["PublicIp"] = "192.0.2.4"
+    findings = run_check(attack_surface.eip_attack_surface_open_tcp_port_check, cache)
+    assert cache["nmap"].targets[scanned:] == [["192.0.2.4"]]
+    assert "192.0.2.4" in findings[0]["Description"]
+
+
+def test_unreachable_instance_resolves_findings_of_every_port(cache, monkeypatch):
+    class Unreachable(object):
+        def is_instance_unreachable(self, instance_id, ports):
+            return True
+
+    monkeypatch.setattr(attack_surface, "get_reachability", lambda cache: Unreachable())
+    findings = run_check(attack_surface.ec2_attack_surface_open_tcp_port_check, cache)
+    assert cache["nmap"].targets == []
+    assert len(findings) == len(attack_surface.SCANNED_PORTS)
+    assert all(finding["RecordState"] == "ARCHIVED" for finding in findings)
+    assert all(finding["Compliance"]["Status"] == "PASSED" for finding in findings)
+    assert "not reachable from the internet" in findings[0]["Description"]
+    # same Id as the finding of an open port found by an earlier scan
+    assert any(finding["Id"].endswith("/attack-surface-ec2-open-SSH-check") for finding in findings)
+    # numbered in port order like scan results, port 22 is the second scanned port
+    assert [finding["Title"] for finding in findings if "-open-SSH-" in finding["Id"]][0].startswith("[AttackSurface.EC2.2]")
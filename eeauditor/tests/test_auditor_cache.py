@@ -0,0 +1,68 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from . import context
+from auditor_cache import AuditorCache, get_account_cache, get_shared_cache
+
+
+def test_scope_is_shared_across_checks():
+    cache = AuditorCache()
+    first = cache.scope("AWS_KMS_Auditor", awsAccountId="012345678901", awsRegion="us-east-1")
+    second = cache.scope("AWS_KMS_Auditor", awsAccountId="012345678901", awsRegion="us-east-1")
+    assert first.get("list_keys") is None
+    first["list_keys"] = {"Keys": []}
+    assert second.get("list_keys") == {"Keys": []}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_scope_isolates_namespaces_and_regions():
+    cache = AuditorCache()
+    cache.scope("AWS_Backup_Auditor", awsAccountId="012345678901", awsRegion="us-east-1")["instances"] = [1]
+    assert cache.scope("Amazon_EC2_Auditor", awsAccountId="012345678901", awsRegion="us-east-1").get("instances") is None
+    assert cache.scope("AWS_Backup_Auditor", awsAccountId="012345678901", awsRegion="us-west-2").get("instances") is None
+    assert "instances" in cache.scope("AWS_Backup_Auditor", awsAccountId="012345678901", awsRegion="us-east-1")
+
+
+def test_fetch_keys_on_parameters():
+    cache = AuditorCache()
+    calls = []
+
+    def call(**kwargs):
+        calls.append(kwargs)
+        return kwargs["GroupIds"]
+
+    assert cache.fetch("ec2", "describe_security_groups", call, GroupIds=["sg-1"]) == ["sg-1"]
+    assert cache.fetch("ec2", "describe_security_groups", call, GroupIds=["sg-1"]) == ["sg-1"]
+    assert cache.fetch("ec2", "describe_security_groups", call, GroupIds=["sg-2"]) == ["sg-2"]
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2}
+
+
+def test_account_cache_is_shared_across_regions():
+    cache = AuditorCache()
+    east = cache.scope("Amazon_Shield_Advanced_Auditor", awsAccountId="012345678901", awsRegion="us-east-1")
+    west = cache.scope("Amazon_Shield_Advanced_Auditor", awsAccountId="012345678901", awsRegion="us-west-2")
+    other = cache.scope("Amazon_Shield_Advanced_Auditor", awsAccountId="109876543210", awsRegion="us-east-1")
+    get_account_cache(east)["protections"] = ["arn"]
+    assert get_account_cache(west).get("protections") == ["arn"]
+    assert get_account_cache(other).get("protections") is None
+    assert get_shared_cache(west).get("protections") is None
+    plain = {}
+    assert get_account_cache(plain) is plain
@@ -0,0 +1,99 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+
+import boto3
+from botocore.stub import Stubber
+
+from . import context
+from aws_accounts import AssumeRoleSessionCache, read_account_list
+
+base_session = boto3.Session(
+    aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+)
+
+assume_role_response = {
+    "Credentials": {
+        "AccessKeyId": "ASIAEXAMPLEEXAMPLE01",
+        "SecretAccessKey": "secret",
+        "SessionToken": "token",
+        "Expiration": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1),
+    }
+}
+
+
+def stub_sessions(**kwargs):
+    sessions = AssumeRoleSessionCache(base_session=base_session, **kwargs)
+    stubber = Stubber(sessions.sts)
+    stubber.activate()
+    return sessions, stubber
+
+
+def test_sessions_are_cached_per_account():
+    sessions, stubber = stub_sessions(role_name="ElectricEyeAuditRole", base_account_id="012345678901")
+    stubber.add_response(
+        "assume_role",
+        assume_role_response,
+        {
+            "RoleArn": "arn:aws:iam::109876543210:role/ElectricEyeAuditRole",
+            "RoleSessionName": "ElectricEye",
+            "DurationSeconds": 3600,
+        },
+    )
+    session = sessions.get_session("109876543210")
+    assert sessions.get_session("109876543210") is session
+    assert session.get_credentials().access_key == "ASIAEXAMPLEEXAMPLE01"
+    # no Role is assumed in the Account of the base Session
+    assert sessions.get_session("012345678901") is base_session
+    stubber.assert_no_pending_responses()
+
+
+def test_external_id_and_partition_are_passed():
+    sessions, stubber = stub_sessions(role_name="ElectricEyeAuditRole", external_id="secret-id")
+    stubber.add_response(
+        "assume_role",
+        assume_role_response,
+        {
+            "RoleArn": "arn:aws-us-gov:iam::109876543210:role/ElectricEyeAuditRole",
+            "RoleSessionName": "ElectricEye",
+            "DurationSeconds": 3600,
+            "ExternalId": "secret-id",
+        },
+    )
+    sessions.get_session("109876543210", "aws-us-gov")
+    stubber.assert_no_pending_responses()
+
+
+def test_evicted_sessions_are_assumed_again():
+    sessions, stubber = stub_sessions(role_name="ElectricEyeAuditRole")
+    stubber.add_response("assume_role", assume_role_response)
+    stubber.add_response("assume_role", assume_role_response)
+    session = sessions.get_session("109876543210")
+    assert sessions.evict("109876543210") is session
+    assert sessions.evict("109876543210") is None
+    assert sessions.get_session("109876543210") is not session
+    stubber.assert_no_pending_responses()
+
+
+def test_read_account_list(tmp_path):
+    assert read_account_list("012345678901, 109876543210,") == ["012345678901", "109876543210"]
+    accountFile = tmp_path / "accounts.txt"
+    accountFile.write_text("012345678901\n109876543210,111111111111\n\n")
+    assert read_account_list(str(accountFile)) == ["012345678901", "109876543210", "111111111111"]
@@ -0,0 +1,101 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import boto3
+
+from . import context
+from aws_clients import (
+    RoutingSession,
+    get_client,
+    get_client_provider,
+    set_client_provider,
+    use_session
+)
+
+
+def test_routed_client_follows_active_region():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    router = RoutingSession(session, "us-east-1")
+    ec2 = router.client("ec2")
+    assert ec2.meta.region_name == "us-east-1"
+    with use_session(session, "eu-west-1"):
+        assert ec2.meta.region_name == "eu-west-1"
+    assert ec2.meta.region_name == "us-east-1"
+
+
+def test_routed_client_keeps_explicit_region():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    router = RoutingSession(session, "us-east-1")
+    globalaccelerator = router.client("globalaccelerator", region_name="us-west-2")
+    with use_session(session, "ap-southeast-2"):
+        assert globalaccelerator.meta.region_name == "us-west-2"
+
+
+def test_routed_clients_are_shared():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    router = RoutingSession(session, "us-east-1")
+    assert router.get_client("kms") is router.get_client("kms")
+    assert router.get_client("kms") is not router.get_client("kms", region_name="eu-west-1")
+
+
+def test_routed_clients_use_tuned_config():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    router = RoutingSession(session, "us-east-1")
+    router.configure(max_pool_connections=25)
+    config = router.get_client("ssm").meta.config
+    assert config.retries["mode"] == "adaptive"
+    assert config.max_pool_connections == 25
+
+
+def test_get_client_follows_provider():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    previous = get_client_provider()
+    set_client_provider(RoutingSession(session, "eu-west-1"))
+    try:
+        sqs = get_client("sqs")
+        assert sqs.meta.region_name == "eu-west-1"
+    finally:
+        set_client_provider(previous)
+
+
+def test_evict_drops_the_clients_of_a_session():
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    other = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    router = RoutingSession(session, "us-east-1")
+    kms = router.get_client("kms")
+    with use_session(other, "us-east-1"):
+        otherKms = router.get_client("kms")
+    router.evict(session)
+    assert router.get_client("kms") is not kms
+    with use_session(other, "us-east-1"):
+        assert router.get_client("kms") is otherKms
@@ -0,0 +1,59 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from . import context
+from benchmarks.fake_clients import FakeClient
+from benchmarks.run_benchmarks import benchmark_auditors, scaling_exponents
+from benchmarks.synthetic import SyntheticEstate
+
+
+def test_synthetic_estate_is_deterministic():
+    assert SyntheticEstate(20, seed=1).security_groups == SyntheticEstate(20, seed=1).security_groups
+    assert len(SyntheticEstate(20).users) == 20
+
+
+def test_fake_paginator_splits_pages():
+    estate = SyntheticEstate(25)
+    ec2 = FakeClient("ec2", estate.ec2_operations())
+    paginator = ec2.get_paginator("describe_instances")
+    paginator.page_size = 10
+    pages = list(paginator.paginate())
+    assert [len(page["Reservations"]) for page in pages] == [10, 10, 5]
+
+
+def test_benchmark_auditors_runs_checks():
+    results = benchmark_auditors(
+        [5, 20], auditors=["Amazon_EC2_Security_Group_Auditor", "Amazon_S3_Auditor"]
+    )
+    assert results
+    assert all(result["Error"] is None for result in results)
+    encryption = [result for result in results if result["CheckName"] == "bucket_encryption_check"]
+    assert [result["Findings"] for result in encryption] == [5, 20]
+
+
+def test_scaling_exponents_flags_quadratic_checks():
+    results = [
+        {"CheckName": "linear", "Size": 100, "Seconds": 0.1},
+        {"CheckName": "linear", "Size": 1000, "Seconds": 1.0},
+        {"CheckName": "quadratic", "Size": 100, "Seconds": 0.1},
+        {"CheckName": "quadratic", "Size": 1000, "Seconds": 10.0},
+        {"CheckName": "too_fast", "Size": 100, "Seconds": 0.001},
+        {"CheckName": "too_fast", "Size": 1000, "Seconds": 0.01},
+    ]
+    assert scaling_exponents(results) == {"linear": 1.0, "quadratic": 2.0}
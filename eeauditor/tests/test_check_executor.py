@@ -0,0 +1,113 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import threading
+import time
+
+from . import context
+from check_executor import ConcurrentCheckExecutor
+
+
+def test_executor_yields_all_findings():
+    def run(name):
+        def wrapped():
+            for i in range(3):
+                yield {"Id": f"{name}-{i}"}
+        return wrapped
+
+    executor = ConcurrentCheckExecutor(workers=4)
+    results = list(executor.run(
+        [("ec2", f"check_{n}", run(f"check_{n}")) for n in range(5)]
+    ))
+    assert sorted(r["Id"] for r in results) == sorted(
+        f"check_{n}-{i}" for n in range(5) for i in range(3)
+    )
+
+
+def test_executor_caps_service_concurrency():
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def run():
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        yield {"Id": "finding"}
+
+    executor = ConcurrentCheckExecutor(workers=8, service_concurrency=2)
+    results = list(executor.run([("rds", f"check_{n}", run) for n in range(8)]))
+    assert len(results) == 8
+    assert running["max"] == 2
+
+
+def test_executor_isolates_failing_checks():
+    def failing():
+        raise Exception("boom")
+        yield
+
+    def passing():
+        yield {"Id": "finding"}
+
+    executor = ConcurrentCheckExecutor(workers=2)
+    results = list(executor.run([("kms", "failing", failing), ("kms", "passing", passing)]))
+    assert results == [{"Id": "finding"}]
+
+
+def test_busy_service_does_not_hold_workers():
+    # the first ten checks to start only finish once all ten run at the same time
+    lock = threading.Lock()
+    started = {"count": 0}
+    barrier = threading.Barrier(10, timeout=10)
+
+    def run():
+        with lock:
+            started["count"] += 1
+            firstWave = started["count"] <= 10
+        if firstWave:
+            barrier.wait()
+        yield {"Id": "finding"}
+
+    # checks of the busy service come first, checks of other services must not wait behind them
+    tasks = [("ec2", f"ec2_check_{n}", run) for n in range(20)]
+    tasks.extend((f"service_{n}", f"check_{n}", run) for n in range(8))
+    executor = ConcurrentCheckExecutor(workers=10, service_concurrency=2)
+    results = list(executor.run(tasks))
+    # two ec2 checks and the eight other checks overlapped, otherwise the barrier breaks and checks fail
+    assert not barrier.broken
+    assert len(results) == 28
+
+
+def test_services_are_taken_in_queued_order():
+    def run(name):
+        def wrapped():
+            yield {"Id": name}
+        return wrapped
+
+    # a single worker runs every check of the first Account before the second one
+    tasks = [
+        (f"{awsAccountId}:{service_name}", f"{awsAccountId}-{service_name}-{n}", run(f"{awsAccountId}-{service_name}-{n}"))
+        for awsAccountId in ["a", "b"]
+        for service_name in ["ec2", "kms"]
+        for n in range(2)
+    ]
+    executor = ConcurrentCheckExecutor(workers=1)
+    assert [finding["Id"] for finding in executor.run(tasks)] == [check_name for _, check_name, _ in tasks]
@@ -0,0 +1,64 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import os
+
+from . import context
+from check_index import CheckIndex, index_module
+
+test_modules = os.path.join(os.path.dirname(__file__), "test_modules")
+
+auditor_source = '''
+from check_register import CheckRegister
+
+registry = CheckRegister()
+
+def helper(cache):
+    return cache
+
+@registry.register_check("kms")
+def kms_test_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
+    """[KMS.99] A test check"""
+    yield {}
+'''
+
+
+def test_index_module():
+    assert index_module(auditor_source) == [
+        {"name": "kms_test_check", "service": "kms", "doc": "[KMS.99] A test check"}
+    ]
+
+
+def test_check_index_test_modules():
+    index = CheckIndex(test_modules)
+    assert list(index.checks()) == [("plugin1", "test", "plugin_func_1", "")]
+    assert index.modules_for_check("plugin_func_1") == ["plugin1"]
+    assert index.modules_for_check("missing_check") == []
+
+
+def test_check_index_refreshes_changed_modules(tmp_path):
+    (tmp_path / "Test_Auditor.py").write_text(auditor_source)
+    index = CheckIndex(str(tmp_path))
+    index.save()
+    # a saved index which matches the modules is used as is
+    assert not CheckIndex(str(tmp_path)).refresh()
+    (tmp_path / "Test_Auditor.py").write_text(auditor_source.replace("kms_test_check", "kms_renamed_check"))
+    index = CheckIndex(str(tmp_path))
+    assert index.modules_for_check("kms_renamed_check") == ["Test_Auditor"]
+    assert index.modules_for_check("kms_test_check") == []
@@ -20,7 +20,7 @@
 import json
 
 from . import context
-from eeauditor import EEAuditor
+from eeauditor import AuditTarget, EEAuditor, get_global_services
 from .test_modules.plugin1 import plugin_func_1
 
 
@@ -55,3 +55,34 @@ def test_eeauditor_plugin_run_one_check():
     app.load_plugins(plugin_name="plugin1")
     for result in app.run_checks(requested_check_name="plugin_func_1"):
         assert result == {"SchemaVersion": "2018-10-08", "Id": "test-finding"}
+
+
+
+def test_eeauditor_plugin_run_checks_targets():
+    app = EEAuditor(name="test controller", search_path="./tests/test_modules")
+    app.load_plugins(plugin_name="plugin1")
+    targets = [
+        AuditTarget(awsAccountId, region, lambda: app.session)
+        for awsAccountId in ["012345678901", "109876543210"]
+        for region in ["us-east-1", "eu-west-1"]
+    ]
+    results = list(app.run_checks(requested_check_name="plugin_func_1", targets=targets))
+    # plugins are loaded once and ran against every Account and Region
+    assert len(results) == 4
+
+
+def test_global_services_run_once_per_account():
+    targets = [
+        AuditTarget(awsAccountId, region, None)
+        for awsAccountId, regions in [
+            ("012345678901", ["eu-west-1", "us-east-1"]),
+            ("109876543210", ["eu-west-1", "ap-south-1"]),
+        ]
+        for region in regions
+    ]
+    globalServices = get_global_services(targets)
+    # Trusted Advisor only answers in us-east-1, the rest run in the home Region
+    assert globalServices[targets[0]] == {"cloudfront", "health", "iam", "route53", "s3"}
+    assert globalServices[targets[1]] == {"support"}
+    assert globalServices[targets[2]] == {"cloudfront", "health", "iam", "route53", "s3", "support"}
+    assert globalServices[targets[3]] == set()
@@ -0,0 +1,98 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import datetime
+
+import boto3
+from botocore.stub import Stubber, ANY
+
+from . import context
+from metrics_collector import MetricsCollector, get_metrics_collector, metric_stat
+
+cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+endTime = datetime.datetime.now(datetime.timezone.utc)
+startTime = endTime - datetime.timedelta(days=1)
+
+
+def metric_data_response(count, values=None, next_token=None):
+    response = {
+        "MetricDataResults": [
+            {"Id": f"m{index + 1}", "Label": "Invocations", "Values": values or [], "StatusCode": "Complete"}
+            for index in range(count)
+        ]
+    }
+    if next_token:
+        response["NextToken"] = next_token
+    return response
+
+
+def add_functions(collector, count):
+    for index in range(count):
+        name = f"function-{index}"
+        collector.add(
+            ("AWS/Lambda", "Invocations", name),
+            metric_stat("AWS/Lambda", "Invocations", {"FunctionName": name}, 86400, "Sum"),
+            startTime,
+            endTime
+        )
+
+
+def test_queries_are_sent_500_per_request():
+    collector = MetricsCollector(cloudwatch)
+    add_functions(collector, 1200)
+    with Stubber(cloudwatch) as stubber:
+        for count in [500, 500, 200]:
+            stubber.add_response(
+                "get_metric_data",
+                metric_data_response(count, values=[1.0]),
+                {"MetricDataQueries": ANY, "StartTime": startTime, "EndTime": endTime}
+            )
+        results = collector.collect()
+        stubber.assert_no_pending_responses()
+    assert len(results) == 1200
+    assert results[("AWS/Lambda", "Invocations", "function-1199")]["Values"] == [1.0]
+
+
+def test_pages_are_merged_and_collected_queries_are_not_sent_again():
+    collector = MetricsCollector(cloudwatch)
+    add_functions(collector, 2)
+    with Stubber(cloudwatch) as stubber:
+        stubber.add_response("get_metric_data", metric_data_response(2, values=[1.0], next_token="page-2"))
+        stubber.add_response("get_metric_data", metric_data_response(1, values=[2.0]))
+        results = collector.collect()
+        add_functions(collector, 2)
+        assert collector.collect() is results
+        stubber.assert_no_pending_responses()
+    assert results[("AWS/Lambda", "Invocations", "function-0")]["Values"] == [1.0, 2.0]
+    assert results[("AWS/Lambda", "Invocations", "function-1")]["Values"] == [1.0]
+
+
+def test_metric_stat_and_shared_collector():
+    assert metric_stat("AWS/SQS", "ApproximateAgeOfOldestMessage", {"QueueName": "q"}, 3600, "Maximum", "Seconds") == {
+        "Metric": {
+            "Namespace": "AWS/SQS",
+            "MetricName": "ApproximateAgeOfOldestMessage",
+            "Dimensions": [{"Name": "QueueName", "Value": "q"}],
+        },
+        "Period": 3600,
+        "Stat": "Maximum",
+        "Unit": "Seconds",
+    }
+    cache = {}
+    assert get_metrics_collector(cache, cloudwatch) is get_metrics_collector(cache, cloudwatch)
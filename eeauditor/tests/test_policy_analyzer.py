@@ -0,0 +1,68 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+
+from . import context
+import policy_analyzer
+from policy_analyzer import analyze_policy, document_hash
+
+
+def policy(*statements):
+    return {"Version": "2012-10-17", "Statement": list(statements)}
+
+
+def test_least_privilege_rating():
+    assert analyze_policy(policy({"Effect": "Allow", "Action": "*", "Resource": "*"})).least_privilege_rating == "failedHigh"
+    assert analyze_policy(policy({"Effect": "Allow", "Action": ["s3:*"], "Resource": ["*"]})).least_privilege_rating == "failedHigh"
+    assert analyze_policy(policy({"Effect": "Allow", "Action": "iam:*", "Resource": ["arn:aws:iam::*:role/x"]})).least_privilege_rating == "failedLow"
+    assert analyze_policy(policy({"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"})).least_privilege_rating == "passing"
+    assert analyze_policy(policy({"Effect": "Deny", "Action": "*", "Resource": "*"})).least_privilege_rating == "passing"
+    assert analyze_policy(
+        policy({"Effect": "Allow", "Action": "*", "Resource": "*", "Condition": {"Bool": {"aws:SecureTransport": "true"}}})
+    ).least_privilege_rating == "passing"
+
+
+def test_later_statement_does_not_lower_rating():
+    document = policy(
+        {"Effect": "Allow", "Action": "*", "Resource": "*"},
+        {"Effect": "Allow", "Action": "iam:*", "Resource": ["arn:aws:iam::*:role/x"]},
+    )
+    assert analyze_policy(document).least_privilege_rating == "failedHigh"
+
+
+def test_is_public():
+    assert analyze_policy(policy({"Effect": "Allow", "Principal": "*", "Action": "sqs:*"})).is_public
+    assert analyze_policy(policy({"Effect": "Allow", "Principal": {"AWS": ["111111111111", "*"]}, "Action": "kms:*"})).is_public
+    assert not analyze_policy(policy({"Effect": "Deny", "Principal": "*", "Action": "sns:*"})).is_public
+    assert not analyze_policy(
+        policy({"Effect": "Allow", "Principal": "*", "Action": "sns:Publish", "Condition": {"StringEquals": {"aws:SourceOwner": "111111111111"}}})
+    ).is_public
+    assert not analyze_policy(policy({"Effect": "Allow", "Principal": {"Service": "sns.amazonaws.com"}, "Action": "sqs:*"})).is_public
+
+
+def test_analysis_is_memoized_by_document_hash():
+    document = policy({"Effect": "Allow", "Resource": "*", "Action": "ec2:*"})
+    # the same document with another key order and as a JSON string is only analyzed once
+    reordered = {"Statement": [{"Action": "ec2:*", "Resource": "*", "Effect": "Allow"}], "Version": "2012-10-17"}
+    assert document_hash(document) == document_hash(reordered)
+    analysis = analyze_policy(document)
+    assert analyze_policy(reordered) is analysis
+    assert analyze_policy(json.dumps(reordered)) is analysis
+    assert policy_analyzer._analyses[document_hash(document)] is analysis
@@ -0,0 +1,200 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import asyncio
+import socket
+
+import pytest
+
+from . import context
+import port_scanner
+from port_scanner import AsyncTcpPortScanner, NmapPortScanner, ScanResults, configure_scan_backend, get_port_scanner
+
+
+def host_result(*open_ports):
+    return {
+        "ports": [
+            {"portid": str(port), "state": "open", "reason": "syn-ack", "service": {"name": "http"}}
+            for port in open_ports
+        ],
+        "state": {"state": "up"}
+    }
+
+
+class FakeNmap(object):
+    """Answers like nmap3's parsed multi target output, 192.0.2.9 never answers"""
+
+    def __init__(self):
+        self.targets = []
+
+    def nmap_tcp_scan(self, target, args=None):
+        self.targets.append(target.split(" "))
+        results = {ip: host_result(80) for ip in target.split(" ") if ip != "192.0.2.9"}
+        results.update({"runtime": {}, "stats": {}, "task_results": []})
+        return results
+
+
+def fake_dns(monkeypatch, names):
+    def gethostbyname(name):
+        try:
+            return names[name]
+        except KeyError:
+            raise socket.gaierror(name)
+    monkeypatch.setattr(socket, "gethostbyname", gethostbyname)
+
+
+def test_scan_dedupes_targets_by_ip_and_batches(monkeypatch):
+    fake_dns(monkeypatch, {"alb.example.com": "192.0.2.1", "www.example.com": "192.0.2.1"})
+    nmap = FakeNmap()
+    scanner = NmapPortScanner([80], batch_size=2, workers=2, nmap=nmap)
+    results = scanner.scan(["alb.example.com", "www.example.com.", "192.0.2.2", "192.0.2.3", "192.0.2.2"])
+    assert sorted(ip for batch in nmap.targets for ip in batch) == ["192.0.2.1", "192.0.2.2", "192.0.2.3"]
+    assert all(len(batch) <= 2 for batch in nmap.targets)
+    assert results.lookup("alb.example.com") == {"192.0.2.1": host_result(80)}
+    assert results.lookup("www.example.com.") == {"192.0.2.1": host_result(80)}
+    assert "runtime" not in results.hosts
+
+
+def test_unresolved_and_unanswered_targets_have_no_results(monkeypatch):
+    fake_dns(monkeypatch, {})
+    nmap = FakeNmap()
+    results = NmapPortScanner([80], nmap=nmap).scan(["gone.example.com", "192.0.2.9"])
+    assert nmap.targets == [["192.0.2.9"]]
+    assert "gone.example.com" in results
+    assert results.lookup("gone.example.com") is None
+    assert results.lookup("192.0.2.9") is None
+    assert results.lookup("192.0.2.10") is None
+
+
+def test_failed_batch_does_not_drop_other_batches():
+    class FailingNmap(FakeNmap):
+        def nmap_tcp_scan(self, target, args=None):
+            if "192.0.2.1" in target:
+                raise KeyError("nmaprun")
+            return super().nmap_tcp_scan(target, args)
+
+    results = NmapPortScanner([80], batch_size=1, nmap=FailingNmap()).scan(["192.0.2.1", "192.0.2.2"])
+    assert results.lookup("192.0.2.1") is None
+    assert results.lookup("192.0.2.2") == {"192.0.2.2": host_result(80)}
+
+
+def test_empty_scan_does_not_run_nmap():
+    nmap = FakeNmap()
+    assert NmapPortScanner([80], nmap=nmap).scan([]).hosts == {}
+    assert nmap.targets == []
+    assert ScanResults().lookup("192.0.2.1") is None
+
+
+@pytest.fixture(scope="function")
+def listener():
+    """A local TCP listener and a port nothing listens on"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    unused = socket.socket()
+    unused.bind(("127.0.0.1", 0))
+    closedPort = unused.getsockname()[1]
+    unused.close()
+    yield server.getsockname()[1], closedPort
+    server.close()
+
+
+def test_async_scanner_reports_open_and_closed_ports(listener):
+    openPort, closedPort = listener
+    results = AsyncTcpPortScanner([openPort, closedPort], timeout=2).scan(["127.0.0.1"])
+    ports = {int(p["portid"]): p for p in results.lookup("127.0.0.1")["127.0.0.1"]["ports"]}
+    assert ports[openPort]["state"] == "open"
+    assert ports[openPort]["reason"] == "syn-ack"
+    assert ports[closedPort]["state"] == "closed"
+    assert ports[closedPort]["reason"] == "conn-refused"
+    assert "name" in ports[openPort]["service"]
+
+
+def test_async_scanner_limits_connections_per_host_and_overall(monkeypatch):
+    inFlight = {"total": 0, "max": 0, "hosts": {}, "hostMax": 0}
+
+    async def open_connection(ip, port):
+        inFlight["total"] += 1
+        inFlight["hosts"][ip] = inFlight["hosts"].get(ip, 0) + 1
+        inFlight["max"] = max(inFlight["max"], inFlight["total"])
+        inFlight["hostMax"] = max(inFlight["hostMax"], inFlight["hosts"][ip])
+        await asyncio.sleep(0.01)
+        inFlight["total"] -= 1
+        inFlight["hosts"][ip] -= 1
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(asyncio, "open_connection", open_connection)
+    scanner = AsyncTcpPortScanner(list(range(1, 21)), concurrency=6, host_concurrency=4)
+    hosts = scanner.scan_ips(["192.0.2.1", "192.0.2.2", "192.0.2.3"])
+    assert inFlight["max"] == 6
+    assert inFlight["hostMax"] == 4
+    assert all(len(host["ports"]) == 20 for host in hosts.values())
+
+
+def test_async_scanner_times_out_unanswered_ports(monkeypatch):
+    async def open_connection(ip, port):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(asyncio, "open_connection", open_connection)
+    hosts = AsyncTcpPortScanner([80], timeout=0.05).scan_ips(["192.0.2.1"])
+    assert hosts["192.0.2.1"]["ports"][0]["state"] == "filtered"
+    assert hosts["192.0.2.1"]["ports"][0]["reason"] == "no-response"
+
+
+def test_configured_backend_is_used(monkeypatch):
+    monkeypatch.setattr(port_scanner, "_scanners", {})
+    try:
+        configure_scan_backend("asyncio")
+        assert isinstance(get_port_scanner([80]), AsyncTcpPortScanner)
+        assert get_port_scanner([80]) is get_port_scanner([80])
+        with pytest.raises(ValueError):
+            configure_scan_backend("masscan")
+    finally:
+        configure_scan_backend()
+
+
+def test_backends_report_the_same_service_names(monkeypatch):
+    ports = [21, 80, 1521, 2375, 5601, 8080, 8182, 9092, 27017, 4040]
+
+    class ServiceNmap(FakeNmap):
+        def nmap_tcp_scan(self, target, args=None):
+            # nmap fills in the name from its own nmap-services table
+            return {target: {"ports": [
+                {"portid": str(port), "state": "closed", "reason": "conn-refused", "service": {"name": "nmap-name"}}
+                for port in ports
+            ]}}
+
+    async def open_connection(ip, port):
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(asyncio, "open_connection", open_connection)
+    nmapHosts = NmapPortScanner(ports, nmap=ServiceNmap()).scan_ips(["192.0.2.1"])
+    asyncHosts = AsyncTcpPortScanner(ports).scan_ips(["192.0.2.1"])
+    nmapNames = {p["portid"]: p["service"]["name"] for p in nmapHosts["192.0.2.1"]["ports"]}
+    asyncNames = {p["portid"]: p["service"]["name"] for p in asyncHosts["192.0.2.1"]["ports"]}
+    assert nmapNames == asyncNames
+    # findings are numbered in port order, both backends list the ports sorted
+    nmapOrder = [p["portid"] for p in nmapHosts["192.0.2.1"]["ports"]]
+    asyncOrder = [p["portid"] for p in asyncHosts["192.0.2.1"]["ports"]]
+    assert nmapOrder == asyncOrder == [str(port) for port in sorted(ports)]
+    assert asyncNames["8080"] == "http-proxy"
+    assert asyncNames["4040"] == "unknown"
+    # the names end up in finding Ids, ports with a known service must not share one
+    knownNames = [name for name in asyncNames.values() if name != "unknown"]
+    assert len(knownNames) == len(set(knownNames)) == len(ports) - 1
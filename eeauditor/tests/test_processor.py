@@ -0,0 +1,149 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import json
+
+import pytest
+
+from . import context
+from processor.main import process_findings
+from processor.outputs.output_base import BatchedOutput, ElectricEyeOutput
+
+
+def generate_findings(count):
+    for i in range(count):
+        yield {
+            "SchemaVersion": "2018-10-08",
+            "Id": f"test-finding-{i}",
+            "ProductArn": "arn:aws:securityhub:us-east-1:012345678901:product/012345678901/default",
+            "AwsAccountId": "012345678901",
+            "Title": "Test finding",
+        }
+
+
+def test_json_output_streams_batches(tmp_path):
+    outputFile = str(tmp_path / "findings")
+    process_findings(findings=generate_findings(250), outputs=["json"], output_file=outputFile, batch_size=100)
+    with open(f"{outputFile}.json") as f:
+        findings = json.load(f)
+    assert [finding["Id"] for finding in findings] == [f"test-finding-{i}" for i in range(250)]
+
+
+def test_json_output_no_findings(tmp_path):
+    outputFile = str(tmp_path / "findings")
+    process_findings(findings=iter([]), outputs=["json"], output_file=outputFile)
+    with open(f"{outputFile}.json") as f:
+        assert json.load(f) == []
+
+
+def test_csv_output_streams_batches(tmp_path):
+    outputFile = str(tmp_path / "findings")
+    process_findings(findings=generate_findings(7), outputs=["csv"], output_file=outputFile, batch_size=3)
+    with open(f"{outputFile}.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "Id"
+    assert len(rows) == 8
+
+
+def test_legacy_output_receives_every_finding():
+    batches = []
+
+    @ElectricEyeOutput
+    class RecordingProvider(object):
+        __provider__ = "test_recording"
+
+        def write_findings(self, findings: list, **kwargs):
+            batches.append(len(findings))
+
+    # providers which only implement write_findings() still get every finding at once
+    process_findings(findings=generate_findings(25), outputs=["test_recording"], batch_size=10)
+    assert batches == [25]
+
+
+def test_opened_outputs_are_closed_when_another_output_fails(tmp_path):
+    @ElectricEyeOutput
+    class FailingProvider(BatchedOutput):
+        __provider__ = "test_failing"
+
+        def open(self, **kwargs):
+            pass
+
+        def write_batch(self, findings: list):
+            raise ConnectionError("database went away")
+
+        def close(self):
+            pass
+
+    outputFile = str(tmp_path / "findings")
+    with pytest.raises(ConnectionError):
+        process_findings(findings=generate_findings(5), outputs=["json", "test_failing"], output_file=outputFile)
+    # the JSON array written before the failure is still terminated
+    with open(f"{outputFile}.json") as f:
+        assert [finding["Id"] for finding in json.load(f)] == [f"test-finding-{i}" for i in range(5)]
+
+
+class FakeSecurityHub(object):
+    def __init__(self, imports, awsAccountId, region):
+        self.imports = imports
+        self.awsAccountId = awsAccountId
+        self.region = region
+
+    def batch_import_findings(self, Findings):
+        self.imports.append((self.awsAccountId, self.region, [finding["Id"] for finding in Findings]))
+        failed = [
+            {"Id": finding["Id"], "ErrorCode": "AccessDeniedException", "ErrorMessage": "Not the owner"}
+            for finding in Findings if finding["Title"] == "Rejected"
+        ]
+        return {"FailedCount": len(failed), "SuccessCount": len(Findings) - len(failed), "FailedFindings": failed}
+
+
+class FakeSessions(object):
+    def __init__(self):
+        self.imports = []
+        self.created = []
+
+    def create_session(self, awsAccountId, awsPartition="aws"):
+        self.created.append((awsAccountId, awsPartition))
+        imports = self.imports
+
+        class FakeSession(object):
+            def client(self, service_name, region_name=None):
+                return FakeSecurityHub(imports, awsAccountId, region_name)
+
+        return FakeSession()
+
+
+def test_sechub_output_imports_findings_with_their_account(capsys):
+    findings = list(generate_findings(3))
+    findings[1]["AwsAccountId"] = "109876543210"
+    findings[1]["ProductArn"] = "arn:aws:securityhub:eu-west-1:109876543210:product/109876543210/default"
+    findings[2]["Title"] = "Rejected"
+    sessions = FakeSessions()
+    process_findings(findings=iter(findings), outputs=["sechub"], sessions=sessions)
+    assert sorted(sessions.created) == [("012345678901", "aws"), ("109876543210", "aws")]
+    assert sorted(sessions.imports) == [
+        ("012345678901", "us-east-1", ["test-finding-0", "test-finding-2"]),
+        ("109876543210", "eu-west-1", ["test-finding-1"]),
+    ]
+    # findings Security Hub rejected are reported instead of counted as written
+    out = capsys.readouterr().out
+    assert "Failed to import finding test-finding-2 to SecurityHub: AccessDeniedException" in out
+    assert "Wrote 2 results to SecurityHub" in out
+    assert "Failed to write 1 results to SecurityHub" in out
@@ -0,0 +1,191 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from . import context
+from reachability import ReachabilityGraph, nacl_allowed_ranges, subtract_ranges
+from security_group_index import SecurityGroupRuleIndex
+
+sg_rules = [
+    {"GroupId": "sg-web", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 80, "ToPort": 443, "CidrIpv4": "0.0.0.0/0"},
+    {"GroupId": "sg-web", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 22, "ToPort": 22, "CidrIpv4": "10.0.0.0/8"},
+    {"GroupId": "sg-db", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 5432, "ToPort": 5432, "CidrIpv4": "0.0.0.0/0"},
+]
+
+route_tables = [
+    {
+        "RouteTableId": "rtb-main",
+        "VpcId": "vpc-1",
+        "Associations": [{"Main": True}],
+        "Routes": [{"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local"}],
+    },
+    {
+        "RouteTableId": "rtb-public",
+        "VpcId": "vpc-1",
+        "Associations": [{"Main": False, "SubnetId": "subnet-public"}],
+        "Routes": [
+            {"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local"},
+            {"DestinationCidrBlock": "0.0.0.0/0", "GatewayId": "igw-1", "State": "active"},
+        ],
+    },
+]
+
+def nacl_entry(number, action, protocol="-1", egress=False, ports=None):
+    entry = {"RuleNumber": number, "RuleAction": action, "Protocol": protocol, "Egress": egress, "CidrBlock": "0.0.0.0/0"}
+    if ports:
+        entry["PortRange"] = {"From": ports[0], "To": ports[1]}
+    return entry
+
+network_acls = [
+    {
+        "NetworkAclId": "acl-1",
+        "VpcId": "vpc-1",
+        "Associations": [{"SubnetId": "subnet-public"}, {"SubnetId": "subnet-private"}],
+        "Entries": [
+            nacl_entry(90, "deny", "6", ports=(443, 443)),
+            nacl_entry(100, "allow"),
+            nacl_entry(100, "allow", egress=True),
+            nacl_entry(32767, "deny"),
+            nacl_entry(32767, "deny", egress=True),
+        ],
+    }
+]
+
+internet_gateways = [{"InternetGatewayId": "igw-1", "Attachments": [{"VpcId": "vpc-1", "State": "available"}]}]
+
+def interface(eni_id, subnet_id, groups, public_ip=None, instance_id=None):
+    eni = {
+        "NetworkInterfaceId": eni_id,
+        "VpcId": "vpc-1",
+        "SubnetId": subnet_id,
+        "Groups": [{"GroupId": group} for group in groups],
+    }
+    if public_ip:
+        eni["Association"] = {"PublicIp": public_ip}
+    if instance_id:
+        eni["Attachment"] = {"InstanceId": instance_id}
+    return eni
+
+def build_graph():
+    return ReachabilityGraph(
+        interfaces=[
+            interface("eni-web", "subnet-public", ["sg-web"], "1.2.3.4", "i-web"),
+            interface("eni-db", "subnet-private", ["sg-db"], "1.2.3.5", "i-db"),
+            interface("eni-internal", "subnet-public", ["sg-db"]),
+        ],
+        route_tables=route_tables,
+        network_acls=network_acls,
+        internet_gateways=internet_gateways,
+        sg_index=SecurityGroupRuleIndex(sg_rules),
+    )
+
+
+def test_public_interface_reachable_on_open_ports():
+    graph = build_graph()
+    assert graph.is_reachable("eni-web", 80)
+    assert graph.is_reachable("eni-web", 442)
+    # denied by the NACL before the allow all entry
+    assert not graph.is_reachable("eni-web", 443)
+    # only open to 10.0.0.0/8
+    assert not graph.is_reachable("eni-web", 22)
+    assert not graph.is_reachable("eni-web", 80, protocol="udp")
+    assert graph.is_instance_reachable("i-web", [22, 80])
+    assert [eni.networkInterfaceId for eni in graph.exposed_interfaces(80)] == ["eni-web"]
+
+
+def test_interfaces_without_internet_path_are_unreachable():
+    graph = build_graph()
+    # the main route table has no route to the Internet Gateway
+    assert not graph.is_reachable("eni-db", 5432)
+    # no public address
+    assert not graph.is_reachable("eni-internal", 5432)
+    assert not graph.is_reachable("eni-unknown", 80)
+
+
+def test_nacl_rules_evaluated_in_order():
+    entries = [
+        nacl_entry(200, "allow", "6", ports=(0, 65535)),
+        nacl_entry(100, "deny", "6", ports=(1000, 2000)),
+    ]
+    assert nacl_allowed_ranges(entries, "tcp") == [(0, 999), (2001, 65535)]
+    assert nacl_allowed_ranges(entries, "udp") == []
+    assert subtract_ranges([(0, 10)], [(3, 4), (8, 20)]) == [(0, 2), (5, 7)]
+
+
+def test_any_source_which_may_hold_internet_hosts_counts():
+    rules = [
+        # 0.0.0.0/0 split in two halves
+        {"GroupId": "sg-split", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 22, "ToPort": 22, "CidrIpv4": "0.0.0.0/1"},
+        {"GroupId": "sg-split", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 22, "ToPort": 22, "CidrIpv4": "128.0.0.0/1"},
+        {"GroupId": "sg-public", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 3389, "ToPort": 3389, "CidrIpv4": "52.0.0.0/8"},
+        {"GroupId": "sg-prefix", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 6379, "ToPort": 6379, "PrefixListId": "pl-0123"},
+        {"GroupId": "sg-private", "IsEgress": False, "IpProtocol": "-1", "FromPort": -1, "ToPort": -1, "CidrIpv4": "172.16.0.0/12"},
+    ]
+    nacl = {
+        "NetworkAclId": "acl-split",
+        "VpcId": "vpc-1",
+        "Associations": [{"SubnetId": "subnet-public"}],
+        "Entries": [
+            dict(nacl_entry(100, "allow"), CidrBlock="0.0.0.0/1"),
+            dict(nacl_entry(101, "allow"), CidrBlock="128.0.0.0/1"),
+            dict(nacl_entry(100, "allow", egress=True), CidrBlock="0.0.0.0/1"),
+            nacl_entry(32767, "deny"),
+            nacl_entry(32767, "deny", egress=True),
+        ],
+    }
+    graph = ReachabilityGraph(
+        interfaces=[interface("eni-1", "subnet-public", ["sg-split", "sg-public", "sg-prefix", "sg-private"], "1.2.3.4", "i-1")],
+        route_tables=route_tables,
+        network_acls=[nacl],
+        internet_gateways=internet_gateways,
+        sg_index=SecurityGroupRuleIndex(rules),
+    )
+    assert graph.is_reachable("eni-1", 22)
+    assert graph.is_reachable("eni-1", 3389)
+    assert graph.is_reachable("eni-1", 6379)
+    assert not graph.is_reachable("eni-1", 5432)
+
+
+def test_default_route_to_a_firewall_endpoint_counts():
+    firewalled = [
+        {
+            "RouteTableId": "rtb-firewalled",
+            "VpcId": "vpc-1",
+            "Associations": [{"Main": True}],
+            "Routes": [
+                {"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local"},
+                {"DestinationCidrBlock": "0.0.0.0/0", "VpcEndpointId": "vpce-firewall", "State": "active"},
+            ],
+        }
+    ]
+    graph = ReachabilityGraph(
+        interfaces=[interface("eni-db", "subnet-private", ["sg-db"], "1.2.3.5", "i-db")],
+        route_tables=firewalled,
+        network_acls=network_acls,
+        internet_gateways=[],
+        sg_index=SecurityGroupRuleIndex(sg_rules),
+    )
+    assert graph.is_reachable("eni-db", 5432)
+
+
+def test_instances_without_known_interfaces_are_not_unreachable():
+    graph = build_graph()
+    assert graph.is_instance_unreachable("i-db", [5432])
+    assert not graph.is_instance_unreachable("i-web", [80])
+    # ENIs created after the graph was built are probed
+    assert not graph.is_instance_unreachable("i-new", [80])
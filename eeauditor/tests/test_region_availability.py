@@ -0,0 +1,62 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+from . import context
+from aws_clients import get_client
+from region_availability import get_check_service, get_service_regions, is_check_available, is_service_available
+from auditors.aws import AWS_CloudHSM_Auditor, Amazon_Managed_Blockchain_Auditor, Amazon_Shield_Advanced_Auditor
+
+
+def test_regional_service():
+    assert "us-east-1" in get_service_regions("ec2")
+    assert is_service_available("ec2", "eu-west-1")
+    assert not is_service_available("ec2", "not-a-region-1")
+
+
+def test_v2_service_names_resolve_endpoint_prefix():
+    # elbv2 is served by the elasticloadbalancing endpoints
+    assert is_service_available("elbv2", "us-east-1")
+    assert not is_service_available("elbv2", "not-a-region-1")
+
+
+def test_global_and_unknown_services_are_never_skipped():
+    for service in ["iam", "health", "shield", "shodan"]:
+        assert get_service_regions(service) is None
+        assert is_service_available(service, "not-a-region-1")
+
+
+def test_availability_follows_the_client_a_check_calls():
+    # registered as cloudhsm, whose legacy endpoints only list us-east-1, but calls cloudhsmv2
+    for check in AWS_CloudHSM_Auditor.registry.checks["cloudhsm"].values():
+        if check.__module__ == AWS_CloudHSM_Auditor.__name__:
+            assert get_check_service("cloudhsm", check) == "cloudhsmv2"
+            assert is_check_available("cloudhsm", check, "eu-west-1")
+            assert not is_check_available("cloudhsm", check, "not-a-region-1")
+
+
+def test_services_with_incomplete_endpoint_data_are_never_skipped():
+    check = Amazon_Managed_Blockchain_Auditor.amb_fabric_node_chaincode_logging_check
+    assert is_check_available("managedblockchain", check, "ap-southeast-2")
+
+
+def test_checks_with_several_regional_clients_are_not_resolved():
+    # Shield's own client is pinned to us-east-1, its checks use route53, elb, elbv2, ec2 and cloudfront
+    check = Amazon_Shield_Advanced_Auditor.shield_advanced_route_53_protection_check
+    assert get_check_service("shield", check) is None
+    assert is_check_available("shield", check, "not-a-region-1")
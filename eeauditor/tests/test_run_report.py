@@ -0,0 +1,90 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.stub import Stubber
+
+from . import context
+from aws_clients import run_in_context
+from run_report import RunReport
+
+
+def get_stubbed_client(report):
+    session = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+    sqs = session.client("sqs")
+    report.instrument(sqs)
+    return sqs
+
+
+def test_run_report_attributes_api_calls_to_check():
+    report = RunReport()
+    sqs = get_stubbed_client(report)
+    stats = report.get_stats("sqs_check", "Amazon_SQS_Auditor", "012345678901", "us-east-1")
+    with Stubber(sqs) as stubber:
+        stubber.add_response("list_queues", {"QueueUrls": []})
+        stubber.add_response("list_queues", {"QueueUrls": []})
+        stubber.add_response("list_queues", {"QueueUrls": []})
+        with report.measure(stats):
+            sqs.list_queues()
+            sqs.list_queues()
+            report.add_finding(stats)
+        # calls made outside of a check are not recorded
+        sqs.list_queues()
+    row = report.rows()[0]
+    assert row["ApiCalls"] == 2
+    assert row["ApiCallsByOperation"] == {"sqs:ListQueues": 2}
+    assert row["Findings"] == 1
+    assert row["WallTimeSeconds"] >= 0
+
+
+def test_calls_from_pools_started_by_a_check_are_attributed_to_it():
+    report = RunReport()
+    sqs = get_stubbed_client(report)
+    stats = report.get_stats("sqs_check", "Amazon_SQS_Auditor", "012345678901", "us-east-1")
+    with Stubber(sqs) as stubber:
+        for _ in range(5):
+            stubber.add_response("list_queues", {"QueueUrls": []})
+        with report.measure(stats):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(run_in_context(lambda _: sqs.list_queues()), range(4)))
+                # work handed over without run_in_context has no check to report to
+                pool.submit(sqs.list_queues).result()
+    assert report.rows()[0]["ApiCalls"] == 4
+
+
+def test_run_report_writes_json_and_csv(tmp_path):
+    report = RunReport()
+    report.get_stats("slow_check", "Auditor", "012345678901", "us-east-1").wall_time = 5
+    report.get_stats("fast_check", "Auditor", "012345678901", "us-east-1").wall_time = 1
+    outputFile = str(tmp_path / "output")
+
+    with open(report.write(outputFile, "json")) as jsonfile:
+        rows = json.load(jsonfile)
+    assert [row["CheckName"] for row in rows] == ["slow_check", "fast_check"]
+
+    with open(report.write(outputFile, "csv")) as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    assert rows[0]["CheckName"] == "slow_check"
+    assert rows[1]["WallTimeSeconds"] == "1"
@@ -0,0 +1,60 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from . import context
+from auditor_cache import AuditorCache
+from security_group_index import SecurityGroupRuleIndex, get_security_group_index
+
+rules = [
+    {"GroupId": "sg-1", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 3306, "ToPort": 3306, "CidrIpv4": "0.0.0.0/0"},
+    {"GroupId": "sg-1", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 5432, "ToPort": 5432, "CidrIpv4": "10.0.0.0/8"},
+    {"GroupId": "sg-1", "IsEgress": True, "IpProtocol": "-1", "FromPort": -1, "ToPort": -1, "CidrIpv4": "0.0.0.0/0"},
+    {"GroupId": "sg-2", "IsEgress": False, "IpProtocol": "tcp", "FromPort": 1000, "ToPort": 2000, "CidrIpv6": "::/0"},
+    {"GroupId": "sg-3", "IsEgress": False, "IpProtocol": "-1", "FromPort": -1, "ToPort": -1, "CidrIpv4": "0.0.0.0/0"},
+]
+
+
+def test_index_answers_world_open_ports():
+    index = SecurityGroupRuleIndex(rules)
+    assert index.is_open_to_world("sg-1", 3306)
+    assert not index.is_open_to_world("sg-1", 5432)
+    assert not index.is_open_to_world("sg-1", 3306, protocol="udp")
+    assert index.is_open_to_world(["sg-1", "sg-2"], 1433)
+    assert not index.is_open_to_world(["sg-2"], 2001)
+    assert index.is_open_to_world(["sg-3"], 5432)
+    assert not index.is_open_to_world(["sg-404"], 22)
+    assert len(index.rules("sg-1")) == 3
+
+
+def test_index_is_collected_once_per_account_and_region():
+    ec2 = boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    ).client("ec2")
+    cache = AuditorCache()
+    with Stubber(ec2) as stubber:
+        stubber.add_response("describe_security_group_rules", {"SecurityGroupRules": rules})
+        first = get_security_group_index(cache.scope("Amazon_RDS_Auditor", "012345678901", "us-east-1"), ec2)
+        second = get_security_group_index(cache.scope("Amazon_ELBv2_Auditor", "012345678901", "us-east-1"), ec2)
+        stubber.assert_no_pending_responses()
+    assert first is second
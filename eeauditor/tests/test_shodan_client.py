@@ -0,0 +1,112 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import time
+
+from . import context
+import shodan_client
+from shodan_client import SHODAN_NOT_INDEXED, ShodanClient, TokenBucket, configure_shodan_workers
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession(object):
+    """Answers like the Shodan host API, 203.0.113.1 is indexed and 203.0.113.9 is rate limited"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        ip = url.rsplit("/", 1)[-1]
+        self.requests.append(ip)
+        if ip == "203.0.113.1":
+            return FakeResponse(200, {"ip_str": ip, "ports": [443]})
+        if ip == "203.0.113.9":
+            return FakeResponse(429, {"error": "Rate limit reached"})
+        return FakeResponse(404, SHODAN_NOT_INDEXED)
+
+
+def get_client(tmp_path, session, **kwargs):
+    return ShodanClient("key", qps=1000, cache_file=str(tmp_path / "shodan-cache.json"), session=session, **kwargs)
+
+
+def test_host_responses_are_cached_across_runs(tmp_path):
+    session = FakeSession()
+    shodan = get_client(tmp_path, session)
+    shodan.prefetch(ips=["203.0.113.1", "203.0.113.2", "203.0.113.1"])
+    assert sorted(session.requests) == ["203.0.113.1", "203.0.113.2"]
+    assert shodan.host("203.0.113.1")["ports"] == [443]
+    assert shodan.host("203.0.113.2") == SHODAN_NOT_INDEXED
+    assert len(session.requests) == 2
+
+    # the next run reads the responses from the cache file
+    nextSession = FakeSession()
+    nextShodan = get_client(tmp_path, nextSession)
+    assert nextShodan.host("203.0.113.2") == SHODAN_NOT_INDEXED
+    nextShodan.prefetch(ips=["203.0.113.1"])
+    assert nextSession.requests == []
+
+
+def test_expired_and_error_responses_are_looked_up_again(tmp_path):
+    with open(tmp_path / "shodan-cache.json", "w") as cacheFile:
+        json.dump({"203.0.113.1": [time.time() - 7200, {"ip_str": "203.0.113.1"}]}, cacheFile)
+    session = FakeSession()
+    shodan = get_client(tmp_path, session, ttl=3600)
+    shodan.host("203.0.113.1")
+    shodan.host("203.0.113.9")
+    shodan.host("203.0.113.9")
+    assert session.requests == ["203.0.113.1", "203.0.113.9", "203.0.113.9"]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # the first token is available right away, the next four take 1/20th of a second each
+    assert time.monotonic() - start >= 0.19
+
+
+def test_lookups_outside_prefetch_are_saved(tmp_path):
+    shodan = get_client(tmp_path, FakeSession())
+    shodan.host("203.0.113.1")
+    shodan.save()
+    nextSession = FakeSession()
+    get_client(tmp_path, nextSession).host("203.0.113.1")
+    assert nextSession.requests == []
+
+
+def test_pools_follow_the_number_of_check_workers(monkeypatch):
+    monkeypatch.setattr(shodan_client, "_shodanClients", [])
+    monkeypatch.setattr(shodan_client, "_shodanWorkers", shodan_client.DEFAULT_SHODAN_WORKERS)
+    shodan = ShodanClient.from_environment("key")
+    shodan.cache_file = None
+    assert shodan.workers == shodan_client.DEFAULT_SHODAN_WORKERS
+    configure_shodan_workers(20)
+    assert shodan.workers == 20
+    assert shodan.session.get_adapter("https://api.shodan.io")._pool_maxsize == 20
+    assert ShodanClient.from_environment("key").workers == 20
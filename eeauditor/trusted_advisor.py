@@ -0,0 +1,108 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+import json
+import os
+import threading
+import time
+
+# key of the summaries in the cache of the Trusted Advisor Auditor
+SUMMARIES_CACHE_KEY = "trusted_advisor_summaries"
+# Trusted Advisor refreshes its checks slowly, summaries can be reused across runs for
+# TRUSTED_ADVISOR_CACHE_TTL_HOURS, the default of 0 only keeps them for the run
+DEFAULT_TRUSTED_ADVISOR_CACHE_TTL_HOURS = 0
+DEFAULT_TRUSTED_ADVISOR_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".electriceye", "trusted-advisor-cache.json")
+_lock = threading.Lock()
+
+def collect_check_summaries(support, check_names):
+    """Returns the summaries of the named Trusted Advisor checks
+
+        The check IDs are resolved with one DescribeTrustedAdvisorChecks call and all the
+        summaries are read with one DescribeTrustedAdvisorCheckSummaries call, instead of a
+        DescribeTrustedAdvisorCheckResult call per check
+    """
+    checkNames = {
+        check["id"]: check["name"]
+        for check in support.describe_trusted_advisor_checks(language="en")["checks"]
+        if check["name"] in check_names
+    }
+    if not checkNames:
+        return []
+    summaries = []
+    for summary in support.describe_trusted_advisor_check_summaries(checkIds=list(checkNames))["summaries"]:
+        summaries.append({
+            "name": checkNames[summary["checkId"]],
+            "checkId": summary["checkId"],
+            "status": summary["status"],
+            "resourcesFlagged": summary["resourcesSummary"]["resourcesFlagged"]
+        })
+    return summaries
+
+def _load_summaries(cache_file, awsAccountId, check_names, ttl):
+    try:
+        with open(cache_file) as cacheFile:
+            entry = json.load(cacheFile).get(awsAccountId)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Failed to read the Trusted Advisor cache {cache_file}, it will be rebuilt: {e}")
+        return None
+    # [epoch, check names, summaries]
+    if entry is None or time.time() - entry[0] >= ttl or entry[1] != sorted(check_names):
+        return None
+    return entry[2]
+
+def _save_summaries(cache_file, awsAccountId, check_names, summaries, ttl):
+    now = time.time()
+    try:
+        with open(cache_file) as cacheFile:
+            accounts = json.load(cacheFile)
+    except (OSError, ValueError):
+        accounts = {}
+    accounts = {account: entry for account, entry in accounts.items() if now - entry[0] < ttl}
+    accounts[awsAccountId] = [now, sorted(check_names), summaries]
+    try:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        tempPath = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tempPath, "w") as cacheFile:
+            json.dump(accounts, cacheFile)
+        os.replace(tempPath, cache_file)
+    except OSError as e:
+        print(f"Failed to write the Trusted Advisor cache {cache_file}: {e}")
+
+def get_check_summaries(cache, support, awsAccountId, check_names, ttl=None, cache_file=DEFAULT_TRUSTED_ADVISOR_CACHE_FILE):
+    """Returns the summaries of the named Trusted Advisor checks, collected once per run
+
+        With a ttl in seconds, TRUSTED_ADVISOR_CACHE_TTL_HOURS by default, the summaries are
+        also kept in cache_file and reused by the runs within ttl
+    """
+    if ttl is None:
+        ttl = float(os.environ.get("TRUSTED_ADVISOR_CACHE_TTL_HOURS", DEFAULT_TRUSTED_ADVISOR_CACHE_TTL_HOURS)) * 3600
+    with _lock:
+        summaries = cache.get(SUMMARIES_CACHE_KEY)
+        if summaries is not None:
+            return summaries
+        if ttl > 0:
+            summaries = _load_summaries(cache_file, awsAccountId, check_names, ttl)
+        if summaries is None:
+            summaries = collect_check_summaries(support, check_names)
+            if ttl > 0:
+                _save_summaries(cache_file, awsAccountId, check_names, summaries, ttl)
+        cache[SUMMARIES_CACHE_KEY] = summaries
+        return summaries